@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Persisted content-hash index for skill backups.
+
+Before overwriting a skill the syncer skips the backup when an identical
+snapshot already exists. It used to find out by globbing
+skill_backups/<fw>_<skill>_* and content-hashing every matching backup the
+first time a (framework, skill) pair was backed up in a process; backups
+accumulate, so the first sync after a daemon start could read gigabytes.
+
+Each backup's hash is now recorded in skill_backup_index.json when the backup
+is written, and lookups read the index (plus one stat per indexed backup to
+drop deleted ones). Records are batched like skill manifests: the index is
+written at most every FLUSH_INTERVAL_SECONDS and once at the end of each skills
+sync, not once per backup. Backups written by older versions, or edited by
+hand, are picked up by `agent-sync repair-backups`, which hashes only
+unindexed or modified backup directories and prunes entries for deleted ones.
+The same repair runs in a background thread when the index is missing or was
+written with another INDEX_VERSION.
+"""
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from agent_disk_ledger import ledger_for
+
+
+INDEX_FILENAME = "skill_backup_index.json"
+# Bumped whenever the skill content-hash format changes; an index written with
+# another version is discarded on load and rebuilt by repair().
+# 2: per-file SHA-256 records from agent_file_digest.
+INDEX_VERSION = 2
+FLUSH_INTERVAL_SECONDS = 30
+_BACKUP_NAME = re.compile(r"^(?P<prefix>.+)_(?P<stamp>\d{8}_\d{6})$")
+
+
+def _dir_mtime_ns(path) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def split_backup_name(name: str, known_ids=()) -> tuple[str, str] | None:
+    """(framework_id, skill_name) from "<fw>_<skill>_<YYYYmmdd_HHMMSS>".
+
+    Framework ids and skill names may both contain "_", so the longest
+    matching known id wins; otherwise the name is split at the first "_".
+    """
+    match = _BACKUP_NAME.match(name)
+    if not match:
+        return None
+    prefix = match.group("prefix")
+    for fw_id in sorted(known_ids, key=len, reverse=True):
+        if prefix.startswith(f"{fw_id}_") and len(prefix) > len(fw_id) + 1:
+            return fw_id, prefix[len(fw_id) + 1:]
+    fw_id, sep, skill_name = prefix.partition("_")
+    if not sep or not skill_name:
+        return None
+    return fw_id, skill_name
+
+
+class BackupIndex:
+    """backup dir name -> framework, skill, content hash and dir mtime."""
+
+    def __init__(self, backup_dir: Path, path: Path):
+        self.backup_dir = Path(backup_dir)
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._entries = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        self._rebuild = None
+        # True when the index is missing or outdated and repair() should rebuild it.
+        self.needs_rebuild = True
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return
+        backups = data.get("backups")
+        if isinstance(backups, dict):
+            self.needs_rebuild = False
+            self._entries = {
+                name: entry
+                for name, entry in backups.items()
+                if isinstance(entry, dict) and {"framework", "skill", "hash"} <= entry.keys()
+            }
+
+    def hashes(self, framework_id: str, skill_name: str) -> set[str]:
+        """Content hashes of existing backups of skill_name taken from framework_id."""
+        with self._lock:
+            entries = [
+                (name, entry["hash"])
+                for name, entry in self._entries.items()
+                if entry["framework"] == framework_id and entry["skill"] == skill_name
+            ]
+        return {h for name, h in entries if (self.backup_dir / name).is_dir()}
+
+    def record(self, backup_path: Path, framework_id: str, skill_name: str, content_hash: str):
+        with self._lock:
+            self._entries[Path(backup_path).name] = {
+                "framework": framework_id,
+                "skill": skill_name,
+                "hash": content_hash,
+                "mtime_ns": _dir_mtime_ns(backup_path),
+            }
+            self._dirty = True
+        self.flush()
+
+    def rebuild_in_background(self, hash_dir, known_ids=()) -> threading.Thread | None:
+        """Start repair() on a daemon thread if the index needs a rebuild and backups exist."""
+        with self._lock:
+            if not self.needs_rebuild or self._rebuild is not None:
+                return None
+            try:
+                with os.scandir(self.backup_dir) as entries:
+                    if next(entries, None) is None:
+                        return None
+            except OSError:
+                return None
+            self._rebuild = threading.Thread(
+                target=self.repair,
+                args=(hash_dir, known_ids),
+                name="backup-index-rebuild",
+                daemon=True,
+            )
+        self._rebuild.start()
+        return self._rebuild
+
+    def repair(self, hash_dir, known_ids=()) -> dict:
+        """Hash unindexed or modified backups and drop entries for deleted ones."""
+        counts = {"added": 0, "rehashed": 0, "removed": 0, "unrecognized": 0}
+        with self._lock:
+            snapshot = dict(self._entries)
+        entries = dict(snapshot)
+        present = set()
+        try:
+            children = sorted(self.backup_dir.iterdir())
+        except OSError:
+            children = []
+        for backup_path in children:
+            if not backup_path.is_dir() or backup_path.is_symlink():
+                continue
+            name = backup_path.name
+            present.add(name)
+            mtime_ns = _dir_mtime_ns(backup_path)
+            entry = entries.get(name)
+            if entry is not None and entry.get("mtime_ns") == mtime_ns:
+                continue
+            if entry is not None:
+                framework_id, skill_name = entry["framework"], entry["skill"]
+            else:
+                parsed = split_backup_name(name, known_ids)
+                if parsed is None:
+                    counts["unrecognized"] += 1
+                    continue
+                framework_id, skill_name = parsed
+            content_hash = hash_dir(backup_path)
+            if not content_hash:
+                continue
+            counts["rehashed" if entry is not None else "added"] += 1
+            entries[name] = {
+                "framework": framework_id,
+                "skill": skill_name,
+                "hash": content_hash,
+                "mtime_ns": mtime_ns,
+            }
+        for name in list(entries):
+            if name not in present:
+                del entries[name]
+                counts["removed"] += 1
+        with self._lock:
+            # Backups recorded while repair() was hashing win over its results.
+            for name, entry in self._entries.items():
+                if snapshot.get(name) is not entry:
+                    entries[name] = entry
+            self._entries = entries
+            self._dirty = True
+            self.needs_rebuild = False
+        self.flush(force=True)
+        return counts
+
+    def flush(self, force=False):
+        """Persist the index, at most every FLUSH_INTERVAL_SECONDS unless forced."""
+        # Serialized, so a slower writer never replaces a newer snapshot.
+        with self._flush_lock:
+            now = time.monotonic()
+            with self._lock:
+                if not self._dirty or (not force and now - self._last_flush < FLUSH_INTERVAL_SECONDS):
+                    return
+                self._dirty = False
+                self._last_flush = now
+                data = {"version": INDEX_VERSION, "backups": dict(self._entries)}
+            try:
+                previous = self.path.stat().st_size if self.path.exists() else 0
+                fd, tmp_name = tempfile.mkstemp(
+                    prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent)
+                )
+                try:
+                    with os.fdopen(fd, "w") as f:
+                        json.dump(data, f)
+                    os.replace(tmp_name, self.path)
+                except BaseException:
+                    try:
+                        os.unlink(tmp_name)
+                    except OSError:
+                        pass
+                    raise
+                ledger_for(self.path.parent).add_file(self.path, previous)
+            except OSError:
+                pass
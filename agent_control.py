@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Local control socket between the CLI and the running watch daemon.
+
+The daemon listens on ~/.config/agent-rules-sync/control.sock (mode 0600).
+Each connection carries one JSON request line and gets one JSON response line:
+
+    {"cmd": "status"}                         -> daemon's in-memory watch state
+    {"cmd": "sync", "scopes": ["rules"]}      -> queued on the daemon's executor,
+                                                 coalesced with pending syncs,
+                                                 answered when the run finishes
+
+`agent-sync status` and `agent-sync sync` try the daemon first and fall back to
+running in-process when no daemon answers (or on platforms without AF_UNIX).
+"""
+
+import json
+import os
+import socket
+import threading
+from pathlib import Path
+
+
+CONTROL_SOCKET_NAME = "control.sock"
+CONNECT_TIMEOUT_SECONDS = 2.0
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+def control_socket_path(config_dir: Path) -> Path:
+    return Path(config_dir) / CONTROL_SOCKET_NAME
+
+
+def _unix_server_class():
+    """Threaded Unix stream server; socketserver is imported only by the daemon."""
+    import socketserver
+
+    class _ControlHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            line = self.rfile.readline(MAX_REQUEST_BYTES)
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                handler = self.server.handlers.get(request.get("cmd"))
+                if handler is None:
+                    response = {"ok": False, "error": f"unknown command: {request.get('cmd')!r}"}
+                else:
+                    response = handler(request)
+            except Exception as e:
+                response = {"ok": False, "error": str(e)}
+            self.wfile.write((json.dumps(response, default=str) + "\n").encode())
+
+    class _ControlUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    return _ControlUnixServer, _ControlHandler
+
+
+class ControlServer:
+    """Serves {cmd: handler(request) -> dict} on the control socket until close()."""
+
+    def __init__(self, config_dir: Path, handlers: dict):
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not available on this platform")
+        server_class, handler_class = _unix_server_class()
+        self.path = control_socket_path(config_dir)
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = server_class(str(self.path), handler_class)
+        finally:
+            os.umask(previous_umask)
+        self._server.handlers = dict(handlers)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="agent-sync-control", daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+
+def send_control_request(config_dir: Path, request: dict, timeout: float | None = None) -> dict | None:
+    """Send one request to the daemon; None when no daemon is listening.
+
+    timeout bounds the wait for the response (None waits indefinitely, e.g. for
+    a sync that is still running); connecting is always bounded.
+    """
+    path = control_socket_path(config_dir)
+    if not hasattr(socket, "AF_UNIX") or not path.exists():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.settimeout(CONNECT_TIMEOUT_SECONDS)
+        try:
+            client.connect(str(path))
+        except OSError:
+            # Stale socket from a daemon that did not shut down cleanly.
+            return None
+        client.settimeout(timeout)
+        client.sendall((json.dumps(request) + "\n").encode())
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    except OSError:
+        return None
+    finally:
+        client.close()
+    try:
+        response = json.loads(data)
+    except ValueError:
+        return None
+    return response if isinstance(response, dict) else None
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Incremental disk-usage ledger for the config directory quota.
+
+The quota guard used to walk all of ~/.config/agent-rules-sync at the start and
+end of every sync and after every history import. Writers now report the bytes
+they add or remove (backups, the command-history JSONL log, master skills, the
+daemon log) and the quota check reads a running total:
+
+    ledger = ledger_for(config_dir)
+    ledger.add(len(data))            # after appending data
+    ledger.total()                   # O(1)
+
+Files nobody reports (state files, traces, sockets) and writes from other
+processes show up as drift; reconcile() re-measures the tree and is run in the
+background at most every RECONCILE_INTERVAL_SECONDS, pausing between
+directories so it stays out of the way of syncs. The ledger is persisted to
+disk_usage.json so a restarted daemon starts from the last known total.
+"""
+
+import json
+import os
+import stat
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+
+LEDGER_FILENAME = "disk_usage.json"
+LEDGER_VERSION = 1
+RECONCILE_INTERVAL_SECONDS = 3600
+FLUSH_INTERVAL_SECONDS = 30
+WALK_PAUSE_EVERY_DIRS = 64
+WALK_PAUSE_SECONDS = 0.001
+
+
+def measure_tree(path: Path) -> int:
+    """Byte size of a tree, skipping symlinks; pauses periodically to stay low priority."""
+    path = Path(path)
+    try:
+        if path.is_symlink():
+            return 0
+        if path.is_file():
+            return path.stat().st_size
+    except OSError:
+        return 0
+    total = 0
+    for index, (root, _dirs, files) in enumerate(os.walk(path)):
+        if index and index % WALK_PAUSE_EVERY_DIRS == 0:
+            time.sleep(WALK_PAUSE_SECONDS)
+        for filename in files:
+            try:
+                st = os.lstat(os.path.join(root, filename))
+            except OSError:
+                continue
+            if not stat.S_ISLNK(st.st_mode):
+                total += st.st_size
+    return total
+
+
+class DiskLedger:
+    """Running byte total for one config directory."""
+
+    def __init__(self, config_dir: Path):
+        self.config_dir = Path(config_dir)
+        self.path = self.config_dir / LEDGER_FILENAME
+        self._lock = threading.Lock()
+        self._total = 0
+        self._reconciled_at = 0.0
+        self._dirty = False
+        self._last_flush = 0.0
+        # Bytes reported while a reconcile walk is in flight.
+        self._during_walk = None
+        self._reconciling = False
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != LEDGER_VERSION:
+            return
+        try:
+            self._total = max(0, int(data.get("total_bytes", 0)))
+            self._reconciled_at = float(data.get("reconciled_at", 0.0))
+        except (TypeError, ValueError):
+            self._total, self._reconciled_at = 0, 0.0
+
+    def total(self) -> int:
+        with self._lock:
+            return self._total
+
+    @property
+    def reconciled(self) -> bool:
+        """False until the tree has been measured at least once."""
+        return self._reconciled_at > 0
+
+    def stale(self, now=None) -> bool:
+        now = time.time() if now is None else now
+        return now - self._reconciled_at >= RECONCILE_INTERVAL_SECONDS
+
+    def add(self, delta: int):
+        """Record delta bytes written (negative for removed or truncated data)."""
+        if not delta:
+            return
+        with self._lock:
+            self._total = max(0, self._total + int(delta))
+            if self._during_walk is not None:
+                self._during_walk += int(delta)
+            self._dirty = True
+        self.flush()
+
+    def add_file(self, path: Path, previous_size: int = 0):
+        """Record path's current size minus previous_size (0 for new files)."""
+        try:
+            size = Path(path).stat().st_size
+        except OSError:
+            size = 0
+        self.add(size - previous_size)
+
+    def reconcile(self, measure=None) -> int:
+        """Re-measure the tree (measure(config_dir) -> bytes) and reset the total."""
+        measure = measure or measure_tree
+        with self._lock:
+            self._during_walk = 0
+        try:
+            measured = measure(self.config_dir)
+        except Exception:
+            with self._lock:
+                self._during_walk = None
+            raise
+        with self._lock:
+            # Writes reported while walking may or may not have been seen; keep them.
+            self._total = max(0, int(measured) + self._during_walk)
+            self._during_walk = None
+            self._reconciled_at = time.time()
+            self._dirty = True
+            total = self._total
+        self.flush(force=True)
+        return total
+
+    def reconcile_in_background(self, measure=None) -> bool:
+        """Start a reconcile thread unless one is already running."""
+        with self._lock:
+            if self._reconciling:
+                return False
+            self._reconciling = True
+
+        def run():
+            try:
+                self.reconcile(measure)
+            except Exception:
+                pass
+            finally:
+                with self._lock:
+                    self._reconciling = False
+
+        threading.Thread(target=run, name="agent-sync-disk-ledger", daemon=True).start()
+        return True
+
+    def flush(self, force=False):
+        """Persist the ledger, at most every FLUSH_INTERVAL_SECONDS unless forced."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._dirty or (not force and now - self._last_flush < FLUSH_INTERVAL_SECONDS):
+                return
+            self._dirty = False
+            self._last_flush = now
+            data = {
+                "version": LEDGER_VERSION,
+                "total_bytes": self._total,
+                "reconciled_at": self._reconciled_at,
+            }
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent)
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            pass
+
+
+_ledgers = {}
+_ledgers_guard = threading.Lock()
+
+
+def ledger_for(config_dir: Path) -> DiskLedger:
+    """The shared ledger for config_dir in this process."""
+    key = str(config_dir)
+    ledger = _ledgers.get(key)
+    if ledger is not None:
+        return ledger
+    with _ledgers_guard:
+        ledger = _ledgers.get(key)
+        if ledger is None:
+            ledger = _ledgers[key] = DiskLedger(config_dir)
+        return ledger
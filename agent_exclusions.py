@@ -1,9 +1,105 @@
 #!/usr/bin/env python3
 """Shared exclusion rules for agent-rules-sync components."""
 
+import fnmatch
 import json
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
 
+from agent_stat_cache import stat_signature
+
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+@dataclass(frozen=True)
+class ExclusionSet:
+    """Compiled exclusions for one (component, target, repo).
+
+    Literal names are a frozenset lookup; glob/regex entries are folded into one
+    regex whose per-name verdicts are memoized, so `name in excluded` is O(1)
+    after the first check of each name. Patterns never match hidden names
+    (sync temp files and journals such as .<name>.tmp-sync); only a literal
+    entry can exclude those.
+    """
+
+    names: frozenset = frozenset()
+    patterns: tuple = ()
+    _regex: object = field(default=None, compare=False, repr=False)
+    _memo: dict = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def compile(cls, entries) -> "ExclusionSet":
+        names = set()
+        patterns = []
+        sources = []
+        for entry in sorted(entries):
+            if entry.startswith("re:"):
+                source = entry[3:]
+            elif _GLOB_CHARS & set(entry):
+                source = fnmatch.translate(entry)
+            else:
+                names.add(entry)
+                continue
+            try:
+                re.compile(source)
+            except re.error:
+                continue
+            patterns.append(entry)
+            sources.append(f"(?:{source})")
+        regex = re.compile("|".join(sources)) if sources else None
+        return cls(frozenset(names), tuple(patterns), regex)
+
+    def __contains__(self, name) -> bool:
+        if name in self.names:
+            return True
+        if self._regex is None or name.startswith("."):
+            return False
+        hit = self._memo.get(name)
+        if hit is None:
+            hit = self._memo[name] = self._regex.fullmatch(name) is not None
+        return hit
+
+    def __bool__(self) -> bool:
+        return bool(self.names or self.patterns)
+
+    def filter(self, names) -> set:
+        """names that are not excluded."""
+        if not self:
+            return set(names)
+        return {name for name in names if name not in self}
+
+
+_EMPTY = ExclusionSet()
+
+
+@dataclass(frozen=True)
+class SkillSubscription:
+    """Allow-list of skills for one target.
+
+    Entries are names, globs and "re:" regexes (matched like exclusions) or
+    "tag:<tag>", matched against the tags in the skill's SKILL.md frontmatter.
+    """
+
+    skills: ExclusionSet = _EMPTY
+    tags: frozenset = frozenset()
+
+    @classmethod
+    def compile(cls, entries) -> "SkillSubscription":
+        entries = [str(entry) for entry in entries]
+        tags = {entry[4:].strip().lower() for entry in entries if entry.startswith("tag:")}
+        patterns = [entry for entry in entries if not entry.startswith("tag:")]
+        return cls(ExclusionSet.compile(patterns) if patterns else _EMPTY, frozenset(tags))
+
+    def matches(self, name, tags=None) -> bool:
+        """True if subscribed; tags() is only called when a tag entry could decide."""
+        if name in self.skills:
+            return True
+        if not self.tags or tags is None:
+            return False
+        return any(str(tag).lower() in self.tags for tag in tags())
+
 
 class ExclusionRules:
     """Loads global and repo-local exclude rules.
@@ -31,6 +127,10 @@ class ExclusionRules:
 
     Repo-local file: <repo>/.agent-rules-sync-excludes.json
       {"skills": ["canvas"], "mcp": ["local-server"]}
+
+    Entries are literal names, shell globs ("debug-*") or regexes ("re:tmp-[0-9]+", full match).
+    Results are compiled once per (component, target, repo); a repo-local file is
+    re-read only when its stat signature changes.
     """
 
     REPO_FILENAME = ".agent-rules-sync-excludes.json"
@@ -38,6 +138,8 @@ class ExclusionRules:
     def __init__(self, config_dir=None):
         self.config_dir = config_dir or (Path.home() / ".config" / "agent-rules-sync")
         self.data = self._read_json(self.config_dir / "excludes.json")
+        self._compiled = {}
+        self._repo_files = {}
 
     def _read_json(self, path: Path) -> dict:
         try:
@@ -59,7 +161,29 @@ class ExclusionRules:
                     return {str(v) for v in names}
         return set()
 
-    def for_target(self, component: str, target_id: str, repo: Path | None = None) -> set[str]:
+    def for_target(self, component: str, target_id: str, repo: Path | None = None) -> ExclusionSet:
+        """Compiled exclusions for target_id, including repo-local ones when repo is set."""
+        repo_signature = None
+        if repo is not None:
+            repo_signature = stat_signature(repo / self.REPO_FILENAME)
+        key = (component, target_id, repo)
+        cached = self._compiled.get(key)
+        if cached is not None and cached[0] == repo_signature:
+            return cached[1]
+        entries = self._entries_for_target(component, target_id, repo, repo_signature)
+        compiled = ExclusionSet.compile(entries) if entries else _EMPTY
+        self._compiled[key] = (repo_signature, compiled)
+        return compiled
+
+    def _repo_config(self, repo: Path, signature) -> dict:
+        cached = self._repo_files.get(repo)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        data = self._read_json(repo / self.REPO_FILENAME) if signature is not None else {}
+        self._repo_files[repo] = (signature, data)
+        return data
+
+    def _entries_for_target(self, component, target_id, repo, repo_signature) -> set[str]:
         names = set()
         component_cfg = self.data.get(component, {})
 
@@ -82,7 +206,7 @@ class ExclusionRules:
                     names.update(self._names_from(repos.get(str(repo))))
 
         if repo is not None:
-            repo_cfg = self._read_json(repo / self.REPO_FILENAME)
+            repo_cfg = self._repo_config(repo, repo_signature)
             names.update(self._names_from(repo_cfg.get(component)))
 
         return names
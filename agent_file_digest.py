@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+File digests for skill change detection and backups.
+
+Skill hashing used to push every file through 1 MiB Python reads, once per
+backup, per backup-cache load and per comparison. This module:
+
+- memory-maps files of MMAP_THRESHOLD bytes or more and hands the mapping to
+  the hash in large slices (no per-chunk Python bytes objects; hashlib drops
+  the GIL while digesting), and reads small files in one call;
+- offers two algorithms: "fast" (BLAKE2b-128) for change detection and
+  skill-to-skill comparison, and "sha256" for backup content hashes. A 32-bit
+  checksum such as CRC32 is too collision-prone to decide that two files are
+  equal and skip a copy, so "fast" stays a cryptographic hash;
+- caches digests by (device, inode, size, mtime_ns) in a bounded LRU shared
+  by the whole process, so a large asset is hashed once per content change
+  however many skill dirs, backups or hardlinks refer to it.
+"""
+
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+
+
+MMAP_THRESHOLD = 4 * 1024 * 1024
+MMAP_SLICE = 64 * 1024 * 1024
+CACHE_LIMIT = 65536
+
+
+def _new_hasher(algorithm: str):
+    if algorithm == "fast":
+        return hashlib.blake2b(digest_size=16)
+    return hashlib.new(algorithm)
+
+
+def hash_file(path, algorithm: str = "sha256", size: int | None = None) -> str:
+    """Digest path's contents, memory-mapping files of MMAP_THRESHOLD bytes or more."""
+    hasher = _new_hasher(algorithm)
+    with open(path, "rb") as f:
+        if size is None:
+            size = os.fstat(f.fileno()).st_size
+        if size < MMAP_THRESHOLD:
+            hasher.update(f.read())
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    for offset in range(0, len(view), MMAP_SLICE):
+                        hasher.update(view[offset:offset + MMAP_SLICE])
+                finally:
+                    view.release()
+    return hasher.hexdigest()
+
+
+class DigestCache:
+    """Digests keyed by (algorithm, dev, inode, size, mtime_ns), least recently used evicted."""
+
+    def __init__(self, limit=CACHE_LIMIT):
+        self.limit = limit
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hashed = 0
+
+    @staticmethod
+    def key(st, algorithm):
+        if not st.st_ino:
+            return None
+        return (algorithm, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def get(self, st, algorithm):
+        key = self.key(st, algorithm)
+        if key is None:
+            return None
+        with self._lock:
+            digest = self._entries.get(key)
+            if digest is not None:
+                self._entries.move_to_end(key)
+            return digest
+
+    def put(self, st, algorithm, digest):
+        key = self.key(st, algorithm)
+        if key is None:
+            return
+        with self._lock:
+            self._entries[key] = digest
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.limit:
+                self._entries.popitem(last=False)
+
+    def digest(self, path, algorithm="sha256", st=None) -> str:
+        """Cached digest of path; st (from stat/DirEntry.stat) saves a stat call."""
+        if st is None:
+            st = os.stat(path)
+        digest = self.get(st, algorithm)
+        if digest is None:
+            digest = hash_file(path, algorithm, st.st_size)
+            self.hashed += 1
+            self.put(st, algorithm, digest)
+        return digest
+
+
+digest_cache = DigestCache()
@@ -17,6 +17,11 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, Iterator
 
+from agent_disk_ledger import ledger_for
+from agent_metrics import ATUIN_INSERT_DURATION, HISTORY_IMPORTED
+from agent_sync_lock import SyncLockManager
+from agent_trace import traced
+
 
 @dataclass(frozen=True)
 class AgentCommand:
@@ -76,12 +81,19 @@ class AgentHistorySync:
         self._state_needs_compaction = False
         self.hostname = f"{socket.gethostname()}:{os.environ.get('USER', 'agent')}"
 
+    @traced("history.sync")
     def sync(
         self,
         log_callback=None,
         dry_run: bool = False,
         paths: Iterable[Path | str] | None = None,
     ) -> dict[str, int]:
+        # The import state file and Atuin inserts must not interleave with another
+        # agent-sync process importing the same transcripts.
+        with SyncLockManager(self.config_dir).hold("history"):
+            return self._sync_locked(log_callback, dry_run, paths)
+
+    def _sync_locked(self, log_callback, dry_run, paths) -> dict[str, int]:
         log = log_callback or (lambda _: None)
         state = self._load_state()
         commands = list(self.iter_commands(paths=paths))
@@ -96,7 +108,10 @@ class AgentHistorySync:
 
         imported = 0
         if self.atuin_db.exists():
-            imported = self._insert_atuin(new_commands, dry_run=dry_run)
+            with ATUIN_INSERT_DURATION.time():
+                imported = self._insert_atuin(new_commands, dry_run=dry_run)
+            if not dry_run:
+                HISTORY_IMPORTED.inc(imported)
         else:
             log(f"[history] Atuin DB not found at {self.atuin_db}; wrote JSONL only")
 
@@ -222,6 +237,10 @@ class AgentHistorySync:
     def _append_jsonl(self, commands: Iterable[AgentCommand], dry_run: bool) -> None:
         if dry_run:
             return
+        try:
+            previous_size = self.log_file.stat().st_size
+        except OSError:
+            previous_size = 0
         with self.log_file.open("a", encoding="utf-8") as f:
             for cmd in commands:
                 f.write(
@@ -242,6 +261,7 @@ class AgentHistorySync:
                     )
                     + "\n"
                 )
+        ledger_for(self.config_dir).add_file(self.log_file, previous_size)
 
     def _insert_atuin(self, commands: Iterable[AgentCommand], dry_run: bool) -> int:
         rows = list(commands)
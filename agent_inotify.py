@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Dependency-free Linux inotify watcher (ctypes).
+
+The watch daemon uses this for two things:
+- Targeted, non-recursive watches on exact parent directories with a filename
+  filter, so files that live directly under broad parents (~/.claude.json,
+  ~/.claude/CLAUDE.md, ~/.codex/config.toml, ~/.cursorrules) become event-driven
+  without watching the whole home directory.
+- A full event backend (recursive roots) on Linux when watchdog is not installed.
+
+When the kernel event queue overflows (IN_Q_OVERFLOW) events were lost, so the
+watcher re-walks its recursive roots for unwatched subdirectories and reports an
+"overflow" event; the daemon answers that with an immediate rescan of the
+watched files instead of waiting for the next timer tick.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = getattr(os, "O_CLOEXEC", 0o2000000)
+
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+IGNORE_DIR_NAMES = {".git", "__pycache__", "node_modules"}
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        name = ctypes.util.find_library("c") or "libc.so.6"
+        libc = ctypes.CDLL(name, use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        libc.inotify_rm_watch.restype = ctypes.c_int
+        _libc = libc
+    return _libc
+
+
+def inotify_available() -> bool:
+    """Return True when the running kernel/libc expose inotify."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = _load_libc()
+        return hasattr(libc, "inotify_init1")
+    except (OSError, AttributeError):
+        return False
+
+
+@dataclass(frozen=True)
+class InotifyEvent:
+    """Minimal watchdog-compatible event (event_type, src_path, is_directory)."""
+
+    event_type: str
+    src_path: str
+    is_directory: bool = False
+
+
+def _event_type(mask: int) -> str:
+    if mask & IN_Q_OVERFLOW:
+        return "overflow"
+    if mask & IN_CREATE:
+        return "created"
+    if mask & (IN_DELETE | IN_DELETE_SELF):
+        return "deleted"
+    if mask & (IN_MOVED_FROM | IN_MOVED_TO | IN_MOVE_SELF):
+        return "moved"
+    if mask & IN_CLOSE_WRITE:
+        return "closed"
+    return "modified"
+
+
+class InotifyWatcher:
+    """Background inotify reader that forwards filtered events to a callback.
+
+    watch_directory(path, names={"a.json"})  -> only events for those entries
+    watch_directory(path, recursive=True)    -> every subdirectory is watched
+    """
+
+    def __init__(self, callback):
+        self.callback = callback
+        libc = _load_libc()
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._fd = fd
+        self._lock = threading.Lock()
+        # wd -> {"path": Path, "names": set[str] | None, "recursive": bool}
+        self._watches = {}
+        self._recursive_roots = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _add_watch(self, directory: Path) -> int | None:
+        wd = _load_libc().inotify_add_watch(
+            self._fd, os.fsencode(str(directory)), WATCH_MASK | IN_ONLYDIR
+        )
+        if wd < 0:
+            return None
+        return wd
+
+    def _register(self, directory: Path, names, recursive: bool) -> bool:
+        wd = self._add_watch(directory)
+        if wd is None:
+            return False
+        with self._lock:
+            entry = self._watches.get(wd)
+            if entry is None:
+                self._watches[wd] = {
+                    "path": directory,
+                    "names": set(names) if names is not None else None,
+                    "recursive": recursive,
+                }
+            else:
+                # The same directory can be both a targeted parent and part of a
+                # recursive tree; the broader filter wins.
+                if entry["names"] is not None:
+                    entry["names"] = None if names is None else entry["names"] | set(names)
+                entry["recursive"] = entry["recursive"] or recursive
+        return True
+
+    def _watched_paths(self) -> set[Path]:
+        with self._lock:
+            return {entry["path"] for entry in self._watches.values()}
+
+    def _walk_recursive(self, root: Path, known: set[Path] | None = None) -> int:
+        """Add watches for root and every subdirectory not yet watched."""
+        known = self._watched_paths() if known is None else known
+        added = 0
+        for current, dirnames, _files in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in IGNORE_DIR_NAMES]
+            path = Path(current)
+            if path in known:
+                continue
+            if self._register(path, None, True):
+                known.add(path)
+                added += 1
+        return added
+
+    def watch_directory(self, directory, names=None, recursive=False) -> bool:
+        """Watch a directory; names restricts events to those direct entries."""
+        directory = Path(directory)
+        if not directory.is_dir():
+            return False
+        if recursive:
+            self._recursive_roots.append(directory)
+            self._walk_recursive(directory)
+            return directory in self._watched_paths()
+        return self._register(directory, names, False)
+
+    def watch_count(self) -> int:
+        with self._lock:
+            return len(self._watches)
+
+    def _dispatch_buffer(self, data: bytes):
+        """Parse one read() worth of inotify events and forward the relevant ones."""
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            raw_name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            name = os.fsdecode(raw_name) if raw_name else ""
+
+            if mask & IN_Q_OVERFLOW:
+                self._rescan_after_overflow()
+                self.callback(InotifyEvent("overflow", "", False))
+                continue
+
+            with self._lock:
+                entry = self._watches.get(wd)
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+            if entry is None or mask & IN_IGNORED:
+                continue
+
+            if name and entry["names"] is not None and name not in entry["names"]:
+                continue
+
+            path = entry["path"] / name if name else entry["path"]
+            is_dir = bool(mask & IN_ISDIR)
+            if is_dir and entry["recursive"] and mask & (IN_CREATE | IN_MOVED_TO):
+                if name not in IGNORE_DIR_NAMES:
+                    self._walk_recursive(path)
+            self.callback(InotifyEvent(_event_type(mask), str(path), is_dir))
+
+    def _rescan_after_overflow(self):
+        """Pick up directories created while events were being dropped."""
+        known = self._watched_paths()
+        for root in list(self._recursive_roots):
+            if root.is_dir():
+                self._walk_recursive(root, known)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                ready, _, _ = select.select([self._fd], [], [], 0.5)
+            except (OSError, ValueError):
+                break
+            if not ready:
+                continue
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except BlockingIOError:
+                continue
+            except OSError:
+                break
+            if data:
+                self._dispatch_buffer(data)
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name="agent-sync-inotify", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
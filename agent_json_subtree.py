@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Read and patch one top-level key of a large JSON document without a full parse.
+
+~/.claude.json holds Claude Code's per-project state and is routinely several
+megabytes, but MCP sync only cares about its "mcpServers" key. For pretty-printed
+documents (how Claude Code writes the file) a top-level key is a line starting
+with exactly one indent unit followed by a quote; JSON strings cannot contain raw
+newlines, so that pattern cannot occur inside a value. The file is memory-mapped
+and searched for that line, only the value's bytes are decoded, and patches
+splice new bytes into the original so the rest of the file stays byte-identical.
+
+Compact or unusually formatted documents fall back to a full json parse/rewrite.
+"""
+
+import json
+import mmap
+import os
+import re
+import shutil
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+
+_PRETTY_HEADER = re.compile(rb"\A\s*\{\r?\n([ \t]+)\"")
+_COPY_CHUNK = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class SubtreeSpan:
+    """Byte span [start, end) of a top-level value plus the document's indent unit."""
+
+    start: int
+    end: int
+    indent: bytes
+    value: object
+
+
+def _map(f):
+    size = os.fstat(f.fileno()).st_size
+    if size == 0:
+        return None
+    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _locate(mm, key: str) -> tuple[SubtreeSpan | None, bytes | None]:
+    """Return (span, indent). span is None when key is absent; indent None if not pretty."""
+    header = _PRETTY_HEADER.match(mm[:4096])
+    if not header:
+        return None, None
+    indent = header.group(1)
+    key_pattern = re.compile(
+        rb"\n" + re.escape(indent) + re.escape(json.dumps(key).encode()) + rb"[ \t]*:[ \t]*"
+    )
+    match = key_pattern.search(mm)
+    if not match:
+        return None, indent
+
+    start = match.end()
+    next_key = re.compile(rb"\n" + re.escape(indent) + rb"\"").search(mm, start)
+    if next_key:
+        end = next_key.start()
+    else:
+        closing = mm.rfind(b"\n}")
+        if closing < start:
+            return None, None
+        end = closing
+    # Trim the separator and whitespace that belong to the enclosing object.
+    while end > start and mm[end - 1:end] in (b" ", b"\t", b"\r", b"\n"):
+        end -= 1
+    if next_key and mm[end - 1:end] == b",":
+        end -= 1
+    try:
+        value = json.loads(bytes(mm[start:end]))
+    except ValueError:
+        return None, None
+    return SubtreeSpan(start, end, indent, value), indent
+
+
+def locate_top_level_value(path: Path, key: str) -> SubtreeSpan | None:
+    """Find key's value span in a pretty-printed JSON object, or None."""
+    try:
+        with open(path, "rb") as f:
+            mm = _map(f)
+            if mm is None:
+                return None
+            try:
+                span, _ = _locate(mm, key)
+                return span
+            finally:
+                mm.close()
+    except OSError:
+        return None
+
+
+def read_top_level_value(path: Path, key: str, default=None):
+    """Return data[key] from a JSON object file, decoding only that subtree when possible."""
+    path = Path(path)
+    try:
+        with open(path, "rb") as f:
+            mm = _map(f)
+            if mm is None:
+                return default
+            try:
+                span, indent = _locate(mm, key)
+                if span is not None:
+                    return span.value
+                if indent is not None:
+                    return default
+                data = json.loads(bytes(mm))
+            finally:
+                mm.close()
+    except (OSError, ValueError):
+        return default
+    if isinstance(data, dict):
+        return data.get(key, default)
+    return default
+
+
+def _indented_value(value, indent: bytes) -> bytes:
+    """Serialize value as a depth-1 member of a document indented by indent."""
+    text = json.dumps(value, indent=indent.decode())
+    lines = text.split("\n")
+    return ("\n".join([lines[0]] + [indent.decode() + line for line in lines[1:]])).encode()
+
+
+def _write_spliced(path: Path, pieces) -> str:
+    """Write pieces (bytes or (mmap, start, end)) to a temp file beside path."""
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as out:
+            for piece in pieces:
+                if isinstance(piece, bytes):
+                    out.write(piece)
+                    continue
+                source, start, end = piece
+                for offset in range(start, end, _COPY_CHUNK):
+                    out.write(source[offset:min(end, offset + _COPY_CHUNK)])
+        try:
+            shutil.copymode(path, tmp_name)
+        except OSError:
+            pass
+        return tmp_name
+    except BaseException:
+        _discard(tmp_name)
+        raise
+
+
+def _discard(tmp_name: str):
+    try:
+        os.unlink(tmp_name)
+    except OSError:
+        pass
+
+
+def _commit(tmp_name: str, path: Path):
+    try:
+        os.replace(tmp_name, path)
+    except BaseException:
+        _discard(tmp_name)
+        raise
+
+
+def replace_top_level_value(path: Path, key: str, value) -> bool:
+    """Set data[key] = value, leaving every other byte of the file untouched.
+
+    Returns True if the file was written. Falls back to a full rewrite
+    (indent=2, same as before) when the document is not pretty-printed.
+    """
+    path = Path(path)
+    if not path.exists() or path.stat().st_size == 0:
+        path.write_text(json.dumps({key: value}, indent=2) + "\n")
+        return True
+
+    tmp_name = None
+    with open(path, "rb") as f:
+        mm = _map(f)
+        try:
+            span, indent = _locate(mm, key)
+            if span is not None:
+                if span.value == value:
+                    return False
+                tmp_name = _write_spliced(path, [
+                    (mm, 0, span.start),
+                    _indented_value(value, span.indent),
+                    (mm, span.end, len(mm)),
+                ])
+            elif indent is not None:
+                closing = mm.rfind(b"\n}")
+                if closing > 0:
+                    member = b",\n" + indent + json.dumps(key).encode() + b": "
+                    tmp_name = _write_spliced(path, [
+                        (mm, 0, closing),
+                        member + _indented_value(value, indent),
+                        (mm, closing, len(mm)),
+                    ])
+            if tmp_name is None:
+                data = json.loads(bytes(mm))
+        finally:
+            mm.close()
+
+    # The map is closed before replacing so this also works where mapped files
+    # cannot be renamed over (Windows).
+    if tmp_name is not None:
+        _commit(tmp_name, path)
+        return True
+
+    if not isinstance(data, dict):
+        data = {}
+    if key in data and data[key] == value:
+        return False
+    data[key] = value
+    path.write_text(json.dumps(data, indent=2) + "\n")
+    return True
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Buffered daemon log with levels and rename-based rotation.
+
+Every _log_message call used to open daemon.log, append one line and close it,
+and rotation read the whole file into memory to keep its last quarter. Now:
+
+- In the watch daemon (start_background()), log() formats the line and queues
+  it; a background writer appends batches through one open handle, so logging
+  never waits on disk I/O. Short-lived CLI commands append synchronously.
+- At LOG_MAX_BYTES the writer renames daemon.log to daemon.log.1 and shifts
+  older segments to daemon.log.2.gz .. daemon.log.N.gz, gzip-compressing the
+  previous .1 while streaming (constant memory). The newest segment stays
+  uncompressed for one cycle because systemd/nohup may still append stdout
+  to it through an inherited descriptor.
+- ARSRULES_LOG_LEVEL (debug, info, warning, error) filters messages. Per-file
+  messages from the skills/MCP/settings syncers are logged at debug, so
+  ARSRULES_LOG_LEVEL=info keeps only sync-level messages. Default: debug.
+
+The writer thread exits after IDLE_EXIT_SECONDS without messages and is
+restarted by the next log() call; pending lines are flushed at interpreter exit.
+"""
+
+import atexit
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from agent_disk_ledger import ledger_for
+
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+MAX_PENDING_LINES = 10000
+IDLE_EXIT_SECONDS = 5.0
+
+
+def level_from_env(default=DEBUG) -> int:
+    value = os.environ.get("ARSRULES_LOG_LEVEL", "").strip().lower()
+    return LEVELS.get(value, default)
+
+
+class DaemonLog:
+    """Queues formatted lines and appends them from a background thread."""
+
+    def __init__(self, path: Path, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT, level=None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = max(1, backup_count)
+        self.level = level_from_env() if level is None else level
+        self._cond = threading.Condition()
+        self._pending = []
+        self._dropped = 0
+        self._writing = False
+        self._thread = None
+        self._file = None
+        self._size = 0
+        self.background = False
+
+    def start_background(self):
+        """Queue lines for the writer thread from now on (used by the daemon)."""
+        self.background = True
+
+    def log(self, level: int, message: str):
+        if level < self.level:
+            return
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        prefix = "ERROR: " if level >= ERROR else "WARNING: " if level >= WARNING else ""
+        line = f"[{timestamp}] {prefix}{message}\n"
+        with self._cond:
+            if not self.background:
+                try:
+                    self._write([line])
+                except Exception:
+                    pass
+                finally:
+                    self._close_file()
+                return
+            if len(self._pending) >= MAX_PENDING_LINES:
+                self._dropped += 1
+                return
+            self._pending.append(line)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="agent-sync-log-writer", daemon=True
+                )
+                self._thread.start()
+            else:
+                self._cond.notify()
+
+    def flush(self, timeout=5.0) -> bool:
+        """Wait until queued lines are on disk; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(IDLE_EXIT_SECONDS)
+                if not self._pending:
+                    self._close_file()
+                    self._thread = None
+                    self._cond.notify_all()
+                    return
+                batch, self._pending = self._pending, []
+                dropped, self._dropped = self._dropped, 0
+                self._writing = True
+            try:
+                if dropped:
+                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    batch.append(f"[{timestamp}] WARNING: {dropped} log messages dropped (writer backlog)\n")
+                self._write(batch)
+            except Exception:
+                pass
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _write(self, lines):
+        if self._file is None:
+            self._file = open(self.path, "ab")
+            self._size = os.fstat(self._file.fileno()).st_size
+        data = "".join(lines).encode("utf-8", errors="replace")
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        ledger_for(self.path.parent).add(len(data))
+        if self._size >= self.max_bytes:
+            self._rotate()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+    def segment_path(self, index: int) -> Path:
+        suffix = f".{index}" if index == 1 else f".{index}.gz"
+        return self.path.with_name(self.path.name + suffix)
+
+    def _rotate(self):
+        """Shift segments by rename; compress the previous .1 into .2.gz."""
+        import gzip
+        import shutil
+
+        self._close_file()
+        ledger = ledger_for(self.path.parent)
+        oldest = self.segment_path(self.backup_count)
+        if self.backup_count > 1 and oldest.exists():
+            ledger.add(-oldest.stat().st_size)
+            oldest.unlink()
+        for index in range(self.backup_count - 1, 1, -1):
+            source = self.segment_path(index)
+            if source.exists():
+                os.replace(source, self.segment_path(index + 1))
+        newest = self.segment_path(1)
+        if newest.exists():
+            if self.backup_count > 1:
+                compressed = self.segment_path(2)
+                raw_size = newest.stat().st_size
+                with open(newest, "rb") as src, gzip.open(compressed, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                newest.unlink()
+                ledger.add(compressed.stat().st_size - raw_size)
+            else:
+                ledger.add(-newest.stat().st_size)
+                newest.unlink()
+        os.replace(self.path, newest)
+        self._size = 0
+
+
+_logs = {}
+_logs_guard = threading.Lock()
+
+
+def daemon_log(config_dir: Path) -> DaemonLog:
+    """The shared daemon.log writer for config_dir."""
+    path = Path(config_dir) / "daemon.log"
+    key = str(path)
+    log = _logs.get(key)
+    if log is not None:
+        return log
+    with _logs_guard:
+        log = _logs.get(key)
+        if log is None:
+            log = _logs[key] = DaemonLog(path)
+        return log
+
+
+@atexit.register
+def _flush_all():
+    for log in list(_logs.values()):
+        log.flush(timeout=2.0)
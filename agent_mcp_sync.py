@@ -24,10 +24,13 @@ from pathlib import Path
 import shutil
 from datetime import datetime
 import re
-import toml
 
 from agent_antigravity_cli import ensure_plugin as ensure_antigravity_cli_plugin
-from agent_exclusions import ExclusionRules
+from agent_registry import registry_for
+from agent_json_subtree import read_top_level_value, replace_top_level_value
+from agent_disk_ledger import ledger_for
+from agent_metrics import BACKUPS_CREATED, BYTES_WRITTEN
+from agent_stat_cache import shared_stat_cache
 
 class AgentMcpSync:
     """Manages synchronization of MCP server configurations."""
@@ -38,12 +41,16 @@ class AgentMcpSync:
         self.master_file = self.config_dir / "mcp.json"
         self.backup_dir = self.config_dir / "mcp_backups"
         self.backup_dir.mkdir(exist_ok=True)
-        self.exclusions = ExclusionRules(self.config_dir)
+        self.registry = registry_for(self.config_dir)
+        self.exclusions = self.registry.exclusions
+        self.stat_cache = shared_stat_cache()
 
         self.global_sources = {
             "claude-code": {
                 "name": "Claude Code",
                 "path": Path.home() / ".claude.json",
+                # Multi-MB per-project state: read/patch only the mcpServers subtree.
+                "streaming": True,
             },
             "cursor": {
                 "name": "Cursor",
@@ -78,10 +85,16 @@ class AgentMcpSync:
             }
         }
 
-        self.repo_paths = []
         self._load_repo_paths()
+        self.registry.subscribe(self._on_registry_change)
         self.plugin_mcp_paths = self._discover_plugin_mcp_paths()
 
+    def _on_registry_change(self, changed):
+        if "repos" in changed:
+            self._load_repo_paths()
+        if "exclusions" in changed:
+            self.exclusions = self.registry.exclusions
+
     def _get_claude_desktop_path(self) -> Path:
         import sys
         if sys.platform == "darwin":
@@ -92,17 +105,7 @@ class AgentMcpSync:
             return Path.home() / ".config" / "Claude" / "claude_desktop_config.json"
 
     def _load_repo_paths(self):
-        repo_paths_file = self.config_dir / "repo_paths.json"
-        if not repo_paths_file.exists():
-            return
-        try:
-            paths = json.loads(repo_paths_file.read_text())
-            for p in paths:
-                repo = Path(p).expanduser().resolve()
-                if repo.is_dir():
-                    self.repo_paths.append(repo)
-        except Exception:
-            pass
+        self.repo_paths = self.registry.repo_paths
 
     def _discover_plugin_mcp_paths(self) -> list[Path]:
         plugin_root = Path(__file__).resolve().parent / "plugins"
@@ -186,6 +189,8 @@ class AgentMcpSync:
         return result
 
     def _from_codex_file(self, path: Path, info: dict) -> dict:
+        import toml  # only needed when a Codex config exists
+
         try:
             data = toml.loads(path.read_text())
             mcp_key = info.get("mcp_key", "mcp_servers")
@@ -268,6 +273,7 @@ class AgentMcpSync:
         if path.exists() and path.read_text() == output_text:
             return False
         path.write_text(output_text)
+        BYTES_WRITTEN.inc(len(output_text.encode()), component="mcp")
         return True
 
     def _get_mcp_servers(self, path: Path, info: dict = None) -> dict:
@@ -279,6 +285,9 @@ class AgentMcpSync:
                 return info["from_file"](path, info)
             if info and info.get("from_file"):
                 return info["from_file"](path, info)
+            if info and info.get("streaming"):
+                servers = read_top_level_value(path, info.get("mcp_key", "mcpServers"), {})
+                return servers if isinstance(servers, dict) else {}
             data = json.loads(path.read_text())
             mcp_key = info.get("mcp_key", "mcpServers") if info else "mcpServers"
             if mcp_key in data:
@@ -318,9 +327,9 @@ class AgentMcpSync:
         return result
 
     def _file_hash(self, path: Path) -> str | None:
-        if not path.exists():
-            return None
-        return hashlib.sha256(path.read_bytes()).hexdigest()
+        return self.stat_cache.get(
+            "sha256", path, lambda p: hashlib.sha256(p.read_bytes()).hexdigest()
+        )
 
     def _canonicalize(self, data):
         if isinstance(data, dict):
@@ -346,17 +355,23 @@ class AgentMcpSync:
         info: dict | None = None,
         repo: Path | None = None,
     ) -> str | None:
-        if not path.exists():
-            return None
-        try:
-            servers = self._get_mcp_servers(path, info)
-            excluded = self.exclusions.for_target("mcp", label, repo)
-            normalized = {
-                name: cfg for name, cfg in servers.items() if name not in excluded
-            }
-            return self._data_hash(normalized)
-        except Exception:
-            return self._file_hash(path)
+        excluded = self.exclusions.for_target("mcp", label, repo)
+
+        def compute(p):
+            try:
+                servers = self._get_mcp_servers(p, info)
+                normalized = {
+                    name: cfg for name, cfg in servers.items() if name not in excluded
+                }
+                return self._data_hash(normalized)
+            except Exception:
+                return hashlib.sha256(p.read_bytes()).hexdigest()
+
+        # Parsing + canonicalizing only happens when the file's stat moved or the
+        # exclusion set for this target changed.
+        return self.stat_cache.get(
+            f"mcp-watch:{label}", path, compute, token=excluded
+        )
 
     def _backup_file(self, path: Path, label: str):
         if not path.exists():
@@ -364,6 +379,27 @@ class AgentMcpSync:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = self.backup_dir / f"{label}_{timestamp}.json"
         shutil.copy2(path, backup_path)
+        ledger_for(self.config_dir).add_file(backup_path)
+        BACKUPS_CREATED.inc(component="mcp")
+
+    def _backup_mcp_delta(self, path: Path, label: str, mcp_key: str, previous: dict, new: dict):
+        """Back up only the MCP subtree of a large file, plus what is about to change."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        backup_path = self.backup_dir / f"{label}_{timestamp}.{mcp_key}.json"
+        delta = {
+            "source": str(path),
+            "key": mcp_key,
+            "added": sorted(set(new) - set(previous)),
+            "removed": sorted(set(previous) - set(new)),
+            "changed": sorted(
+                name for name in set(previous) & set(new)
+                if not self._json_equal(previous[name], new[name])
+            ),
+            "previous": previous,
+        }
+        backup_path.write_text(json.dumps(delta, indent=2) + "\n")
+        ledger_for(self.config_dir).add_file(backup_path)
+        BACKUPS_CREATED.inc(component="mcp")
 
     def _master_is_newest(self):
         """
@@ -393,6 +429,7 @@ class AgentMcpSync:
 
     def sync(self, log_callback=None, direction="bidirectional"):
         log = log_callback or (lambda _: None)
+        self.registry.refresh()
 
         # 1. Load current master
         master_data = {}
@@ -467,6 +504,7 @@ class AgentMcpSync:
             if self.master_file.exists():
                 self._backup_file(self.master_file, "master")
             self.master_file.write_text(new_master_json)
+            BYTES_WRITTEN.inc(len(new_master_json.encode()), component="mcp")
             log(f"[mcp] Updated master mcp.json with {len(all_servers)} servers")
 
         # 4. Push back to agents (skip for pull-only)
@@ -491,25 +529,31 @@ class AgentMcpSync:
             except Exception:
                 return
 
-        current_data = {}
-        if path.exists():
-            try:
-                current_data = json.loads(path.read_text())
-            except Exception:
-                pass
-
-        new_data = dict(current_data)
         mcp_key = info.get("mcp_key", "mcpServers") if info else "mcpServers"
         excluded = self.exclusions.for_target("mcp", label, repo)
         target_servers = {
             name: cfg for name, cfg in servers.items() if name not in excluded
         }
-        if excluded:
-            log(f"[mcp] Excluding {len(excluded)} server(s) from {label}: {', '.join(sorted(excluded))}")
+        dropped = sorted(set(servers) - set(target_servers))
+        if dropped:
+            log(f"[mcp] Excluding {len(dropped)} server(s) from {label}: {', '.join(dropped)}")
 
         output_servers = target_servers
         if info and "from_internal" in info:
             output_servers = info["from_internal"](target_servers)
+
+        if info and info.get("streaming"):
+            self._update_streaming_target(path, output_servers, label, log, mcp_key)
+            return
+
+        current_data = {}
+        if path.exists():
+            try:
+                current_data = json.loads(path.read_text())
+            except Exception:
+                pass
+
+        new_data = dict(current_data)
         new_data[mcp_key] = output_servers
 
         new_json = json.dumps(new_data, indent=2) + "\n"
@@ -530,17 +574,26 @@ class AgentMcpSync:
             if path.exists():
                 self._backup_file(path, label)
             path.write_text(new_json)
+            BYTES_WRITTEN.inc(len(new_json.encode()), component="mcp")
+            log(f"[mcp] Synced {label} ({path.name})")
+
+    def _update_streaming_target(self, path: Path, output_servers: dict, label: str, log, mcp_key: str):
+        """Patch only the MCP subtree of a large JSON file; the rest stays byte-identical."""
+        current = read_top_level_value(path, mcp_key, None) if path.exists() else None
+        if current is not None and self._json_equal(current, output_servers):
+            return
+        if isinstance(current, dict):
+            self._backup_mcp_delta(path, label, mcp_key, current, output_servers)
+        if replace_top_level_value(path, mcp_key, output_servers):
+            BYTES_WRITTEN.inc(path.stat().st_size, component="mcp")
             log(f"[mcp] Synced {label} ({path.name})")
 
     def get_watch_hashes(self) -> dict:
         hashes = {}
         if self.master_file.exists():
-            try:
-                hashes[self.master_file] = self._data_hash(
-                    json.loads(self.master_file.read_text()).get("mcpServers", {})
-                )
-            except Exception:
-                hashes[self.master_file] = self._file_hash(self.master_file)
+            hashes[self.master_file] = self.stat_cache.get(
+                "mcp-master", self.master_file, self._master_watch_hash
+            )
         
         for label, info in self.global_sources.items():
             path = info["path"]
@@ -559,5 +612,11 @@ class AgentMcpSync:
                 hashes[path] = self._file_hash(path)
         return hashes
 
+    def _master_watch_hash(self, path: Path) -> str | None:
+        try:
+            return self._data_hash(json.loads(path.read_text()).get("mcpServers", {}))
+        except Exception:
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+
     def mcp_changed(self, old_hashes: dict) -> bool:
         return self.get_watch_hashes() != old_hashes
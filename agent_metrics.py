@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+In-process metrics for the watch daemon, served in Prometheus text format.
+
+The daemon listens on a Unix socket (default, ~/.config/agent-rules-sync/metrics.sock)
+or a loopback TCP port and answers GET /metrics:
+
+    curl --unix-socket ~/.config/agent-rules-sync/metrics.sock http://localhost/metrics
+
+ARSRULES_METRICS selects the endpoint: unset or "socket" for the Unix socket,
+a port number for 127.0.0.1:<port>, "off" to disable.
+
+Metrics are plain module-level objects so every sync component can record into
+the same registry without passing it around.
+"""
+
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+METRICS_SOCKET_NAME = "metrics.sock"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, key, (), value) for key, value in items]
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for name, key, extra, value in self.samples():
+            lines.append(f"{name}{_format_labels(self.label_names, key, extra)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            counts = list(counts)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[key] = (counts, total + value, count + 1)
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def value(self, **labels):
+        """Return (observation count, sum)."""
+        with self._lock:
+            _counts, total, count = self._values.get(self._key(labels), ((), 0.0, 0))
+        return count, total
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        samples = []
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                samples.append((f"{self.name}_bucket", key, (("le", _format_value(bound)),), bucket_count))
+            samples.append((f"{self.name}_bucket", key, (("le", "+Inf"),), count))
+            samples.append((f"{self.name}_sum", key, (), total))
+            samples.append((f"{self.name}_count", key, (), count))
+        return samples
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = []
+
+    def _add(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labels=()) -> Counter:
+        return self._add(Counter(name, help_text, labels))
+
+    def gauge(self, name, help_text, labels=()) -> Gauge:
+        return self._add(Gauge(name, help_text, labels))
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help_text, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+SYNC_DURATION = REGISTRY.histogram(
+    "agent_sync_component_duration_seconds", "Duration of one component sync.", ("component",)
+)
+DETECT_DURATION = REGISTRY.histogram(
+    "agent_sync_detect_duration_seconds", "Duration of one watch change-detection pass."
+)
+EVENT_QUEUE_DEPTH = REGISTRY.gauge(
+    "agent_sync_event_queue_depth", "Filesystem events waiting in the watch queue."
+)
+EVENTS_DRAINED = REGISTRY.counter(
+    "agent_sync_events_drained_total", "Filesystem events folded into an earlier detection pass."
+)
+BYTES_WRITTEN = REGISTRY.counter(
+    "agent_sync_bytes_written_total", "Bytes written to synced targets.", ("component",)
+)
+BACKUPS_CREATED = REGISTRY.counter(
+    "agent_sync_backups_created_total", "Backups written before overwriting a target.", ("component",)
+)
+HISTORY_IMPORTED = REGISTRY.counter(
+    "agent_sync_history_commands_imported_total", "Agent shell commands imported into Atuin."
+)
+ATUIN_INSERT_DURATION = REGISTRY.histogram(
+    "agent_sync_atuin_insert_duration_seconds", "Duration of one Atuin history insert batch."
+)
+DISK_USAGE = REGISTRY.gauge(
+    "agent_sync_config_dir_bytes", "Size of the agent-rules-sync config directory."
+)
+DISK_LIMIT = REGISTRY.gauge(
+    "agent_sync_config_dir_limit_bytes", "Hard size limit for the config directory."
+)
+
+
+_server_classes = None
+
+
+def _load_server_classes():
+    """Build the HTTP handler and servers on first use; http.server is slow to import."""
+    global _server_classes
+    if _server_classes is not None:
+        return _server_classes
+    import http.server
+    import socketserver
+
+    class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+        registry = REGISTRY
+
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = self.registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self):
+            return "local"
+
+        def log_message(self, format, *args):
+            pass
+
+    class _TCPServer(socketserver.ThreadingMixIn, http.server.HTTPServer):
+        daemon_threads = True
+        allow_reuse_address = True
+
+    if hasattr(socket, "AF_UNIX"):
+        class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+            def get_request(self):
+                request, _ = super().get_request()
+                return request, ("local", 0)
+    else:
+        _UnixServer = None
+
+    _server_classes = (_MetricsHandler, _TCPServer, _UnixServer)
+    return _server_classes
+
+
+class MetricsServer:
+    """Serves REGISTRY on a background thread until close()."""
+
+    def __init__(self, server, address: str, socket_path: Path | None = None):
+        self._server = server
+        self.address = address
+        self._socket_path = socket_path
+        self._thread = threading.Thread(
+            target=server.serve_forever, name="agent-sync-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._socket_path is not None:
+            try:
+                self._socket_path.unlink()
+            except OSError:
+                pass
+
+
+def start_metrics_server(config_dir: Path, setting: str | None = None) -> MetricsServer | None:
+    """Start the endpoint chosen by ARSRULES_METRICS (or setting); None when disabled."""
+    setting = (os.environ.get("ARSRULES_METRICS", "") if setting is None else setting).strip().lower()
+    if setting in ("off", "0", "false", "none"):
+        return None
+    handler, tcp_server, unix_server = _load_server_classes()
+    if setting.isdigit():
+        server = tcp_server(("127.0.0.1", int(setting)), handler)
+        return MetricsServer(server, f"http://127.0.0.1:{server.server_address[1]}/metrics")
+    if unix_server is None:
+        return None
+    socket_path = Path(config_dir) / METRICS_SOCKET_NAME
+    try:
+        socket_path.unlink()
+    except OSError:
+        pass
+    server = unix_server(str(socket_path), handler)
+    return MetricsServer(server, str(socket_path), socket_path)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Process-wide registry of sync_config.json, repo_paths.json and excludes.json.
+
+Rules, skills, settings and MCP sync each used to parse repo_paths.json (and
+resolve every entry), excludes.json and sync_config.json on their own, and the
+rules syncer re-read repo_paths.json on every watch detection pass. One
+ConfigRegistry per config directory now holds the parsed values:
+
+- Each backing file is re-read only when its stat signature moves; a refresh
+  that finds nothing changed costs three stat() calls.
+- Components subscribe a callback and are pushed the names of the parts that
+  changed ("config", "repos", "exclusions") so they can rebuild derived state
+  such as skill targets or repo CLAUDE.md targets.
+"""
+
+import json
+import threading
+import weakref
+from pathlib import Path
+
+from agent_exclusions import ExclusionRules
+from agent_stat_cache import stat_signature
+from agent_sync_config import load_config
+
+
+REGISTRY_FILES = {
+    "config": "sync_config.json",
+    "repos": "repo_paths.json",
+    "exclusions": "excludes.json",
+}
+
+
+def _read_repo_paths(path: Path) -> tuple:
+    """Resolved entries of repo_paths.json (existence is checked on access)."""
+    try:
+        entries = json.loads(path.read_text())
+    except Exception:
+        return ()
+    if not isinstance(entries, list):
+        return ()
+    repos = []
+    for entry in entries:
+        try:
+            repos.append(Path(entry).expanduser().resolve())
+        except (TypeError, OSError, RuntimeError):
+            continue
+    return tuple(repos)
+
+
+class _StrongRef:
+    """Same call shape as a weakref, for subscribers that cannot be held weakly."""
+
+    def __init__(self, target):
+        self._target = target
+
+    def __call__(self):
+        return self._target
+
+
+class ConfigRegistry:
+    """Parsed config, repo list and exclusions for one config directory."""
+
+    def __init__(self, config_dir: Path):
+        self.config_dir = Path(config_dir)
+        self._lock = threading.RLock()
+        self._signatures = {}
+        self._config = None
+        self._repos = ()
+        self._exclusions = None
+        self._subscribers = []
+        self.refresh()
+
+    def _load(self, part: str):
+        if part == "config":
+            self._config = load_config(self.config_dir)
+        elif part == "repos":
+            self._repos = _read_repo_paths(self.config_dir / REGISTRY_FILES["repos"])
+        else:
+            self._exclusions = ExclusionRules(self.config_dir)
+
+    def refresh(self) -> set:
+        """Reload files whose stat signature changed and notify subscribers.
+
+        Returns the names of the parts that were reloaded.
+        """
+        with self._lock:
+            changed = set()
+            for part, filename in REGISTRY_FILES.items():
+                signature = stat_signature(self.config_dir / filename)
+                if part in self._signatures and self._signatures[part] == signature:
+                    continue
+                first_load = part not in self._signatures
+                self._signatures[part] = signature
+                self._load(part)
+                if not first_load:
+                    changed.add(part)
+            subscribers = list(self._subscribers) if changed else []
+        for ref in subscribers:
+            callback = ref()
+            if callback is None:
+                self._drop(ref)
+                continue
+            try:
+                callback(changed)
+            except Exception:
+                # One component failing to rebuild must not starve the others.
+                pass
+        return changed
+
+    @property
+    def config(self):
+        """The merged SyncConfig from sync_config.json."""
+        self.refresh()
+        return self._config
+
+    @property
+    def repo_paths(self) -> list[Path]:
+        """Configured repo directories that currently exist."""
+        self.refresh()
+        return [repo for repo in self._repos if repo.is_dir()]
+
+    @property
+    def exclusions(self) -> ExclusionRules:
+        self.refresh()
+        return self._exclusions
+
+    def subscribe(self, callback):
+        """Call callback(changed_parts) after each reload.
+
+        Bound methods are held weakly so a discarded syncer is not kept alive.
+        """
+        try:
+            ref = weakref.WeakMethod(callback)
+        except TypeError:
+            ref = _StrongRef(callback)
+        with self._lock:
+            self._subscribers.append(ref)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [ref for ref in self._subscribers if ref() != callback]
+
+    def _drop(self, ref):
+        with self._lock:
+            if ref in self._subscribers:
+                self._subscribers.remove(ref)
+
+
+_registries = {}
+_registries_guard = threading.Lock()
+
+
+def registry_for(config_dir: Path) -> ConfigRegistry:
+    """The shared registry for config_dir (one per resolved directory per process)."""
+    alias = str(config_dir)
+    registry = _registries.get(alias)
+    if registry is not None:
+        return registry
+    key = str(Path(config_dir).expanduser().resolve())
+    with _registries_guard:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = ConfigRegistry(config_dir)
+        # Later lookups with the same spelling skip resolve().
+        _registries[alias] = registry
+        return registry
@@ -22,25 +22,34 @@ Skills sync across:
 Changes are automatically synced to all agents!
 """
 
-import argparse
+import functools
 import os
 import sys
 import time
 import hashlib
 import threading
 import queue
-import subprocess
 from pathlib import Path
 from datetime import datetime
 import shutil
 import signal
 
-from agent_skills_sync import AgentSkillsSync
-from agent_settings_sync import AgentSettingsSync
-from agent_mcp_sync import AgentMcpSync
-from agent_history_sync import AgentHistorySync, ensure_atuin_installed, ensure_atuin_zsh
-from agent_sync_config import load_config, save_config, SyncConfig, DEFAULT_CONFIG, run_wizard
-from agent_antigravity_cli import ensure_plugin as ensure_antigravity_cli_plugin
+# Sub-syncers, the watch machinery (executor, control socket, metrics, tracing,
+# sync locks) and argparse are imported where they are first used, so scoped
+# commands (`status`, `sync rules`) start quickly.
+from agent_sync_config import load_config, save_config, SyncConfig, DEFAULT_CONFIG
+from agent_registry import registry_for
+from agent_disk_ledger import ledger_for, measure_tree
+from agent_logging import DEBUG, ERROR, INFO, daemon_log
+from agent_stat_cache import shared_stat_cache
+
+# Watch state components, in the order of AgentRulesSync._build_watch_state();
+# same as agent_watch_snapshot.WATCH_COMPONENTS.
+WATCH_COMPONENTS = ("rules", "skills", "settings", "mcp", "history")
+
+def default_config_dir() -> Path:
+    """~/.config/agent-rules-sync, where all state, logs and sockets live."""
+    return Path.home() / ".config" / "agent-rules-sync"
 
 
 class AgentRulesSync:
@@ -52,11 +61,15 @@ class AgentRulesSync:
     EVENT_DETECT_INTERVAL_SECONDS = 30
     WATCH_DIAGNOSTIC_SECONDS = 0.5
     WATCH_ROOT_WARNING_COUNT = 40
+    POLLED_ROOT_RESCAN_SECONDS = 15
+    SYNC_COMPONENTS = ("rules", "skills", "settings", "mcp")
+    SNAPSHOT_SAVE_INTERVAL_SECONDS = 60
+    SYNC_WORKERS = 3
 
     def __init__(self):
         """Initialize the sync manager with config in ~/.config/agent-rules-sync/"""
         # Store config in user's .config directory (hidden)
-        self.config_dir = Path.home() / ".config" / "agent-rules-sync"
+        self.config_dir = default_config_dir()
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
         # Master rules file (hidden from user)
@@ -75,23 +88,22 @@ class AgentRulesSync:
         self.stop_event = threading.Event()
         self._last_disk_guard_check = 0.0
         self._size_cache = {}
+        self._last_snapshot_save = 0.0
+        self._snapshot_dirty = False
+        # Guards the watch dicts, shared by the watch thread and sync workers.
+        self._watch_state_lock = threading.RLock()
+        self._sync_prepare_lock = threading.Lock()
+        self._sync_executor = None
+        # Per-component watch hashes as of the last completed sync; the only
+        # state written to watch_state.json, so queued changes survive a restart.
+        self._synced_watch_state = {}
+        self._registry = None
+        self._watch_plan = None
+        self._last_component_sync = {}
+        # Content hashes are reused while a file's stat signature is unchanged.
+        self.stat_cache = shared_stat_cache()
         self._launchd_label = os.environ.get("ARSRULES_LAUNCHD_LABEL", "com.local.agent-rules-sync")
 
-        # Skills sync (syncs skills across Cursor, Claude, Codex, Gemini, OpenCode)
-        self.skills_sync = AgentSkillsSync(config_dir=self.config_dir)
-
-        # Settings sync (syncs portable ~/.claude/settings.json to configured repos)
-        self.settings_sync = AgentSettingsSync(config_dir=self.config_dir)
-
-        # MCP sync (syncs mcp.json across Cursor, Claude, Gemini, etc.)
-        self.mcp_sync = AgentMcpSync(config_dir=self.config_dir)
-
-        # History sync (imports agent-run shell commands into Atuin)
-        self.history_sync = AgentHistorySync(config_dir=self.config_dir)
-
-        # Sync direction config
-        self.sync_config = load_config(self.config_dir)
-
         # Agent configuration files (user-facing)
         self.agents = {
             "claude": {
@@ -150,6 +162,69 @@ class AgentRulesSync:
         # Uses the same repo_paths.json as agent_skills_sync.
         self._load_repo_agent_paths()
 
+    # Sub-syncers are built on first use; most commands only touch one of them.
+    @functools.cached_property
+    def skills_sync(self):
+        """Skills sync (syncs skills across Cursor, Claude, Codex, Gemini, OpenCode)."""
+        from agent_skills_sync import AgentSkillsSync
+
+        return AgentSkillsSync(config_dir=self.config_dir)
+
+    @functools.cached_property
+    def settings_sync(self):
+        """Settings sync (syncs portable ~/.claude/settings.json to configured repos)."""
+        from agent_settings_sync import AgentSettingsSync
+
+        return AgentSettingsSync(config_dir=self.config_dir)
+
+    @functools.cached_property
+    def mcp_sync(self):
+        """MCP sync (syncs mcp.json across Cursor, Claude, Gemini, etc.)."""
+        from agent_mcp_sync import AgentMcpSync
+
+        return AgentMcpSync(config_dir=self.config_dir)
+
+    @functools.cached_property
+    def history_sync(self):
+        """History sync (imports agent-run shell commands into Atuin)."""
+        from agent_history_sync import AgentHistorySync
+
+        return AgentHistorySync(config_dir=self.config_dir)
+
+    @functools.cached_property
+    def sync_locks(self):
+        """Serializes each component's sync with other agent-sync processes."""
+        from agent_sync_lock import SyncLockManager
+
+        return SyncLockManager(self.config_dir)
+
+    def _span(self, name, **attrs):
+        """agent_trace span written under the current config_dir."""
+        from agent_trace import configure_tracing, span
+
+        configure_tracing(self.config_dir)
+        return span(name, **attrs)
+
+    @property
+    def registry(self):
+        """Shared config/repos/exclusions registry for the current config_dir."""
+        registry = registry_for(self.config_dir)
+        if registry is not self._registry:
+            if self._registry is not None:
+                self._registry.unsubscribe(self._on_registry_change)
+            registry.subscribe(self._on_registry_change)
+            self._registry = registry
+        return registry
+
+    def _on_registry_change(self, changed):
+        if "repos" in changed:
+            self._load_repo_agent_paths()
+
+    @property
+    def sync_config(self):
+        """Sync direction config."""
+        return self.registry.config
+
     @property
     def state_file(self):
         """Previous sync’s shared bullets; always under the active config_dir."""
@@ -259,41 +334,24 @@ class AgentRulesSync:
                     merged_local.discard(rule)
 
     def _load_repo_agent_paths(self):
-        """Add configured repos' CLAUDE.md as rules sync targets."""
-        import json
-        repo_paths_file = self.config_dir / "repo_paths.json"
-        if not repo_paths_file.exists():
-            return
-        try:
-            repo_paths = json.loads(repo_paths_file.read_text())
-            for repo_path in repo_paths:
-                repo = Path(repo_path).expanduser().resolve()
-                if repo.is_dir():
-                    agent_id = f"repo:{repo.name}"
-                    self.agents[agent_id] = {
-                        "name": f"Repo: {repo.name}",
-                        "path": repo / "CLAUDE.md",
-                        "description": f"Project CLAUDE.md for {repo.name}",
-                    }
-        except Exception:
-            pass
+        """Set configured repos' CLAUDE.md as rules sync targets (replacing earlier repo targets)."""
+        agents = {
+            agent_id: config
+            for agent_id, config in self.agents.items()
+            if not agent_id.startswith("repo:")
+        }
+        for repo in self.registry.repo_paths:
+            agents[f"repo:{repo.name}"] = {
+                "name": f"Repo: {repo.name}",
+                "path": repo / "CLAUDE.md",
+                "description": f"Project CLAUDE.md for {repo.name}",
+            }
+        # Swapped in whole: sync workers may be iterating the previous dict.
+        self.agents = agents
 
     def _list_repo_roots(self):
-        """Resolved repo directories from repo_paths.json (same entries as repo CLAUDE.md targets)."""
-        import json
-        repo_paths_file = self.config_dir / "repo_paths.json"
-        if not repo_paths_file.exists():
-            return []
-        try:
-            repo_paths = json.loads(repo_paths_file.read_text())
-        except Exception:
-            return []
-        roots = []
-        for repo_path in repo_paths:
-            repo = Path(repo_path).expanduser().resolve()
-            if repo.is_dir():
-                roots.append(repo)
-        return roots
+        """Repo directories from repo_paths.json (same entries as repo CLAUDE.md targets)."""
+        return self.registry.repo_paths
 
     def _cursorrules_legacy_paths(self):
         """
@@ -447,9 +505,11 @@ class AgentRulesSync:
         return [(f"cursor:{i}", p) for i, p in enumerate(self._cursor_all_rule_paths())]
 
     def _get_file_hash(self, filepath):
-        """Calculate SHA256 hash of a file."""
-        if not filepath.exists():
-            return None
+        """Calculate SHA256 hash of a file (cached by stat signature)."""
+        return self.stat_cache.get("sha256", filepath, self._hash_file_contents)
+
+    @staticmethod
+    def _hash_file_contents(filepath):
         with open(filepath, 'rb') as f:
             return hashlib.sha256(f.read()).hexdigest()
 
@@ -488,8 +548,12 @@ class AgentRulesSync:
         backup_path = self.backup_dir / backup_filename
         try:
             shutil.copy2(filepath, backup_path)
+            ledger_for(self.config_dir).add_file(backup_path)
             if file_hash:
                 self._load_rule_backup_hashes(agent_name).add(file_hash)
+            from agent_metrics import BACKUPS_CREATED
+
+            BACKUPS_CREATED.inc(component="rules")
             return backup_path
         except Exception:
             return None
@@ -605,9 +669,12 @@ class AgentRulesSync:
         except Exception:
             pass
 
-    def sync(self):
+    def sync(self, components=None):
         """
-        Sync rules with smart deletion detection.
+        Sync rules with smart deletion detection, then skills, settings and MCP.
+
+        components limits the run to a subset of SYNC_COMPONENTS (e.g. after a warm
+        daemon restart only the components that changed while it was down).
 
         Strategy:
         - Load previous state to detect deletions
@@ -616,26 +683,54 @@ class AgentRulesSync:
         """
         if self._check_disk_quota(force=True):
             return
+        components = set(self.SYNC_COMPONENTS if components is None else components)
         try:
             # Tests (and future callers) may point config_dir at an isolated directory after
-            # __init__; reload config + sub-syncers so we never use another dir's sync_state,
-            # sync_config.json, or skills paths.
-            self.sync_config = load_config(self.config_dir)
-            if self.skills_sync.config_dir.resolve() != self.config_dir.resolve():
-                self.skills_sync = AgentSkillsSync(config_dir=self.config_dir)
-            if self.settings_sync.config_dir.resolve() != self.config_dir.resolve():
-                self.settings_sync = AgentSettingsSync(config_dir=self.config_dir)
-            if self.mcp_sync.config_dir.resolve() != self.config_dir.resolve():
-                self.mcp_sync = AgentMcpSync(config_dir=self.config_dir)
-            expect_backup = self.config_dir / "backups"
-            if self.backup_dir.resolve() != expect_backup.resolve():
-                self.backup_dir = expect_backup
-                self.backup_dir.mkdir(parents=True, exist_ok=True)
-                self._rule_backup_hashes = {}
-
-            self._ensure_master_exists()
-            self._migrate_from_old_version()
+            # __init__; rebuild sub-syncers so we never use another dir's sync_state,
+            # sync_config.json, or skills paths. Sync workers run components concurrently,
+            # so the reload is serialized.
+            with self._sync_prepare_lock:
+                # Reloads sync_config/repo_paths/excludes only if their files changed.
+                self.registry.refresh()
+                # Rebuild (lazily) sub-syncers created for a previous config_dir.
+                for name in ("skills_sync", "settings_sync", "mcp_sync"):
+                    built = self.__dict__.get(name)
+                    if built is not None and built.config_dir.resolve() != self.config_dir.resolve():
+                        del self.__dict__[name]
+                locks = self.__dict__.get("sync_locks")
+                if locks is not None and locks.config_dir != self.config_dir:
+                    del self.__dict__["sync_locks"]
+                expect_backup = self.config_dir / "backups"
+                if self.backup_dir.resolve() != expect_backup.resolve():
+                    self.backup_dir = expect_backup
+                    self.backup_dir.mkdir(parents=True, exist_ok=True)
+                    self._rule_backup_hashes = {}
+
+            steps = {
+                "rules": self._sync_rules,
+                "skills": self._sync_skills,
+                "settings": self._sync_settings,
+                "mcp": self._sync_mcp,
+            }
+            from agent_metrics import SYNC_DURATION
+
+            for name in self.SYNC_COMPONENTS:
+                if name in components:
+                    with SYNC_DURATION.time(component=name), self._span(f"sync.{name}"):
+                        if not self.sync_locks.run_coalesced(name, steps[name]):
+                            self._log_message(
+                                f"{name} sync already covered by a concurrent run; skipped"
+                            )
+            self._check_disk_quota(force=True)
+        except Exception as e:
+            self._log_error(f"Sync error: {e}")
 
+    def _sync_rules(self):
+        """Merge rules from every agent into master and write them back out."""
+        self._ensure_master_exists()
+        self._migrate_from_old_version()
+
+        with self._span("sync.rules.master_parse"):
             # Step 1: Load previous shared rules state
             previous_shared = self._load_previous_shared_rules()
 
@@ -652,6 +747,7 @@ class AgentRulesSync:
                 master_snap_by_agent[agent_id] = set(snap)
                 master_agent_rules[agent_id] = set(snap)
 
+        with self._span("sync.rules.agent_reads"):
             # Step 3: Collect all shared rules (union for additions)
             all_shared_rules = set(master_shared)
 
@@ -674,6 +770,7 @@ class AgentRulesSync:
                     except Exception:
                         pass
 
+        with self._span("sync.rules.cursor_merge"):
             self._merge_cursor_rule_files(master_agent_rules, all_shared_rules)
             self._merge_cursorrules_legacy_into_cursor(master_agent_rules, all_shared_rules)
 
@@ -683,6 +780,7 @@ class AgentRulesSync:
                 prior_agent_specific,
             )
 
+        with self._span("sync.rules.deletion_detection"):
             # Step 4: Detect deletions (shared bullets only — agent-specific trims above)
             # If we have previous state, remove rules that were deleted from ANY file
             if previous_shared is not None:
@@ -709,6 +807,7 @@ class AgentRulesSync:
 
             master_shared = all_shared_rules
 
+        with self._span("sync.rules.writes"):
             # Step 3: Rebuild and write master file
             master_lines = ["# Shared Rules"]
             master_lines.extend(sorted(master_shared))
@@ -738,6 +837,8 @@ class AgentRulesSync:
                     agent_path = config["path"]
                     try:
                         if agent_id == "antigravity-cli":
+                            from agent_antigravity_cli import ensure_plugin as ensure_antigravity_cli_plugin
+
                             ensure_antigravity_cli_plugin()
                         agent_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -753,6 +854,9 @@ class AgentRulesSync:
                         )
                         with open(agent_path, 'w') as f:
                             f.write(content)
+                        from agent_metrics import BYTES_WRITTEN
+
+                        BYTES_WRITTEN.inc(len(content.encode()), component="rules")
                         if agent_id == "cursor":
                             self._mirror_cursorrules_legacy_files(content)
                     except Exception as e:
@@ -762,55 +866,38 @@ class AgentRulesSync:
             self._save_shared_rules_state(master_shared)
             self._save_agent_specific_state(master_agent_rules, master_snap_by_agent)
 
-            # Step 6: Sync skills across frameworks (respects direction config)
-            if self.sync_config.enabled("skills"):
-                try:
-                    direction = self.sync_config.direction("skills")
-                    self.skills_sync.sync(
-                        log_callback=self._log_message,
-                        backup_before_write=True,
-                        direction=direction,
-                    )
-                except Exception as e:
-                    self._log_error(f"Skills sync error: {e}")
-
-            # Step 7: Sync portable settings + hooks to configured repos
-            if self.sync_config.enabled("settings"):
-                try:
-                    self.settings_sync.sync(log_callback=self._log_message)
-                except Exception as e:
-                    self._log_error(f"Settings sync error: {e}")
+    def _sync_skills(self):
+        # Step 6: Sync skills across frameworks (respects direction config)
+        if self.sync_config.enabled("skills"):
+            try:
+                direction = self.sync_config.direction("skills")
+                self.skills_sync.sync(
+                    log_callback=self._log_detail,
+                    backup_before_write=True,
+                    direction=direction,
+                )
+            except Exception as e:
+                self._log_error(f"Skills sync error: {e}")
 
-            # Step 8: Sync MCP servers (respects direction config)
-            if self.sync_config.enabled("mcp"):
-                try:
-                    direction = self.sync_config.direction("mcp")
-                    self.mcp_sync.sync(
-                        log_callback=self._log_message,
-                        direction=direction,
-                    )
-                except Exception as e:
-                    self._log_error(f"MCP sync error: {e}")
-            self._check_disk_quota(force=True)
-        except Exception as e:
-            self._log_error(f"Sync error: {e}")
+    def _sync_settings(self):
+        # Step 7: Sync portable settings + hooks to configured repos
+        if self.sync_config.enabled("settings"):
+            try:
+                self.settings_sync.sync(log_callback=self._log_detail)
+            except Exception as e:
+                self._log_error(f"Settings sync error: {e}")
 
-    def _rotate_log_if_needed(self, max_size_mb=5):
-        """Truncate log if it exceeds max_size_mb, keeping the last 25%."""
-        try:
-            log_file = self.config_dir / "daemon.log"
-            if not log_file.exists():
-                return
-            size_mb = log_file.stat().st_size / (1024 * 1024)
-            if size_mb <= max_size_mb:
-                return
-            lines = log_file.read_text(encoding="utf-8", errors="replace").splitlines()
-            keep = max(len(lines) // 4, 500)
-            rotated = "\n".join(lines[-keep:]) + "\n"
-            rotated = f"# Log rotated (was {size_mb:.1f}MB)\n" + rotated
-            log_file.write_text(rotated, encoding="utf-8")
-        except Exception:
-            pass
+    def _sync_mcp(self):
+        # Step 8: Sync MCP servers (respects direction config)
+        if self.sync_config.enabled("mcp"):
+            try:
+                direction = self.sync_config.direction("mcp")
+                self.mcp_sync.sync(
+                    log_callback=self._log_detail,
+                    direction=direction,
+                )
+            except Exception as e:
+                self._log_error(f"MCP sync error: {e}")
 
     def _fmt_bytes(self, value):
         for unit in ("B", "KB", "MB", "GB", "TB"):
@@ -821,20 +908,7 @@ class AgentRulesSync:
 
     def _directory_size_bytes_uncached(self, path):
         """Return byte size for a directory tree, skipping symbolic links."""
-        path = Path(path)
-        if not path.exists():
-            return 0
-        total = 0
-        for root, _, files in os.walk(path):
-            for filename in files:
-                p = Path(root) / filename
-                try:
-                    if p.is_symlink():
-                        continue
-                    total += p.stat(follow_symlinks=False).st_size
-                except OSError:
-                    continue
-        return total
+        return measure_tree(path)
 
     def _cacheable_directory_size_bytes(self, path):
         """Return cached size for large append-only backup directories."""
@@ -904,6 +978,7 @@ class AgentRulesSync:
             + self._fmt_bytes(limit_bytes)
             + '" sound name "Basso"'
         )
+        import subprocess
         try:
             subprocess.run(
                 ["osascript", "-e", script],
@@ -922,6 +997,7 @@ class AgentRulesSync:
         """Unload launchd service for this daemon, if present."""
         plist_path = Path.home() / "Library" / "LaunchAgents" / f"{self._launchd_label}.plist"
         label = self._launchd_label
+        import subprocess
 
         for cmd in (
             ["launchctl", "bootout", f"gui/{os.getuid()}/{label}"],
@@ -947,7 +1023,21 @@ class AgentRulesSync:
         self._last_disk_guard_check = now
         limit = self._load_disk_quota_bytes()
 
-        size = self._directory_size_bytes(self.config_dir)
+        # Writers keep the ledger current; a full walk only happens the first time,
+        # when the ledger claims the limit is hit, and as hourly background drift repair.
+        ledger = ledger_for(self.config_dir)
+        if not ledger.reconciled:
+            size = ledger.reconcile(self._directory_size_bytes)
+        else:
+            size = ledger.total()
+            if size >= limit:
+                size = ledger.reconcile(self._directory_size_bytes)
+            elif ledger.stale():
+                ledger.reconcile_in_background(self._directory_size_bytes)
+        from agent_metrics import DISK_LIMIT, DISK_USAGE
+
+        DISK_USAGE.set(size)
+        DISK_LIMIT.set(limit)
         if size < limit:
             return False
 
@@ -965,30 +1055,17 @@ class AgentRulesSync:
 
     def _log_error(self, msg):
         """Log error to daemon log file."""
-        try:
-            self._rotate_log_if_needed()
-            log_file = self.config_dir / "daemon.log"
-            with open(log_file, 'a') as f:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] ERROR: {msg}\n")
-        except Exception:
-            pass
+        daemon_log(self.config_dir).log(ERROR, msg)
 
     def _log_message(self, msg):
         """Log message to daemon log file."""
-        try:
-            log_file = self.config_dir / "daemon.log"
-            # Rotate if needed (sampled: only check ~every 100 messages)
-            if not hasattr(self, '_log_count'):
-                self._log_count = 0
-            self._log_count += 1
-            if self._log_count % 100 == 0:
-                self._rotate_log_if_needed()
-            with open(log_file, 'a') as f:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] {msg}\n")
-        except Exception:
-            pass
+        daemon_log(self.config_dir).log(INFO, msg)
+
+    def _log_detail(self, msg):
+        """Per-file messages from sub-syncers; hidden by ARSRULES_LOG_LEVEL=info."""
+        lowered = msg.lower()
+        level = ERROR if ("error" in lowered or "failed" in lowered) else DEBUG
+        daemon_log(self.config_dir).log(level, msg)
 
     def _refresh_watch_state_after_sync(
         self,
@@ -999,23 +1076,105 @@ class AgentRulesSync:
         history_hashes,
     ):
         """Re-read hashes after sync() so MCP/files updated by sync don't leave stale watch state."""
-        file_hashes["master"] = self._get_file_hash(self.master_file)
-        for agent_id, config in self.agents.items():
-            if agent_id == "cursor":
-                for key, p in self._cursor_watch_pairs():
+        states = (file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes)
+        for component in WATCH_COMPONENTS:
+            self._refresh_component_watch_state(component, *states)
+
+    def _refresh_component_watch_state(
+        self,
+        component,
+        file_hashes,
+        skill_hashes,
+        settings_hashes,
+        mcp_hashes,
+        history_hashes,
+    ):
+        """Reset one component's watch baseline to what is on disk now."""
+        with self._watch_state_lock:
+            self._snapshot_dirty = True
+            if component == "rules":
+                file_hashes["master"] = self._get_file_hash(self.master_file)
+                for agent_id, config in self.agents.items():
+                    if agent_id == "cursor":
+                        for key, p in self._cursor_watch_pairs():
+                            file_hashes[key] = self._get_file_hash(p)
+                        continue
+                    file_hashes[agent_id] = self._get_file_hash(config["path"])
+                for key, p in self._cursorrules_watch_pairs():
                     file_hashes[key] = self._get_file_hash(p)
-                continue
-            file_hashes[agent_id] = self._get_file_hash(config["path"])
-        for key, p in self._cursorrules_watch_pairs():
-            file_hashes[key] = self._get_file_hash(p)
-        skill_hashes.clear()
-        skill_hashes.update(self.skills_sync.get_watch_paths_and_hashes())
-        settings_hashes.clear()
-        settings_hashes.update(self.settings_sync.get_watch_hashes())
-        mcp_hashes.clear()
-        mcp_hashes.update(self.mcp_sync.get_watch_hashes())
-        history_hashes.clear()
-        history_hashes.update(self.history_sync.get_watch_paths_and_hashes())
+                return
+            current, target = {
+                "skills": (self.skills_sync.get_watch_paths_and_hashes, skill_hashes),
+                "settings": (self.settings_sync.get_watch_hashes, settings_hashes),
+                "mcp": (self.mcp_sync.get_watch_hashes, mcp_hashes),
+                "history": (self.history_sync.get_watch_paths_and_hashes, history_hashes),
+            }[component]
+            target.clear()
+            target.update(current())
+
+    def _commit_watch_state(self, components, *watch_state):
+        """Record components' current watch hashes as synced (the persisted baseline)."""
+        with self._watch_state_lock:
+            for name, hashes in zip(WATCH_COMPONENTS, watch_state):
+                if name in components:
+                    self._synced_watch_state[name] = dict(hashes)
+            self._snapshot_dirty = True
+
+    def _watch_snapshot_fingerprint(self):
+        from agent_watch_snapshot import config_fingerprint
+
+        return config_fingerprint(self.config_dir, self.agents, self.skills_sync.frameworks)
+
+    def _load_watch_snapshot(self):
+        """Return the saved watch state if it matches the current config, else None.
+
+        A valid snapshot also seeds the stat cache so unchanged files are not re-hashed.
+        """
+        from agent_watch_snapshot import WatchSnapshot
+
+        snapshot = WatchSnapshot(self.config_dir).load(self._watch_snapshot_fingerprint())
+        if snapshot is not None:
+            self.stat_cache.seed(snapshot["stat_hashes"])
+        return snapshot
+
+    def _save_watch_snapshot(
+        self,
+        file_hashes,
+        skill_hashes,
+        settings_hashes,
+        mcp_hashes,
+        history_hashes,
+        force=False,
+    ):
+        """Persist watch state after syncs, at most every SNAPSHOT_SAVE_INTERVAL_SECONDS unless forced.
+
+        Components with a committed baseline (_commit_watch_state) are saved as of
+        their last completed sync, not with hashes detected but not yet synced.
+        """
+        now = time.monotonic()
+        if not force and (
+            not self._snapshot_dirty
+            or now - self._last_snapshot_save < self.SNAPSHOT_SAVE_INTERVAL_SECONDS
+        ):
+            return
+        from agent_watch_snapshot import WatchSnapshot
+
+        self._last_snapshot_save = now
+        with self._watch_state_lock:
+            self._snapshot_dirty = False
+            state = {
+                name: dict(self._synced_watch_state.get(name, hashes))
+                for name, hashes in zip(
+                    WATCH_COMPONENTS,
+                    (file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes),
+                )
+            }
+        if not WatchSnapshot(self.config_dir).save(
+            self._watch_snapshot_fingerprint(),
+            state,
+            self.stat_cache.export(("sha256", "mcp-master")),
+        ):
+            self._log_error("Could not write watch snapshot")
 
     def _build_watch_state(self):
         file_hashes = {}
@@ -1045,9 +1204,37 @@ class AgentRulesSync:
         mcp_hashes,
         history_hashes,
         check_history=True,
+        skip=(),
+    ):
+        """Update the watch dicts in place; return (changed components, changed transcripts).
+
+        Components in skip (already queued or running) are left for their own
+        post-sync refresh so a sync's own writes do not re-trigger it.
+        """
+        # Edited repo_paths/excludes/sync_config are pushed to every component.
+        self.registry.refresh()
+        with self._watch_state_lock, self._span("watch.detect", check_history=check_history):
+            return self._detect_watch_changes_locked(
+                file_hashes,
+                skill_hashes,
+                settings_hashes,
+                mcp_hashes,
+                history_hashes,
+                check_history,
+                set(skip),
+            )
+
+    def _detect_watch_changes_locked(
+        self,
+        file_hashes,
+        skill_hashes,
+        settings_hashes,
+        mcp_hashes,
+        history_hashes,
+        check_history,
+        skip,
     ):
         started = time.monotonic()
-        changed = False
         detail = {
             "rules": 0,
             "skills": 0,
@@ -1056,62 +1243,63 @@ class AgentRulesSync:
             "history": 0,
         }
 
-        master_hash = self._get_file_hash(self.master_file)
-        if master_hash != file_hashes.get("master"):
-            changed = True
-            file_hashes["master"] = master_hash
-            detail["rules"] += 1
-
-        for agent_id, config in self.agents.items():
-            if agent_id == "cursor":
-                for key, p in self._cursor_watch_pairs():
-                    current_hash = self._get_file_hash(p)
-                    if current_hash != file_hashes.get(key):
-                        changed = True
-                        file_hashes[key] = current_hash
-                        detail["rules"] += 1
-                continue
-            current_hash = self._get_file_hash(config["path"])
-            if current_hash != file_hashes.get(agent_id):
-                changed = True
-                file_hashes[agent_id] = current_hash
+        if "rules" not in skip:
+            master_hash = self._get_file_hash(self.master_file)
+            if master_hash != file_hashes.get("master"):
+                file_hashes["master"] = master_hash
                 detail["rules"] += 1
 
-        for key, p in self._cursorrules_watch_pairs():
-            current_hash = self._get_file_hash(p)
-            if current_hash != file_hashes.get(key):
-                changed = True
-                file_hashes[key] = current_hash
-                detail["rules"] += 1
-
-        if self.skills_sync.skills_changed(skill_hashes):
-            changed = True
-            skill_hashes.clear()
-            skill_hashes.update(self.skills_sync.get_watch_paths_and_hashes())
-            detail["skills"] += 1
-
-        if self.settings_sync.settings_changed(settings_hashes):
-            changed = True
+            for agent_id, config in self.agents.items():
+                if agent_id == "cursor":
+                    for key, p in self._cursor_watch_pairs():
+                        current_hash = self._get_file_hash(p)
+                        if current_hash != file_hashes.get(key):
+                            file_hashes[key] = current_hash
+                            detail["rules"] += 1
+                    continue
+                current_hash = self._get_file_hash(config["path"])
+                if current_hash != file_hashes.get(agent_id):
+                    file_hashes[agent_id] = current_hash
+                    detail["rules"] += 1
+
+            for key, p in self._cursorrules_watch_pairs():
+                current_hash = self._get_file_hash(p)
+                if current_hash != file_hashes.get(key):
+                    file_hashes[key] = current_hash
+                    detail["rules"] += 1
+
+        if "skills" not in skip:
+            # One pass both detects the change and becomes the new baseline.
+            current_skill_hashes = self.skills_sync.get_watch_paths_and_hashes()
+            if current_skill_hashes != skill_hashes:
+                skill_hashes.clear()
+                skill_hashes.update(current_skill_hashes)
+                detail["skills"] += 1
+
+        if "settings" not in skip and self.settings_sync.settings_changed(settings_hashes):
             settings_hashes.clear()
             settings_hashes.update(self.settings_sync.get_watch_hashes())
             detail["settings"] += 1
 
-        if self.mcp_sync.mcp_changed(mcp_hashes):
-            changed = True
+        if "mcp" not in skip and self.mcp_sync.mcp_changed(mcp_hashes):
             mcp_hashes.clear()
             mcp_hashes.update(self.mcp_sync.get_watch_hashes())
             detail["mcp"] += 1
 
+        changed = [name for name in self.SYNC_COMPONENTS if detail[name]]
+
         # History check is expensive (~360ms rglob over 600+ transcript files) and must
         # not run on every FSEvent. Callers that want history results pass check_history=True
         # explicitly; the hot event path passes check_history=False.
-        if check_history:
+        if check_history and "history" not in skip:
             history_paths = self.history_sync.history_changed(history_hashes)
             detail["history"] = len(history_paths)
         else:
             history_paths = []
 
         elapsed = time.monotonic() - started
+        from agent_metrics import DETECT_DURATION
+        DETECT_DURATION.observe(elapsed)
         if elapsed >= self.WATCH_DIAGNOSTIC_SECONDS:
             self._log_message(
                 "Watch change detection took "
@@ -1147,45 +1335,60 @@ class AgentRulesSync:
                 return
         roots.add(parent)
 
-    @staticmethod
-    def _dedupe_nested_roots(roots):
-        """Remove roots already covered by an earlier recursive parent watch."""
-        deduped = []
-        skipped = []
-        for root in sorted(roots, key=lambda p: (len(Path(p).parts), str(p))):
-            root = Path(root)
-            if any(root == kept or root.is_relative_to(kept) for kept in deduped):
-                skipped.append(root)
-                continue
-            deduped.append(root)
-        return deduped, skipped
-
-    def _event_watch_roots(self, file_hashes, settings_hashes, mcp_hashes, history_hashes):
-        roots = {
-            self.config_dir,
-            self.master_file.parent,
-            self.skills_sync.master_skills_dir,
-        }
+    def _collect_watch_parents(self, settings_hashes, mcp_hashes):
+        """Return (recursive parent roots, files skipped because their parent is too broad)."""
+        roots = set()
         skipped_home_files = []
 
         for config in self.agents.values():
             self._add_watch_parent(roots, config["path"], skipped_home_files)
-        if self._cursor_layout_is_canonical():
-            roots.add(self._cursor_primary_path().parent)
         for _, p in self._cursorrules_watch_pairs():
             # ~/.cursorrules lives directly in ~; adding its parent would watch the entire
             # home directory recursively via FSEvents — every transcript append, cache write,
-            # etc. would fire. Skip home-level paths; .cursorrules is stable and low-churn,
-            # so the 3s polling fallback in _run_polling_watch_loop is sufficient coverage.
+            # etc. would fire. Skip home-level paths; they get targeted watches instead
+            # (see _targeted_watch_files) or hash polling when inotify is unavailable.
             self._add_watch_parent(roots, p, skipped_home_files)
-
-        for fw in self.skills_sync.frameworks.values():
-            roots.add(fw["path"])
-
         for path in settings_hashes:
             self._add_watch_parent(roots, path, skipped_home_files)
         for path in mcp_hashes:
             self._add_watch_parent(roots, path, skipped_home_files)
+        return roots, skipped_home_files
+
+    def _targeted_watch_files(self, settings_hashes, mcp_hashes):
+        """Group files under broad home parents as {exact parent dir: {file names}}.
+
+        The inotify backend watches each parent non-recursively and filters events
+        down to these names, so ~/.claude.json or ~/.codex/config.toml are event-driven
+        without a recursive watch on ~ or ~/.claude.
+        """
+        _, skipped_home_files = self._collect_watch_parents(settings_hashes, mcp_hashes)
+        targets = {}
+        for raw in skipped_home_files:
+            path = Path(raw).expanduser()
+            targets.setdefault(path.parent, set()).add(path.name)
+        return targets
+
+    def _event_watch_roots(self, file_hashes, settings_hashes, mcp_hashes, history_hashes):
+        return self._plan_event_watch(
+            file_hashes, settings_hashes, mcp_hashes, history_hashes
+        ).recursive
+
+    def _plan_event_watch(self, file_hashes, settings_hashes, mcp_hashes, history_hashes):
+        """Plan recursive event roots within the inotify budget (see agent_watch_planner)."""
+        from agent_watch_planner import plan_watch_roots, watch_budget
+
+        roots, skipped_home_files = self._collect_watch_parents(settings_hashes, mcp_hashes)
+        roots.update({
+            self.config_dir,
+            self.master_file.parent,
+            self.skills_sync.master_skills_dir,
+        })
+        if self._cursor_layout_is_canonical():
+            roots.add(self._cursor_primary_path().parent)
+
+        for fw in self.skills_sync.frameworks.values():
+            roots.add(fw["path"])
+
         # NOTE: transcript roots (claude/projects, codex/sessions, etc.) are intentionally
         # excluded from the FSEvents observer. Those dirs receive constant appends from active
         # AI sessions and would fire _detect_watch_changes (including a 360ms rglob) on every
@@ -1203,33 +1406,156 @@ class AgentRulesSync:
                 roots.add(repo / ".cursor")
                 roots.add(repo / ".gemini")
 
-        existing = []
-        seen = set()
-        for root in roots:
-            try:
-                root = Path(root).expanduser()
-                root.mkdir(parents=True, exist_ok=True)
-                resolved = root.resolve()
-            except Exception:
-                continue
-            if resolved not in seen:
-                seen.add(resolved)
-                existing.append(resolved)
-        deduped, skipped_nested = self._dedupe_nested_roots(existing)
+        # watchdog (when installed) owns the recursive roots and, unlike agent_inotify,
+        # also watches .git/node_modules/__pycache__, so count those for it.
+        try:
+            import watchdog.observers
+            ignored = ()
+        except ImportError:
+            from agent_inotify import IGNORE_DIR_NAMES as ignored
+        plan = plan_watch_roots(roots, budget=watch_budget(), ignored=ignored)
         if skipped_home_files:
             self._log_message(
-                "Skipped broad recursive watch roots for hash-polled files: "
+                "Skipped broad recursive watch roots (targeted watch or hash polling instead): "
                 + ", ".join(sorted(skipped_home_files)[:10])
             )
-        if skipped_nested:
+        if plan.nested:
             self._log_message(
-                f"Deduplicated {len(skipped_nested)} nested recursive watch root(s)"
+                f"Deduplicated {plan.nested} nested recursive watch root(s)"
             )
-        if len(deduped) >= self.WATCH_ROOT_WARNING_COUNT:
+        if plan.missing:
             self._log_message(
-                f"High recursive watch root count: {len(deduped)} roots"
+                f"{len(plan.missing)} watch root(s) do not exist yet; covered by the periodic rescan"
             )
-        return deduped
+        if plan.polled:
+            self._log_message(
+                f"Watch budget {plan.budget} exceeded; polling {len(plan.polled)} root(s) instead: "
+                + ", ".join(
+                    f"{root} (~{plan.costs[root]} dirs)" for root in plan.polled[:10]
+                )
+            )
+        if len(plan.recursive) >= self.WATCH_ROOT_WARNING_COUNT:
+            self._log_message(
+                f"High recursive watch root count: {len(plan.recursive)} roots"
+            )
+        return plan
+
+    def _ensure_sync_executor(self, watch_state):
+        """Worker pool that runs component syncs off the watch thread.
+
+        Each finished component gets its watch baseline refreshed, so the watch
+        thread (which skips busy components) never sees a sync's own writes.
+        watch() shuts it down.
+        """
+        if self._sync_executor is not None:
+            return self._sync_executor
+
+        def run(component, items):
+            if component == "history":
+                if items:
+                    self._sync_history_paths(items)
+                else:
+                    # Full import requested over the control socket.
+                    with self._watch_state_lock:
+                        self.history_sync.history_changed(watch_state[-1])
+                    self.history_sync.sync(log_callback=self._log_message)
+                return
+            self.sync(components=[component])
+            self._check_disk_quota(force=True)
+
+        def on_complete(component, items, error):
+            if error is not None:
+                self._log_error(f"{component} sync worker error: {error}")
+            self._last_component_sync[component] = time.time()
+            if component != "history":
+                self._refresh_component_watch_state(component, *watch_state)
+            # A failed run, or one with a follow-up queued, keeps the old baseline.
+            if error is None and component not in executor.pending():
+                self._commit_watch_state([component], *watch_state)
+            if component == "history":
+                return
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            msg = f"✓ Synced {component} across all agents"
+            print(f"[{timestamp}] {msg}")
+            self._log_message(msg)
+
+        from agent_sync_executor import ComponentSyncExecutor
+
+        executor = ComponentSyncExecutor(run, on_complete, max_workers=self.SYNC_WORKERS)
+        self._sync_executor = executor
+        return executor
+
+    def _start_control_server(self, watch_state):
+        """Answer CLI status/sync requests from this process (see agent_control)."""
+        started = time.time()
+
+        def status(_request):
+            return {"ok": True, "status": self._daemon_status(watch_state, started)}
+
+        def sync(request):
+            scopes = request.get("scopes") or ["all"]
+            components = [
+                name for name in self.SYNC_COMPONENTS + ("history",)
+                if name in scopes or "all" in scopes
+            ]
+            executor = self._ensure_sync_executor(watch_state)
+            waiters = [executor.submit(name) for name in components]
+            if None in waiters:
+                return {"ok": False, "error": "daemon is shutting down"}
+            for done in waiters:
+                done.wait()
+            return {"ok": True, "components": components}
+
+        from agent_control import ControlServer
+
+        try:
+            server = ControlServer(self.config_dir, {"status": status, "sync": sync})
+        except OSError as e:
+            self._log_error(f"Control socket unavailable: {e}")
+            return None
+        self._log_message(f"Control socket: {server.path}")
+        return server
+
+    def _daemon_status(self, watch_state, started):
+        """Status summary built from the daemon's in-memory watch state."""
+        file_hashes = watch_state[0]
+        executor = self._sync_executor
+        agents = {}
+        with self._watch_state_lock:
+            for agent_id, config in self.agents.items():
+                if agent_id == "cursor":
+                    pairs = list(self._cursor_watch_pairs())
+                else:
+                    pairs = [(agent_id, config["path"])]
+                current = {key: self._get_file_hash(p) for key, p in pairs}
+                if not any(current.values()):
+                    state = "missing"
+                elif all(file_hashes.get(key) == h for key, h in current.items()):
+                    state = "in sync"
+                else:
+                    state = "changed since last sync"
+                agents[agent_id] = {
+                    "name": config["name"],
+                    "path": str(config["path"]),
+                    "state": state,
+                }
+            tracked = {
+                name: len(hashes) for name, hashes in zip(WATCH_COMPONENTS, watch_state)
+            }
+        plan = self._watch_plan
+        return {
+            "pid": os.getpid(),
+            "config_dir": str(self.config_dir),
+            "started": started,
+            "busy": sorted(executor.busy()) if executor is not None else [],
+            "last_sync": dict(self._last_component_sync),
+            "tracked": tracked,
+            "agents": agents,
+            "watch_roots": {
+                "recursive": len(plan.recursive) if plan else 0,
+                "polled": len(plan.polled) if plan else 0,
+            },
+        }
 
     def _run_polling_watch_loop(
         self,
@@ -1241,30 +1567,20 @@ class AgentRulesSync:
         history_hashes,
     ):
         self._log_message(f"Event watcher unavailable; using polling every {interval}s")
+        watch_state = (file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes)
+        executor = self._ensure_sync_executor(watch_state)
         while not self.stop_event.is_set():
             if self._check_disk_quota():
                 break
             time.sleep(interval)
             changed, history_paths = self._detect_watch_changes(
-                file_hashes,
-                skill_hashes,
-                settings_hashes,
-                mcp_hashes,
-                history_hashes,
+                *watch_state, skip=executor.busy()
             )
-            if changed:
-                self.sync()
-                if self._check_disk_quota(force=True):
-                    break
-                self._refresh_watch_state_after_sync(
-                    file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes
-                )
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                msg = "✓ Synced rules and skills across all agents"
-                print(f"[{timestamp}] {msg}")
-                self._log_message(msg)
+            for component in changed:
+                executor.submit(component)
             if history_paths:
-                self._sync_history_paths(history_paths)
+                executor.submit("history", history_paths)
+            self._save_watch_snapshot(*watch_state)
 
     def _run_event_watch_loop(
         self,
@@ -1275,34 +1591,28 @@ class AgentRulesSync:
         mcp_hashes,
         history_hashes,
     ):
-        try:
-            from watchdog.events import FileSystemEventHandler
-            from watchdog.observers import Observer
-        except ImportError:
-            self._run_polling_watch_loop(
-                interval, file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes
-            )
-            return
+        from agent_metrics import EVENT_QUEUE_DEPTH, EVENTS_DRAINED
 
         event_queue = queue.Queue()
-
-        class SyncEventHandler(FileSystemEventHandler):
-            def on_any_event(self, event):
-                if event.event_type in {"opened", "closed_no_write"}:
-                    return
-                event_queue.put(event)
-
-        observer = Observer()
-        watch_roots = self._event_watch_roots(
+        plan = self._plan_event_watch(
             file_hashes, settings_hashes, mcp_hashes, history_hashes
         )
-        self._log_message(f"Event watch roots: {len(watch_roots)} recursive root(s)")
-        for root in watch_roots:
-            observer.schedule(SyncEventHandler(), str(root), recursive=True)
-
-        observer.start()
+        targeted_files = self._targeted_watch_files(settings_hashes, mcp_hashes)
+        observers = self._start_event_observers(event_queue, plan.recursive, targeted_files)
+        if not observers:
+            self._run_polling_watch_loop(
+                interval, file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes
+            )
+            return
         self._log_message("Event watch started")
+        self._watch_plan = plan
+        watch_state = (file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes)
+        executor = self._ensure_sync_executor(watch_state)
         HISTORY_INTERVAL = 60  # seconds between history scans (expensive rglob, not event-driven)
+        # Roots degraded to polling (or not created yet) have no events; rescan them sooner.
+        rescan_interval = HISTORY_INTERVAL
+        if plan.polled or plan.missing:
+            rescan_interval = max(interval, self.POLLED_ROOT_RESCAN_SECONDS)
         last_history_check = time.monotonic()
         last_event_detect = 0.0
         try:
@@ -1310,61 +1620,58 @@ class AgentRulesSync:
                 if self._check_disk_quota():
                     break
                 event_received = False
+                overflow = False
                 try:
-                    event_queue.get(timeout=HISTORY_INTERVAL)
+                    event = event_queue.get(timeout=rescan_interval)
                 except queue.Empty:
                     pass
                 else:
                     event_received = True
+                    overflow = self._is_overflow_event(event)
                     time.sleep(0.75)
+                    EVENT_QUEUE_DEPTH.set(event_queue.qsize())
+                    drained = 0
                     while True:
                         try:
-                            event_queue.get_nowait()
+                            overflow = self._is_overflow_event(event_queue.get_nowait()) or overflow
                         except queue.Empty:
                             break
+                        drained += 1
+                    EVENTS_DRAINED.inc(drained)
+                if overflow:
+                    # Events were dropped by the kernel; rescan the watched files now
+                    # rather than trusting the throttle window below.
+                    self._log_message("inotify queue overflow; rescanning watched files")
 
                 now = time.monotonic()
                 should_detect = True
-                if event_received and now - last_event_detect < self.EVENT_DETECT_INTERVAL_SECONDS:
+                if (
+                    event_received
+                    and not overflow
+                    and now - last_event_detect < self.EVENT_DETECT_INTERVAL_SECONDS
+                ):
                     should_detect = False
                     remaining = self.EVENT_DETECT_INTERVAL_SECONDS - (now - last_event_detect)
                     time.sleep(min(1.0, remaining))
                 if should_detect:
                     last_event_detect = now
+                    # Busy components are skipped: events from their own writes are
+                    # absorbed by the post-sync refresh instead of re-triggering a sync.
                     changed, _ignored_history = self._detect_watch_changes(
-                        file_hashes,
-                        skill_hashes,
-                        settings_hashes,
-                        mcp_hashes,
-                        history_hashes,
+                        *watch_state,
                         check_history=False,  # history scanned on slow timer below, not every event
+                        skip=executor.busy(),
                     )
-                    if changed:
-                        self.sync()
-                        if self._check_disk_quota(force=True):
-                            break
-                        self._refresh_watch_state_after_sync(
-                            file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes
-                        )
-                        # Drain any FSEvents queued during sync — skill/settings writes by sync()
-                        # itself fire events that would immediately re-trigger a sync (write-loop).
-                        # Safe to discard: we just refreshed watch state to the post-sync baseline.
-                        try:
-                            while True:
-                                event_queue.get_nowait()
-                        except queue.Empty:
-                            pass
-                        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        msg = "✓ Synced rules and skills across all agents"
-                        print(f"[{timestamp}] {msg}")
-                        self._log_message(msg)
+                    for component in changed:
+                        executor.submit(component)
 
                 # History sync on a slow timer — rglob across 600+ transcript files is ~360ms
                 now = time.monotonic()
-                if now - last_history_check >= HISTORY_INTERVAL:
+                if now - last_history_check >= HISTORY_INTERVAL and "history" not in executor.busy():
                     last_history_check = now
                     history_started = time.monotonic()
-                    history_paths = self.history_sync.history_changed(history_hashes)
+                    with self._watch_state_lock:
+                        history_paths = self.history_sync.history_changed(history_hashes)
                     history_elapsed = time.monotonic() - history_started
                     if history_elapsed >= self.WATCH_DIAGNOSTIC_SECONDS:
                         self._log_message(
@@ -1372,12 +1679,82 @@ class AgentRulesSync:
                             f"changed_paths={len(history_paths)}; tracked_history={len(history_hashes)}"
                         )
                     if history_paths:
-                        self._sync_history_paths(history_paths)
+                        executor.submit("history", history_paths)
+                self._save_watch_snapshot(*watch_state)
         finally:
-            observer.stop()
-            observer.join()
+            for observer in observers:
+                observer.stop()
+            for observer in observers:
+                observer.join()
+
+    @staticmethod
+    def _is_overflow_event(event):
+        return getattr(event, "event_type", None) == "overflow"
+
+    def _start_event_observers(self, event_queue, watch_roots, targeted_files):
+        """Start watchdog and/or inotify observers feeding event_queue.
+
+        watchdog (when installed) owns the recursive roots. On Linux the ctypes
+        inotify backend adds non-recursive, name-filtered watches for files under
+        broad home parents, and takes over the recursive roots when watchdog is
+        missing. Returns the started observers; empty means fall back to polling.
+        """
+        observers = []
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            Observer = None
+
+        from agent_inotify import InotifyWatcher, inotify_available
+
+        inotify = None
+        if inotify_available():
+            try:
+                inotify = InotifyWatcher(event_queue.put)
+            except OSError as e:
+                self._log_error(f"inotify unavailable: {e}")
+
+        if Observer is not None:
+            class SyncEventHandler(FileSystemEventHandler):
+                def on_any_event(self, event):
+                    if event.event_type in {"opened", "closed_no_write"}:
+                        return
+                    event_queue.put(event)
+
+            observer = Observer()
+            for root in watch_roots:
+                observer.schedule(SyncEventHandler(), str(root), recursive=True)
+            observers.append(observer)
+            self._log_message(f"Event watch roots: {len(watch_roots)} recursive root(s)")
+        elif inotify is not None:
+            for root in watch_roots:
+                inotify.watch_directory(root, recursive=True)
+            self._log_message(
+                f"Event watch roots: {len(watch_roots)} recursive root(s) via inotify "
+                f"({inotify.watch_count()} directories)"
+            )
+
+        if inotify is not None:
+            targeted = 0
+            for parent, names in sorted(targeted_files.items()):
+                if inotify.watch_directory(parent, names=names):
+                    targeted += len(names)
+            if targeted:
+                self._log_message(
+                    f"Targeted inotify watches: {targeted} file(s) in {len(targeted_files)} parent dir(s)"
+                )
+            if Observer is not None and not targeted:
+                inotify.join()
+            else:
+                observers.append(inotify)
+
+        for observer in observers:
+            observer.start()
+        return observers
 
     def _sync_history_paths(self, history_paths):
+        self._snapshot_dirty = True
         paths = [path for path in history_paths if Path(path).is_file()]
         if not paths:
             return
@@ -1395,9 +1772,41 @@ class AgentRulesSync:
             self._log_message(msg)
             self._check_disk_quota(force=True)
 
+    def _start_metrics_server(self):
+        """Serve Prometheus metrics (see agent_metrics); failures only disable metrics."""
+        from agent_metrics import start_metrics_server
+
+        try:
+            server = start_metrics_server(self.config_dir)
+        except OSError as e:
+            self._log_error(f"Metrics endpoint unavailable: {e}")
+            return None
+        if server is not None:
+            self._log_message(f"Metrics endpoint: {server.address}")
+        return server
+
+    def _install_sigterm_handler(self):
+        """Turn SIGTERM (daemon_stop, launchd/systemd) into a clean watch() shutdown.
+
+        Returns the previous handler, or None when none was installed (Windows, or
+        watch() running off the main thread).
+        """
+        if not hasattr(signal, "SIGTERM") or threading.current_thread() is not threading.main_thread():
+            return None
+
+        def stop(signum, frame):
+            if self.stop_event.is_set():
+                return
+            self.stop_event.set()
+            # Unwind the watch loop now; watch()'s finally drains the executor and saves.
+            raise KeyboardInterrupt
+
+        return signal.signal(signal.SIGTERM, stop)
+
     def watch(self, interval=3):
         """Watch for changes and auto-sync."""
-        self._rotate_log_if_needed()
+        # Log lines are queued for a writer thread so syncs never wait on daemon.log.
+        daemon_log(self.config_dir).start_background()
 
         # Save PID so status and guardian can track us
         try:
@@ -1406,26 +1815,52 @@ class AgentRulesSync:
         except Exception:
             pass
 
-        file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes = (
-            self._build_watch_state()
-        )
+        from agent_watch_snapshot import changed_components
+
+        snapshot = self._load_watch_snapshot()
+        watch_state = self._build_watch_state()
+        file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes = watch_state
 
         print("🔄 Watching for changes (filesystem events)...")
         print(f"Edit rules or skills in any agent - changes auto-sync!\n")
         self._log_message("Watch started")
 
-        # Initial sync to ensure rules and skills are propagated
-        self.sync()
-        if self._check_disk_quota(force=True):
-            self._log_message("Watch stopped after initial sync (disk quota reached).")
-            return
-        self.history_sync.sync(log_callback=self._log_message)
-        self._check_disk_quota(force=True)
+        if snapshot is None:
+            # Initial sync to ensure rules and skills are propagated
+            self.sync()
+            if self._check_disk_quota(force=True):
+                self._log_message("Watch stopped after initial sync (disk quota reached).")
+                return
+            self.history_sync.sync(log_callback=self._log_message)
+            self._check_disk_quota(force=True)
+        else:
+            # Warm restart: only sync what changed while the daemon was down.
+            saved = snapshot["state"]
+            components, history_paths = changed_components(
+                saved, dict(zip(WATCH_COMPONENTS, watch_state))
+            )
+            self._log_message(
+                "Warm start from watch snapshot; changed components: "
+                f"{', '.join(components) or 'none'}; changed transcripts: {len(history_paths)}"
+            )
+            if components:
+                self.sync(components=components)
+                if self._check_disk_quota(force=True):
+                    self._log_message("Watch stopped after initial sync (disk quota reached).")
+                    return
+            if history_paths:
+                self._sync_history_paths(history_paths)
         self._refresh_watch_state_after_sync(
             file_hashes, skill_hashes, settings_hashes, mcp_hashes, history_hashes
         )
+        self._commit_watch_state(WATCH_COMPONENTS, *watch_state)
+        self._save_watch_snapshot(*watch_state, force=True)
         self._log_message("Initial sync complete")
 
+        metrics_server = self._start_metrics_server()
+        self._ensure_sync_executor(watch_state)
+        control_server = self._start_control_server(watch_state)
+        previous_sigterm = self._install_sigterm_handler()
         try:
             self._run_event_watch_loop(
                 interval,
@@ -1440,6 +1875,17 @@ class AgentRulesSync:
             print("\n✓ Watch mode stopped")
             self._log_message("Watch stopped")
         finally:
+            if control_server is not None:
+                control_server.close()
+            # Let queued and running syncs finish so the final save covers them.
+            self._sync_executor.shutdown(wait=True)
+            self._sync_executor = None
+            self._save_watch_snapshot(*watch_state, force=True)
+            if previous_sigterm is not None:
+                signal.signal(signal.SIGTERM, previous_sigterm)
+            if metrics_server is not None:
+                metrics_server.close()
+            daemon_log(self.config_dir).flush()
             # Cleanup PID file
             try:
                 if self.pid_file.exists():
@@ -1675,7 +2121,7 @@ class AgentRulesSync:
 
 
 SYNC_SCOPES = ["rules", "skills", "settings", "mcp", "history", "all"]
-COMMANDS = ["sync", "delete-skill", "setup", "status", "stop", "watch", "daemon"]
+COMMANDS = ["sync", "delete-skill", "setup", "status", "stop", "watch", "daemon", "profile", "repair-backups"]
 
 
 def _run_sync(syncer, scopes):
@@ -1683,21 +2129,27 @@ def _run_sync(syncer, scopes):
     logs = []
     log = lambda m: logs.append(m) or print(f"  {m}")
 
+    def run_locked(component, func):
+        # Another process (usually the daemon) may be syncing the same component;
+        # wait for it, and skip our pass if that run already covered this request.
+        if not syncer.sync_locks.run_coalesced(component, func):
+            print(f"  {component} already synced by a concurrent run")
+
     if "rules" in scopes or "all" in scopes:
         print("⟳ Syncing rules...")
-        syncer.sync()  # rules sync is baked into sync()
+        syncer.sync(components=["rules"])
 
     if "skills" in scopes or "all" in scopes:
         print("⟳ Syncing skills...")
         try:
-            syncer.skills_sync.sync(log_callback=log, backup_before_write=False)
+            run_locked("skills", lambda: syncer.skills_sync.sync(log_callback=log, backup_before_write=False))
         except Exception as e:
             print(f"  ✗ Skills error: {e}")
 
     if "settings" in scopes or "all" in scopes:
         print("⟳ Syncing settings...")
         try:
-            syncer.settings_sync.sync(log_callback=log)
+            run_locked("settings", lambda: syncer.settings_sync.sync(log_callback=log))
         except Exception as e:
             print(f"  ✗ Settings error: {e}")
 
@@ -1705,13 +2157,15 @@ def _run_sync(syncer, scopes):
         print("⟳ Syncing MCP servers...")
         try:
             direction = syncer.sync_config.direction("mcp")
-            syncer.mcp_sync.sync(log_callback=log, direction=direction)
+            run_locked("mcp", lambda: syncer.mcp_sync.sync(log_callback=log, direction=direction))
         except Exception as e:
             print(f"  ✗ MCP error: {e}")
 
     if "history" in scopes or "all" in scopes:
         print("⟳ Syncing agent command history...")
         try:
+            from agent_history_sync import ensure_atuin_installed, ensure_atuin_zsh
+
             ensure_atuin_installed(log)
             ensure_atuin_zsh(log)
             result = syncer.history_sync.sync(log_callback=log)
@@ -1722,7 +2176,111 @@ def _run_sync(syncer, scopes):
     print("✓ Done")
 
 
+def _print_skill_plan(syncer):
+    """Print what a one-shot skills sync would change, without changing anything."""
+    # Same arguments as the skills step of _run_sync.
+    plan = syncer.skills_sync.plan(backup_before_write=False)
+    print("⟳ Skills sync plan (nothing written):")
+    for line in plan.format():
+        print(f"  {line}")
+
+
+def _request_daemon_sync(config_dir, scopes):
+    """Queue a sync on the running daemon; False means run it in-process instead."""
+    from agent_control import send_control_request
+
+    response = send_control_request(config_dir, {"cmd": "sync", "scopes": scopes})
+    if response is None:
+        return False
+    if not response.get("ok"):
+        print(f"  Daemon could not sync ({response.get('error')}); syncing in-process")
+        return False
+    print(f"✓ Synced by running daemon: {', '.join(response.get('components', []))}")
+    return True
+
+
+def _print_daemon_status(config_dir):
+    """Print status from the running daemon; False when no daemon answers."""
+    from agent_control import send_control_request
+
+    response = send_control_request(config_dir, {"cmd": "status"}, timeout=10)
+    if response is None or not response.get("ok"):
+        return False
+    info = response["status"]
+    started = datetime.fromtimestamp(info["started"]).strftime("%Y-%m-%d %H:%M:%S")
+
+    print(f"\n{'='*70}")
+    print(f"Agent Rules Sync Status")
+    print(f"{'='*70}\n")
+    print(f"📂 Config: {info['config_dir']}\n")
+    print(f"🔄 Daemon status: Running (PID {info['pid']}, since {started})")
+    if info["busy"]:
+        print(f"   Syncing now: {', '.join(info['busy'])}")
+    roots = info["watch_roots"]
+    print(f"   Watching {roots['recursive']} recursive root(s), {roots['polled']} polled root(s)")
+    print()
+
+    for agent in info["agents"].values():
+        marker = "✓" if agent["state"] == "in sync" else "⚠️ "
+        print(f"🤖 {agent['name']}")
+        print(f"   Path: {agent['path']}")
+        print(f"   Status: {marker} {agent['state'].capitalize()}")
+        print()
+
+    print("📊 Tracked by watcher:")
+    for name, count in info["tracked"].items():
+        last = info["last_sync"].get(name)
+        when = datetime.fromtimestamp(last).strftime("%H:%M:%S") if last else "startup"
+        print(f"   {name:<9} {count:>5} path(s), last synced {when}")
+    print()
+    return True
+
+
+def _run_profile(syncer, use_cprofile=False, use_tracemalloc=False, top=15):
+    """Summarize recorded spans; optionally profile one full sync."""
+    from agent_trace import format_summary, summarize_trace, trace_files
+
+    files = trace_files(syncer.config_dir)
+    print(f"Span timings from {len(files)} trace file(s) in {syncer.config_dir}:\n")
+    print(format_summary(summarize_trace(files)))
+    if not (use_cprofile or use_tracemalloc):
+        return
+
+    import io
+    print("\n⟳ Running one full sync under the profiler...")
+    profiler = None
+    if use_cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+    if use_tracemalloc:
+        import tracemalloc
+        tracemalloc.start(25)
+    if profiler is not None:
+        profiler.enable()
+    try:
+        syncer.sync()
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        snapshot = tracemalloc.take_snapshot() if use_tracemalloc else None
+        if use_tracemalloc:
+            tracemalloc.stop()
+
+    if profiler is not None:
+        import pstats
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+        print(f"\nTop {top} functions by cumulative time:")
+        print(out.getvalue())
+    if snapshot is not None:
+        print(f"Top {top} allocation sites:")
+        for stat in snapshot.statistics("lineno")[:top]:
+            print(f"  {stat}")
+
+
 def main():
+    import argparse
+
     parser = argparse.ArgumentParser(
         prog='agent-sync',
         description='Sync rules, skills, settings, MCP, and agent command history across AI coding assistants',
@@ -1735,11 +2293,16 @@ Commands:
   agent-sync status                  Check daemon and sync status
   agent-sync stop                    Stop daemon
   agent-sync watch                   Watch in foreground (debugging)
+  agent-sync profile [--cprofile] [--tracemalloc]
+                                     p50/p95 per sync step from trace.jsonl;
+                                     optionally profile one full sync
+  agent-sync repair-backups          Rebuild the skill backup hash index
 
 Sync scope examples:
   agent-sync sync                    Sync everything (default)
   agent-sync sync rules              Sync only CLAUDE.md / rules files
   agent-sync sync skills             Sync only skills directories
+  agent-sync sync skills --plan      Show what a skills sync would change
   agent-sync sync settings           Sync only .claude/settings.json + hooks
   agent-sync sync history            Import agent-run shell commands into Atuin
   agent-sync sync rules skills       Sync rules and skills
@@ -1753,8 +2316,35 @@ Sync scope examples:
     parser.add_argument('scopes', nargs='*',
                         metavar='SCOPE',
                         help=f'Scopes for sync command: {", ".join(SYNC_SCOPES)}. For delete-skill: the skill name to delete.')
+    parser.add_argument('--plan', action='store_true',
+                        help='sync: print the skills sync plan without applying it')
+    parser.add_argument('--cprofile', action='store_true',
+                        help='profile: run one sync under cProfile and print hotspots')
+    parser.add_argument('--tracemalloc', action='store_true',
+                        help='profile: run one sync under tracemalloc and print top allocations')
+    parser.add_argument('--top', type=int, default=15,
+                        help='profile: number of hotspots to print (default: 15)')
 
     args = parser.parse_args()
+
+    # status and sync are answered by a running daemon when there is one, which
+    # avoids building every sub-syncer and racing the daemon's own syncs.
+    if args.command == 'status' and _print_daemon_status(default_config_dir()):
+        return
+    if args.command == 'sync':
+        scopes = args.scopes if args.scopes else ['all']
+        # Validate scopes
+        invalid = [s for s in scopes if s not in SYNC_SCOPES]
+        if invalid:
+            print(f"✗ Unknown scopes: {', '.join(invalid)}")
+            print(f"  Valid scopes: {', '.join(SYNC_SCOPES)}")
+            sys.exit(1)
+        if args.plan and not {"skills", "all"} & set(scopes):
+            print("✗ --plan is only available for the skills scope")
+            sys.exit(1)
+        if not args.plan and _request_daemon_sync(default_config_dir(), scopes):
+            return
+
     syncer = AgentRulesSync()
 
     if args.command == 'delete-skill':
@@ -1772,22 +2362,19 @@ Sync scope examples:
             print(f"✗ Skill '{skill_name}' not found in any location.")
             sys.exit(1)
 
+    elif args.command == 'sync' and args.plan:
+        _print_skill_plan(syncer)
+
     elif args.command == 'sync':
-        scopes = args.scopes if args.scopes else ['all']
-        # Validate scopes
-        invalid = [s for s in scopes if s not in SYNC_SCOPES]
-        if invalid:
-            print(f"✗ Unknown scopes: {', '.join(invalid)}")
-            print(f"  Valid scopes: {', '.join(SYNC_SCOPES)}")
-            sys.exit(1)
-        _run_sync(syncer, scopes)
+        _run_sync(syncer, args.scopes if args.scopes else ['all'])
 
     elif args.command == 'setup':
         from agent_sync_config import run_wizard, load_config
         existing = load_config(syncer.config_dir)
         cfg = run_wizard(syncer.config_dir, existing=existing)
         if cfg:
-            syncer.sync_config = cfg
+            # The wizard saved sync_config.json; push it to the loaded components.
+            syncer.registry.refresh()
 
     elif args.command == 'watch':
         syncer.watch()
@@ -1798,6 +2385,18 @@ Sync scope examples:
     elif args.command == 'stop':
         syncer.daemon_stop()
 
+    elif args.command == 'profile':
+        _run_profile(syncer, args.cprofile, args.tracemalloc, args.top)
+
+    elif args.command == 'repair-backups':
+        counts = syncer.skills_sync.repair_backup_index()
+        print(
+            f"✓ Skill backup index: {counts['added']} added, {counts['rehashed']} rehashed, "
+            f"{counts['removed']} removed"
+        )
+        if counts["unrecognized"]:
+            print(f"  {counts['unrecognized']} backup dir(s) with unrecognized names skipped")
+
     else:  # daemon (default)
         if syncer.pid_file.exists():
             try:
@@ -22,7 +22,9 @@ import hashlib
 import shutil
 from pathlib import Path
 
-from agent_exclusions import ExclusionRules
+from agent_registry import registry_for
+from agent_metrics import BYTES_WRITTEN
+from agent_stat_cache import shared_stat_cache
 
 
 # Top-level keys that are purely machine-local — omit from repo copy
@@ -75,8 +77,17 @@ class AgentSettingsSync:
     def __init__(self, config_dir=None):
         self.config_dir = config_dir or (Path.home() / ".config" / "agent-rules-sync")
         self._load_config()
+        self.registry = registry_for(self.config_dir)
         self._load_repo_paths()
-        self.exclusions = ExclusionRules(self.config_dir)
+        self.exclusions = self.registry.exclusions
+        self.registry.subscribe(self._on_registry_change)
+        self.stat_cache = shared_stat_cache()
+
+    def _on_registry_change(self, changed):
+        if "repos" in changed:
+            self._load_repo_paths()
+        if "exclusions" in changed:
+            self.exclusions = self.registry.exclusions
 
     def _load_config(self):
         cfg_file = self.config_dir / "settings_sync.json"
@@ -93,18 +104,7 @@ class AgentSettingsSync:
         self.sync_hooks = cfg.get("sync_hooks", True)
 
     def _load_repo_paths(self):
-        self.repo_paths = []
-        repo_paths_file = self.config_dir / "repo_paths.json"
-        if not repo_paths_file.exists():
-            return
-        try:
-            paths = json.loads(repo_paths_file.read_text())
-            for p in paths:
-                repo = Path(p).expanduser().resolve()
-                if repo.is_dir():
-                    self.repo_paths.append(repo)
-        except Exception:
-            pass
+        self.repo_paths = self.registry.repo_paths
 
     def _is_machine_specific_rule(self, rule: str) -> bool:
         for prefix in self.strip_path_prefixes:
@@ -160,6 +160,7 @@ class AgentSettingsSync:
             if src.exists():
                 if not dst.exists() or src.read_bytes() != dst.read_bytes():
                     shutil.copy2(src, dst)
+                    BYTES_WRITTEN.inc(dst.stat().st_size, component="settings")
                     dst.chmod(0o755)
                     log(f"[settings] {repo.name}: copied hook script {script_name}")
 
@@ -251,13 +252,14 @@ class AgentSettingsSync:
         return result
 
     def _file_hash(self, path: Path) -> str | None:
-        if not path.exists():
-            return None
-        return hashlib.sha256(path.read_bytes()).hexdigest()
+        return self.stat_cache.get(
+            "sha256", path, lambda p: hashlib.sha256(p.read_bytes()).hexdigest()
+        )
 
     def sync(self, log_callback=None):
         """Sync portable settings to all configured repos."""
         log = log_callback or (lambda _: None)
+        self.registry.refresh()
         results = []
 
         for name, info in DEFAULT_SOURCES.items():
@@ -284,6 +286,7 @@ class AgentSettingsSync:
                     results.append((repo, f"{name}:up_to_date"))
                 else:
                     dest.write_text(portable_json)
+                    BYTES_WRITTEN.inc(len(portable_json.encode()), component="settings")
                     log(f"[settings] {repo.name} ({name}): synced")
                     results.append((repo, f"{name}:synced"))
 
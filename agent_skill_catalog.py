@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Skill catalog: one directory scan per skills dir, SKILL.md parsed once per change.
+
+_is_valid_skill_dir used to read and parse SKILL.md on every call, and a sync
+called it from _list_skills_in_dir, from _get_newest_skill_source for every
+skill in every framework, from the push path and again from watch hashing, so
+each SKILL.md was read many times per cycle. The catalog shared by sync and
+watch instead:
+
+- lists a skills directory with one os.scandir pass, reused while the
+  directory's stat signature is unchanged (adding, removing or renaming a
+  skill moves the directory mtime);
+- parses each SKILL.md once per stat signature and records validity,
+  frontmatter fields and mtime per skill directory.
+
+A lookup costs one stat() of SKILL.md; files are only read after they change.
+"""
+
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from agent_stat_cache import stat_signature
+
+
+SKILL_MD = "SKILL.md"
+
+
+@dataclass(frozen=True)
+class SkillEntry:
+    """What the catalog knows about one skill directory."""
+
+    path: Path
+    valid: bool = False
+    frontmatter: dict = field(default_factory=dict)
+    mtime: float = 0.0
+    signature: tuple | None = None
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    @property
+    def tags(self) -> list[str]:
+        """Frontmatter tags, from a block list, "[a, b]" or "a, b"."""
+        value = self.frontmatter.get("tags", [])
+        if isinstance(value, list):
+            return value
+        value = value.strip().strip("[]")
+        return [tag.strip().strip("'\"") for tag in value.split(",") if tag.strip()]
+
+
+def parse_frontmatter(text: str) -> tuple[bool, dict]:
+    """(valid, fields) for SKILL.md text.
+
+    Valid means a leading YAML frontmatter block with a non-empty name and
+    description. fields maps top-level keys to their string value, or to a
+    list for block lists ("tags:" followed by "- item" lines).
+    """
+    lines = text.splitlines()
+    if len(lines) < 3 or lines[0].strip() != "---":
+        return False, {}
+    try:
+        closing_index = next(
+            i for i, line in enumerate(lines[1:], start=1) if line.strip() == "---"
+        )
+    except StopIteration:
+        return False, {}
+    fields = {}
+    key = None
+    has_name = False
+    has_description = False
+    for raw in lines[1:closing_index]:
+        line = raw.strip()
+        if line.startswith("name:"):
+            has_name = bool(line.split(":", 1)[1].strip().strip("'\""))
+        if line.startswith("description:"):
+            value = line.split(":", 1)[1].strip()
+            if value in {">", "|", ">-", "|-"}:
+                has_description = True
+            else:
+                has_description = bool(value.strip("'\""))
+        if not line or line.startswith("#"):
+            continue
+        if raw[:1] in (" ", "\t") or line.startswith("- "):
+            # Continuation of the previous key; collect "- item" block lists.
+            if key is not None and line.startswith("- "):
+                items = fields.get(key)
+                if items == "":
+                    items = fields[key] = []
+                if isinstance(items, list):
+                    items.append(line[2:].strip().strip("'\""))
+            continue
+        if ":" in line:
+            key, value = line.split(":", 1)
+            key = key.strip()
+            fields[key] = value.strip()
+    return has_name and has_description, fields
+
+
+class SkillCatalog:
+    """Directory listings and parsed SKILL.md files, cached by stat signature."""
+
+    def __init__(self, ignore_prefixes=(".",)):
+        self.ignore_prefixes = tuple(ignore_prefixes)
+        self._lock = threading.Lock()
+        # base dir -> (signature, [skill dir paths])
+        self._listings = {}
+        # SKILL.md path -> (signature, (valid, fields))
+        self._parsed = {}
+        self.scans = 0
+        self.reads = 0
+
+    def skill_dirs(self, base) -> list[Path]:
+        """Non-ignored subdirectories of base (valid or not), from one scandir pass."""
+        base = Path(base)
+        key = os.fspath(base)
+        signature = stat_signature(base)
+        if signature is None:
+            with self._lock:
+                self._listings.pop(key, None)
+            return []
+        with self._lock:
+            cached = self._listings.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        dirs = []
+        try:
+            with os.scandir(base) as entries:
+                for entry in entries:
+                    if entry.name.startswith(self.ignore_prefixes):
+                        continue
+                    try:
+                        if entry.is_dir():
+                            dirs.append(base / entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return []
+        dirs.sort()
+        self.scans += 1
+        with self._lock:
+            self._listings[key] = (signature, dirs)
+        return dirs
+
+    def entry(self, skill_dir) -> SkillEntry:
+        """Validity, frontmatter and SKILL.md mtime for skill_dir."""
+        skill_dir = Path(skill_dir)
+        skill_md = skill_dir / SKILL_MD
+        key = os.fspath(skill_md)
+        try:
+            st = os.stat(skill_md)
+        except (OSError, ValueError):
+            with self._lock:
+                self._parsed.pop(key, None)
+            return SkillEntry(skill_dir)
+        signature = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+        with self._lock:
+            cached = self._parsed.get(key)
+        if cached is not None and cached[0] == signature:
+            valid, fields = cached[1]
+        else:
+            try:
+                valid, fields = parse_frontmatter(skill_md.read_text(encoding="utf-8"))
+            except (OSError, UnicodeDecodeError):
+                valid, fields = False, {}
+            self.reads += 1
+            with self._lock:
+                self._parsed[key] = (signature, (valid, fields))
+        return SkillEntry(skill_dir, valid, fields, st.st_mtime, signature)
+
+    def skills(self, base, include=None) -> dict[str, SkillEntry]:
+        """Valid skills in base by name; include(name) filters before SKILL.md is read."""
+        result = {}
+        for skill_dir in self.skill_dirs(base):
+            if include is not None and not include(skill_dir.name):
+                continue
+            entry = self.entry(skill_dir)
+            if entry.valid:
+                result[skill_dir.name] = entry
+        return result
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+File-level delta copy for skill directories.
+
+_copy_skill stages a full copytree of the source skill and swaps it in, so a
+one-line SKILL.md edit rewrote every script and asset in every target. When the
+destination already exists, apply_delta writes only what changed:
+
+1. diff the source and destination manifests (agent_skill_manifest.py);
+2. stage each added/changed file beside its target as .<name>.tmp-sync;
+3. write a journal (.<skill>.sync-journal beside the skill) listing the
+   operations, then move each replaced/removed file aside to .<name>.old-sync
+   and rename the staged file into place;
+4. delete the journal (the commit point), then the .old-sync files.
+
+A failure while staging leaves the destination untouched. A failure while
+committing rolls back in reverse order; recover() performs the same rollback
+for a journal left behind by a crashed process. Write volume is proportional
+to the change.
+"""
+
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+STAGE_SUFFIX = ".tmp-sync"
+OLD_SUFFIX = ".old-sync"
+JOURNAL_SUFFIX = ".sync-journal"
+
+
+@dataclass
+class DeltaResult:
+    changed: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    bytes_written: int = 0
+    bytes_replaced: int = 0
+
+
+def diff_manifests(src_manifest: dict, dst_manifest: dict):
+    """(changed, removed) relpaths turning dst_manifest into src_manifest."""
+    changed = sorted(
+        rel
+        for rel, entry in src_manifest.items()
+        if rel not in dst_manifest
+        or dst_manifest[rel][0] != entry[0]
+        or dst_manifest[rel][2] != entry[2]
+    )
+    removed = sorted(rel for rel in dst_manifest if rel not in src_manifest)
+    return changed, removed
+
+
+def journal_path(dst: Path) -> Path:
+    return dst.parent / f".{dst.name}{JOURNAL_SUFFIX}"
+
+
+def _sibling(path: Path, suffix: str) -> Path:
+    return path.with_name(f".{path.name}{suffix}")
+
+
+def _remove(path: Path):
+    try:
+        if path.is_dir() and not path.is_symlink():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def _stage(src_file: Path, staged: Path, copy_function):
+    staged.parent.mkdir(parents=True, exist_ok=True)
+    if os.path.lexists(staged):
+        _remove(staged)
+    if src_file.is_symlink():
+        os.symlink(os.readlink(src_file), staged)
+    else:
+        copy_function(src_file, staged)
+
+
+def _discard_staged(dst: Path, changed):
+    for rel in changed:
+        try:
+            _remove(_sibling(dst / rel, STAGE_SUFFIX))
+        except OSError:
+            pass
+
+
+def _rollback(dst: Path, ops):
+    """Undo journaled operations in reverse order; safe on partial commits."""
+    for action, rel in reversed(ops):
+        target = dst / rel
+        old = _sibling(target, OLD_SUFFIX)
+        staged = _sibling(target, STAGE_SUFFIX)
+        if os.path.lexists(staged):
+            _remove(staged)
+        elif action == "add":
+            _remove(target)
+        if os.path.lexists(old):
+            if os.path.lexists(target):
+                _remove(target)
+            os.replace(old, target)
+
+
+def recover(dst: Path) -> bool:
+    """Roll back a delta copy into dst interrupted before its commit point."""
+    journal = journal_path(dst)
+    try:
+        ops = json.loads(journal.read_text())
+    except FileNotFoundError:
+        return False
+    except (OSError, ValueError):
+        ops = []
+    if isinstance(ops, list):
+        _rollback(dst, [tuple(op) for op in ops if isinstance(op, list) and len(op) == 2])
+    journal.unlink()
+    return True
+
+
+def apply_delta(
+    src: Path, dst: Path, src_manifest: dict, dst_manifest: dict, copy_function=shutil.copy2
+) -> DeltaResult:
+    """Make dst match src by writing only changed files; raises OSError on failure.
+
+    copy_function(src_file, dst_file) creates each staged file (see
+    agent_skill_materialize.copier).
+    """
+    src, dst = Path(src), Path(dst)
+    changed, removed = diff_manifests(src_manifest, dst_manifest)
+    result = DeltaResult(changed=changed, removed=removed)
+    if not changed and not removed:
+        return result
+
+    ops = [("remove", rel) for rel in removed]
+    journal = journal_path(dst)
+    try:
+        for rel in changed:
+            target = dst / rel
+            _stage(src / rel, _sibling(target, STAGE_SUFFIX), copy_function)
+            ops.append(("replace" if os.path.lexists(target) else "add", rel))
+        journal.write_text(json.dumps(ops))
+    except OSError:
+        _discard_staged(dst, changed)
+        journal.unlink(missing_ok=True)
+        raise
+    try:
+        for action, rel in ops:
+            target = dst / rel
+            if action != "add" and os.path.lexists(target):
+                os.replace(target, _sibling(target, OLD_SUFFIX))
+            if action != "remove":
+                os.replace(_sibling(target, STAGE_SUFFIX), target)
+    except OSError:
+        _rollback(dst, ops)
+        journal.unlink()
+        raise
+    journal.unlink()
+
+    for action, rel in ops:
+        if action != "add":
+            try:
+                _remove(_sibling(dst / rel, OLD_SUFFIX))
+            except OSError:
+                pass
+    for rel in removed:
+        # Drop directories emptied by removals.
+        parent = (dst / rel).parent
+        while parent != dst:
+            try:
+                parent.rmdir()
+            except OSError:
+                break
+            parent = parent.parent
+
+    result.bytes_written = sum(src_manifest[rel][0] for rel in changed)
+    result.bytes_replaced = sum(
+        dst_manifest[rel][0] for rel in (*changed, *removed) if rel in dst_manifest
+    )
+    return result
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Persistent per-skill file manifests for skill equality checks.
+
+_skill_dirs_match used to rglob both skill trees and filecmp every file pair on
+every sync, reading the full bytes of each skill in master and in every target
+even when nothing had changed. Each skill directory now has a manifest mapping
+relpath -> (size, mtime_ns, digest):
+
+    manifests = manifests_for(config_dir)
+    manifests.matches(src, dst)      # compares manifests
+    manifests.seed(dst, src)         # after copying src to dst
+
+Building a manifest stats every file and only re-reads files whose size or
+mtime_ns moved since the last scan, so a no-op skills sync reads no file
+contents. Manifests are persisted to skill_manifests.json, so the daemon starts
+warm after a restart. Hidden entries and __pycache__ are ignored, as before;
+symlinks are compared by target. File digests are BLAKE2b-128 from the
+process-wide digest cache (agent_file_digest.py).
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from agent_file_digest import digest_cache
+
+
+MANIFEST_FILENAME = "skill_manifests.json"
+MANIFEST_VERSION = 2
+FLUSH_INTERVAL_SECONDS = 30
+DIGEST_ALGORITHM = "fast"
+
+
+class _Unsupported(Exception):
+    """A skill contains something other than files, directories and symlinks."""
+
+
+def _ignored(name: str) -> bool:
+    return name.startswith(".") or name == "__pycache__"
+
+
+def _walk(root: str, prefix: str = ""):
+    """Yield (relpath, DirEntry, is_link) for files and symlinks under root."""
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if _ignored(entry.name):
+                continue
+            rel = prefix + entry.name
+            if entry.is_symlink():
+                yield rel, entry, True
+            elif entry.is_dir():
+                yield from _walk(entry.path, rel + "/")
+            elif entry.is_file():
+                yield rel, entry, False
+            else:
+                raise _Unsupported(entry.path)
+
+
+class SkillManifests:
+    """relpath -> (size, mtime_ns, digest) for every skill directory seen."""
+
+    def __init__(self, config_dir: Path):
+        self.config_dir = Path(config_dir)
+        self.path = self.config_dir / MANIFEST_FILENAME
+        self._lock = threading.Lock()
+        self._manifests = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        self.files_read = 0
+        self._load()
+
+    def _load(self):
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return
+        skills = data.get("skills")
+        if not isinstance(skills, dict):
+            return
+        for skill_dir, files in skills.items():
+            if isinstance(files, dict):
+                self._manifests[skill_dir] = {
+                    rel: tuple(entry)
+                    for rel, entry in files.items()
+                    if isinstance(entry, list) and len(entry) == 3
+                }
+
+    def manifest(self, skill_dir) -> dict | None:
+        """Current manifest of skill_dir; None if missing or not comparable."""
+        key = os.fspath(skill_dir)
+        with self._lock:
+            previous = self._manifests.get(key, {})
+        current = {}
+        try:
+            if not os.path.isdir(key) or os.path.islink(key):
+                raise FileNotFoundError(key)
+            for rel, entry, is_link in _walk(key):
+                st = entry.stat(follow_symlinks=False)
+                signature = (st.st_size, st.st_mtime_ns)
+                cached = previous.get(rel)
+                if cached is not None and tuple(cached[:2]) == signature:
+                    current[rel] = cached
+                    continue
+                if is_link:
+                    digest = "link:" + os.readlink(entry.path)
+                else:
+                    # Hardlinked files share an inode across skill dirs: digest them once.
+                    digest = digest_cache.get(st, DIGEST_ALGORITHM)
+                    if digest is None:
+                        digest = digest_cache.digest(entry.path, DIGEST_ALGORITHM, st)
+                        self.files_read += 1
+                current[rel] = (*signature, digest)
+        except (OSError, _Unsupported):
+            self.forget(skill_dir)
+            return None
+        with self._lock:
+            if self._manifests.get(key) != current:
+                self._manifests[key] = current
+                self._dirty = True
+        return current
+
+    def cached_manifest(self, skill_dir) -> dict | None:
+        """manifest() without reading file contents: digests of moved files are None."""
+        key = os.fspath(skill_dir)
+        with self._lock:
+            previous = self._manifests.get(key, {})
+        current = {}
+        try:
+            if not os.path.isdir(key) or os.path.islink(key):
+                return None
+            for rel, entry, is_link in _walk(key):
+                st = entry.stat(follow_symlinks=False)
+                signature = (st.st_size, st.st_mtime_ns)
+                cached = previous.get(rel)
+                if cached is not None and tuple(cached[:2]) == signature:
+                    current[rel] = tuple(cached)
+                elif is_link:
+                    current[rel] = (*signature, "link:" + os.readlink(entry.path))
+                else:
+                    current[rel] = (*signature, digest_cache.get(st, DIGEST_ALGORITHM))
+        except (OSError, _Unsupported):
+            return None
+        return current
+
+    def known_match(self, src, dst) -> bool | None:
+        """matches() from stat metadata alone; None when only file contents can tell."""
+        src_manifest = self.cached_manifest(src)
+        dst_manifest = self.cached_manifest(dst)
+        if src_manifest is None or dst_manifest is None:
+            return False
+        if src_manifest.keys() != dst_manifest.keys():
+            return False
+        known = True
+        for rel, (size, _mtime, digest) in src_manifest.items():
+            other_size, _other_mtime, other_digest = dst_manifest[rel]
+            if size != other_size:
+                return False
+            if digest is None or other_digest is None:
+                known = False
+            elif digest != other_digest:
+                return False
+        return True if known else None
+
+    def matches(self, src, dst) -> bool:
+        """True when src and dst hold the same relpaths with the same contents."""
+        src_manifest = self.manifest(src)
+        if src_manifest is None:
+            return False
+        dst_manifest = self.manifest(dst)
+        if dst_manifest is None or src_manifest.keys() != dst_manifest.keys():
+            return False
+        return all(
+            src_manifest[rel][0] == dst_manifest[rel][0]
+            and src_manifest[rel][2] == dst_manifest[rel][2]
+            for rel in src_manifest
+        )
+
+    def seed(self, dst, src, unchanged=()):
+        """Reuse src digests for dst after a copy that preserved size and mtime.
+
+        Files in unchanged were left in place by a delta copy and keep dst's entry.
+        """
+        source = self.manifest(src)
+        if source is None:
+            self.forget(dst)
+            return
+        key = os.fspath(dst)
+        with self._lock:
+            previous = self._manifests.get(key, {})
+            seeded = dict(source)
+            for rel in unchanged:
+                if rel in previous:
+                    seeded[rel] = previous[rel]
+            self._manifests[key] = seeded
+            self._dirty = True
+
+    def forget(self, skill_dir):
+        with self._lock:
+            if self._manifests.pop(os.fspath(skill_dir), None) is not None:
+                self._dirty = True
+
+    def flush(self, force=False):
+        """Persist manifests, at most every FLUSH_INTERVAL_SECONDS unless forced."""
+        now = time.monotonic()
+        with self._lock:
+            if not self._dirty or (not force and now - self._last_flush < FLUSH_INTERVAL_SECONDS):
+                return
+            self._dirty = False
+            self._last_flush = now
+            data = {
+                "version": MANIFEST_VERSION,
+                "skills": {
+                    skill_dir: {rel: list(entry) for rel, entry in files.items()}
+                    for skill_dir, files in self._manifests.items()
+                },
+            }
+        try:
+            self.config_dir.mkdir(parents=True, exist_ok=True)
+            # A unique temp name: another process flushing the same file must not
+            # rename our half-written temp file over it, or we theirs.
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent)
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            pass
+
+
+_manifests = {}
+_manifests_guard = threading.Lock()
+
+
+def manifests_for(config_dir: Path) -> SkillManifests:
+    """The shared skill manifests for config_dir in this process."""
+    key = str(config_dir)
+    manifests = _manifests.get(key)
+    if manifests is not None:
+        return manifests
+    with _manifests_guard:
+        manifests = _manifests.get(key)
+        if manifests is None:
+            manifests = _manifests[key] = SkillManifests(config_dir)
+        return manifests
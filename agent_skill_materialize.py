@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Deduplicated materialization of skill files across targets.
+
+The same skill lives in ~10 framework directories plus every repo's
+.claude/skills, each a full physical copy. The file copier used by full and
+delta skill copies can instead share storage:
+
+  reflink   clone extents with the FICLONE ioctl (Btrfs, XFS, bcachefs...);
+            copy-on-write, so targets stay independent. Falls back to copy.
+  auto      reflink, then a hardlink when source and destination share a
+            device, then copy.
+  hardlink  hardlink on the same device, then copy.
+  copy      plain copy.
+
+Hardlinked targets share one inode with master: an editor that rewrites a
+file in place changes every linked copy at once (atomic-rename saves break
+the link instead). Use reflink, or opt a target out with
+skill_targets.<id>.materialize = "copy", for targets edited in place.
+Backups are always real copies.
+"""
+
+import errno
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+MODES = ("reflink", "auto", "hardlink", "copy")
+FICLONE = 0x40049409
+
+# Devices where FICLONE failed with "not supported"; don't retry every file.
+_no_reflink_devices = set()
+
+
+def reflink(src, dst) -> bool:
+    """Clone src into a new file dst; False (dst absent) when unsupported."""
+    if fcntl is None:
+        return False
+    try:
+        device = os.stat(os.path.dirname(os.path.abspath(dst))).st_dev
+    except OSError:
+        return False
+    if device in _no_reflink_devices:
+        return False
+    with open(src, "rb") as s, open(dst, "xb") as d:
+        try:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+            error = None
+        except OSError as e:
+            error = e
+    if error is not None:
+        os.unlink(dst)
+        if error.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY):
+            if error.errno != errno.EXDEV:
+                _no_reflink_devices.add(device)
+            return False
+        raise error
+    shutil.copystat(src, dst)
+    return True
+
+
+def _hardlink(src, dst) -> bool:
+    try:
+        if os.stat(src).st_dev != os.stat(os.path.dirname(os.path.abspath(dst))).st_dev:
+            return False
+        os.link(src, dst)
+    except OSError:
+        return False
+    return True
+
+
+def materialize_file(src, dst, mode="copy") -> str:
+    """Create dst from src using mode's strategy; returns the method used."""
+    if mode in ("reflink", "auto") and reflink(src, dst):
+        return "reflink"
+    if mode in ("hardlink", "auto") and _hardlink(src, dst):
+        return "hardlink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def copier(mode="copy"):
+    """A copy_function for shutil.copytree / apply_delta using mode."""
+    if mode == "copy":
+        return shutil.copy2
+
+    def copy(src, dst):
+        materialize_file(src, dst, mode)
+        return dst
+
+    return copy
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Plan/apply split for skills sync.
+
+AgentSkillsSync.sync() used to interleave decisions (newest source, exclusions,
+match checks) with side effects (backup, copy, remove). It now runs in two
+phases:
+
+- plan() decides from metadata only: catalog entries (SKILL.md frontmatter and
+  mtime), directory listings and the stat side of persisted skill manifests. A
+  target is left out when its manifest provably matches the source; a copy
+  whose outcome depends on a file that moved since it was last hashed is
+  planned as "unverified". No skill file contents are read.
+- apply() executes the plan phase by phase (exclusions, master, fan-out) on
+  the skills worker pool. Operations on the same (skill, target) run as one
+  task, and a copy re-checks file contents first, so an unverified copy whose
+  contents turn out identical is skipped along with its backup.
+
+`agent-sync sync skills --plan` prints a plan without applying it.
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+PHASES = ("exclude", "master", "fan-out")
+
+
+@dataclass(frozen=True)
+class SkillOp:
+    """One planned side effect on a skill directory."""
+
+    phase: str  # one of PHASES
+    action: str  # "backup", "copy" or "remove"
+    skill: str
+    target: str  # framework id, or "master"
+    dst: Path
+    src: Path | None = None
+    reason: str = ""  # copies: "missing", "differs" or "unverified"
+
+    def describe(self) -> str:
+        if self.action == "copy":
+            text = f"copy    {self.skill}: {self.src} -> {self.dst}"
+            return f"{text} ({self.reason})" if self.reason else text
+        return f"{self.action:<7} {self.skill}: {self.dst} [{self.target}]"
+
+
+@dataclass
+class SkillPlan:
+    """Ordered skill operations plus the settings they were planned with."""
+
+    direction: str = "bidirectional"
+    backup_before_write: bool = True
+    skills: list = field(default_factory=list)
+    ops: list = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.ops)
+
+    def add(self, *ops: SkillOp):
+        self.ops.extend(ops)
+
+    def groups(self, phase: str) -> list[list[SkillOp]]:
+        """phase's ops grouped by (skill, target), in plan order."""
+        grouped = {}
+        for op in self.ops:
+            if op.phase == phase:
+                grouped.setdefault((op.skill, op.target), []).append(op)
+        return list(grouped.values())
+
+    def counts(self) -> dict[str, int]:
+        counts = {"backup": 0, "copy": 0, "remove": 0}
+        for op in self.ops:
+            counts[op.action] += 1
+        return counts
+
+    def format(self) -> list[str]:
+        """Human-readable lines, one per operation, then a summary."""
+        if not self.ops:
+            return ["Skills are in sync; nothing to do"]
+        lines = [op.describe() for op in self.ops]
+        counts = self.counts()
+        lines.append(
+            f"{counts['copy']} copy, {counts['remove']} remove, {counts['backup']} backup "
+            f"(direction: {self.direction})"
+        )
+        return lines
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Change-detection tokens for skill directories with a directory-signature short-circuit.
+
+get_watch_paths_and_hashes used to stat every file of every skill in every
+framework on each detection pass. A skill's token (SHA-256 over relpath,
+mtime_ns and size of each file, unchanged from before) is now cached together
+with a signature of the skill's directories: the inode and mtime_ns of the
+skill dir and each subdirectory, plus the stat of SKILL.md. While that
+signature holds the token is reused, so an idle pass costs a few stat() calls
+per skill; only skills whose signature moved are walked again.
+
+Creating, deleting or renaming a file moves its directory's mtime, and SKILL.md
+is checked directly. An in-place edit of another file leaves directory mtimes
+alone, so every token is also recomputed at least every
+FULL_RESCAN_SECONDS.
+"""
+
+import hashlib
+import os
+import threading
+import time
+
+
+FULL_RESCAN_SECONDS = 60.0
+SKILL_MD = "SKILL.md"
+
+
+def _ignored(name: str) -> bool:
+    return name.startswith(".") or name == "__pycache__"
+
+
+def walk_skill(skill_dir) -> tuple[str, tuple] | None:
+    """(token, directory signature) for skill_dir, or None if it can't be read."""
+    root = os.fspath(skill_dir)
+    files = []
+    signature = []
+    try:
+        st = os.stat(root)
+        signature.append(("", st.st_ino, st.st_mtime_ns))
+        pending = [((), root)]
+        while pending:
+            rel_parts, path = pending.pop()
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if _ignored(entry.name):
+                        continue
+                    parts = rel_parts + (entry.name,)
+                    if entry.is_dir(follow_symlinks=False):
+                        st = entry.stat(follow_symlinks=False)
+                        signature.append(("/".join(parts), st.st_ino, st.st_mtime_ns))
+                        pending.append((parts, entry.path))
+                    elif entry.is_file():
+                        files.append((parts, entry.stat()))
+        skill_md = os.stat(os.path.join(root, SKILL_MD))
+    except OSError:
+        return None
+    signature.append((SKILL_MD, skill_md.st_ino, skill_md.st_size, skill_md.st_mtime_ns))
+
+    hasher = hashlib.sha256()
+    for parts, st in sorted(files, key=lambda item: item[0]):
+        hasher.update(os.path.join(*parts).encode())
+        hasher.update(f"{st.st_mtime_ns}:{st.st_size}".encode())
+    return hasher.hexdigest(), tuple(signature)
+
+
+def _signature_holds(skill_dir, signature) -> bool:
+    root = os.fspath(skill_dir)
+    try:
+        for rel, ino, *rest in signature:
+            st = os.stat(os.path.join(root, rel) if rel else root)
+            if rel == SKILL_MD:
+                current = (st.st_ino, st.st_size, st.st_mtime_ns)
+            else:
+                current = (st.st_ino, st.st_mtime_ns)
+            if current != (ino, *rest):
+                return False
+    except OSError:
+        return False
+    return True
+
+
+class SkillWatchTokens:
+    """Caches walk_skill() tokens while each skill's directory signature holds."""
+
+    def __init__(self, full_rescan_seconds=FULL_RESCAN_SECONDS):
+        self.full_rescan_seconds = full_rescan_seconds
+        self._lock = threading.Lock()
+        # skill dir -> (signature, token, walked_at)
+        self._entries = {}
+        self.walks = 0
+
+    def token(self, skill_dir) -> str | None:
+        key = os.fspath(skill_dir)
+        with self._lock:
+            cached = self._entries.get(key)
+        now = time.monotonic()
+        if (
+            cached is not None
+            and now - cached[2] < self.full_rescan_seconds
+            and _signature_holds(key, cached[0])
+        ):
+            return cached[1]
+        walked = walk_skill(key)
+        self.walks += 1
+        with self._lock:
+            if walked is None:
+                self._entries.pop(key, None)
+                return None
+            token, signature = walked
+            self._entries[key] = (signature, token, now)
+        return token
+
+    def retain(self, skill_dirs):
+        """Forget skills that are no longer monitored."""
+        keep = {os.fspath(path) for path in skill_dirs}
+        with self._lock:
+            for key in [key for key in self._entries if key not in keep]:
+                del self._entries[key]
@@ -21,16 +21,27 @@ Note: Plugin-installed skills (e.g. .claude/plugins/cache/, .codex/vendor_import
 are NOT synced - they are managed by each framework's plugin/marketplace system.
 """
 
+import functools
 import hashlib
-import filecmp
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 from agent_antigravity_cli import ensure_plugin as ensure_antigravity_cli_plugin
-from agent_exclusions import ExclusionRules
-from agent_sync_config import load_config
+from agent_backup_index import INDEX_FILENAME, BackupIndex
+from agent_disk_ledger import ledger_for
+from agent_exclusions import SkillSubscription
+from agent_file_digest import digest_cache
+from agent_metrics import BACKUPS_CREATED, BYTES_WRITTEN
+from agent_registry import registry_for
+from agent_skill_catalog import SkillCatalog
+from agent_skill_delta import apply_delta, journal_path, recover as recover_delta
+from agent_skill_materialize import copier
+from agent_skill_plan import PHASES, SkillOp, SkillPlan
+from agent_skill_watch import SkillWatchTokens
+from agent_skill_manifest import manifests_for
 
 
 class AgentSkillsSync:
@@ -47,10 +58,28 @@ class AgentSkillsSync:
         self.master_skills_dir.mkdir(exist_ok=True)
         self.backup_dir = self.config_dir / "skill_backups"
         self.backup_dir.mkdir(exist_ok=True)
-        self._skill_backup_hashes = {}
-        self.exclusions = ExclusionRules(self.config_dir)
-        self.sync_config = load_config(self.config_dir)
-
+        # Directory listings and parsed SKILL.md files shared by sync and watch.
+        self.catalog = SkillCatalog(self.IGNORE_PREFIXES)
+        self.watch_tokens = SkillWatchTokens()
+        # Config, repos and exclusions are shared with the other components and
+        # pushed to _on_registry_change when their files change.
+        self.registry = registry_for(self.config_dir)
+        self.exclusions = self.registry.exclusions
+        self.sync_config = self.registry.config
+        self.frameworks = self._build_frameworks()
+        self._subscriptions = {}
+        self.registry.subscribe(self._on_registry_change)
+        self.backup_index = self._open_backup_index()
+
+    def _on_registry_change(self, changed):
+        self.exclusions = self.registry.exclusions
+        self.sync_config = self.registry.config
+        if changed & {"config", "repos"}:
+            self.frameworks = self._build_frameworks()
+            self._subscriptions = {}
+
+    def _build_frameworks(self):
+        """Built-in skill targets plus configured overrides and repo targets."""
         # Resolve CODEX_HOME for Codex skills path
         codex_home = os.environ.get("CODEX_HOME")
         if codex_home:
@@ -58,7 +87,7 @@ class AgentSkillsSync:
         else:
             codex_skills = Path.home() / ".codex" / "skills"
 
-        self.frameworks = {
+        frameworks = {
             "cursor": {
                 "name": "Cursor",
                 "path": Path.home() / ".cursor" / "skills",
@@ -105,15 +134,16 @@ class AgentSkillsSync:
                 "description": "OpenCode global skills",
             },
         }
-        self._apply_configured_framework_paths()
-        self._filter_disabled_frameworks()
+        self._apply_configured_framework_paths(frameworks)
+        frameworks = self._filter_disabled_frameworks(frameworks)
 
         # Load repo paths and add each repo's .claude/skills/ as a framework target.
         # Config: ~/.config/agent-rules-sync/repo_paths.json
         # Format: ["/abs/path/to/repo", "~/relative/path"]
-        self._load_repo_framework_paths()
+        self._load_repo_framework_paths(frameworks)
+        return frameworks
 
-    def _apply_configured_framework_paths(self):
+    def _apply_configured_framework_paths(self, frameworks):
         """Apply path overrides and custom skill targets from sync_config.json."""
         for fw_id, target_config in self.sync_config.skill_target_configs().items():
             if not isinstance(target_config, dict):
@@ -126,174 +156,151 @@ class AgentSkillsSync:
                 "path": Path(target_path).expanduser(),
                 "description": target_config.get("description") or "Configured skill target",
             }
-            if fw_id in self.frameworks:
-                self.frameworks[fw_id].update(framework)
+            if fw_id in frameworks:
+                frameworks[fw_id].update(framework)
             else:
-                self.frameworks[fw_id] = framework
+                frameworks[fw_id] = framework
 
-    def _filter_disabled_frameworks(self):
-        """Remove framework targets disabled in sync_config.json."""
-        self.frameworks = {
+    def _filter_disabled_frameworks(self, frameworks):
+        """Drop framework targets disabled in sync_config.json."""
+        return {
             fw_id: fw
-            for fw_id, fw in self.frameworks.items()
+            for fw_id, fw in frameworks.items()
             if self.sync_config.skill_target_enabled(fw_id)
         }
 
-    def _load_repo_framework_paths(self):
+    def _load_repo_framework_paths(self, frameworks):
         """Add configured repos' .claude/skills/ dirs as sync targets."""
-        import json
-        repo_paths_file = self.config_dir / "repo_paths.json"
-        if not repo_paths_file.exists():
-            return
-        try:
-            repo_paths = json.loads(repo_paths_file.read_text())
-            for repo_path in repo_paths:
-                repo = Path(repo_path).expanduser().resolve()
-                if repo.is_dir():
-                    fw_id = f"repo:{repo.name}"
-                    if not self.sync_config.skill_target_enabled(fw_id):
-                        continue
-                    self.frameworks[fw_id] = {
-                        "name": f"Repo: {repo.name}",
-                        "path": repo / ".claude" / "skills",
-                        "description": f"Project .claude/skills for {repo.name}",
-                    }
-        except Exception:
-            pass
+        for repo in self.registry.repo_paths:
+            fw_id = f"repo:{repo.name}"
+            if not self.sync_config.skill_target_enabled(fw_id):
+                continue
+            frameworks[fw_id] = {
+                "name": f"Repo: {repo.name}",
+                "path": repo / ".claude" / "skills",
+                "description": f"Project .claude/skills for {repo.name}",
+            }
 
     def _has_valid_skill_frontmatter(self, skill_md):
         """Return True when SKILL.md starts with a non-empty YAML frontmatter block."""
-        if not skill_md.is_file():
-            return False
-        try:
-            lines = skill_md.read_text(encoding="utf-8").splitlines()
-        except UnicodeDecodeError:
-            return False
-        if len(lines) < 3 or lines[0].strip() != "---":
-            return False
-        try:
-            closing_index = next(
-                i for i, line in enumerate(lines[1:], start=1) if line.strip() == "---"
-            )
-        except StopIteration:
-            return False
-        frontmatter = [line.strip() for line in lines[1:closing_index]]
-        has_name = False
-        has_description = False
-        for line in frontmatter:
-            if line.startswith("name:"):
-                has_name = bool(line.split(":", 1)[1].strip().strip("'\""))
-            if line.startswith("description:"):
-                value = line.split(":", 1)[1].strip()
-                if value in {">", "|", ">-", "|-"}:
-                    has_description = True
-                else:
-                    has_description = bool(value.strip("'\""))
-        return has_name and has_description
+        return self.catalog.entry(Path(skill_md).parent).valid
 
     def _is_valid_skill_dir(self, path):
         """Return True if path is a skill directory with valid SKILL.md metadata."""
-        return path.is_dir() and self._has_valid_skill_frontmatter(path / self.SKILL_MD)
+        return self.catalog.entry(path).valid
 
     def _list_skills_in_dir(self, base_path):
         """List valid skill names in a directory."""
-        if not base_path.exists():
-            return set()
-        names = set()
-        for item in base_path.iterdir():
-            if item.is_dir() and not item.name.startswith(self.IGNORE_PREFIXES):
-                if self._is_valid_skill_dir(item):
-                    names.add(item.name)
-        return names
+        return set(self.catalog.skills(base_path))
+
+    def _framework_skills(self, fw_id):
+        """Valid skills in a framework dir that it subscribes to and doesn't exclude.
+
+        Unsubscribed skill dirs are skipped before their SKILL.md is read.
+        """
+        base = self.frameworks[fw_id]["path"]
+        excluded = self._excluded_skills_for_framework(fw_id)
+        return self.catalog.skills(
+            base,
+            include=lambda name: name not in excluded and self._subscribed(fw_id, name),
+        )
 
     def _get_all_skill_names(self):
         """Union of skill names from master and all framework directories."""
         names = self._list_skills_in_dir(self.master_skills_dir)
-        for fw_id, fw in self.frameworks.items():
-            excluded = self._excluded_skills_for_framework(fw_id)
-            names.update(self._list_skills_in_dir(fw["path"]) - excluded)
+        for fw_id in self.frameworks:
+            names.update(self._framework_skills(fw_id))
         return names
 
+    def _subscription_for_framework(self, fw_id):
+        """Compiled skill_targets.<fw_id>.subscribe allow-list, or None for all skills."""
+        entries = self.sync_config.skill_subscription(fw_id)
+        if entries is None:
+            return None
+        key = tuple(entries)
+        cached = self._subscriptions.get(fw_id)
+        if cached is None or cached[0] != key:
+            cached = self._subscriptions[fw_id] = (key, SkillSubscription.compile(entries))
+        return cached[1]
+
+    def _subscribed(self, fw_id, skill_name):
+        """True when fw_id receives skill_name (always, without a subscribe list).
+
+        Tag entries match master's SKILL.md, so a target's own unsubscribed
+        skill dirs are never read.
+        """
+        subscription = self._subscription_for_framework(fw_id)
+        if subscription is None:
+            return True
+        return subscription.matches(
+            skill_name, lambda: self.catalog.entry(self.master_skills_dir / skill_name).tags
+        )
+
     def _skill_dir_hash(self, skill_path):
         """Compute a cheap change-detection token for a skill directory.
 
         Uses mtime+size of each file rather than reading file contents — this is
-        called every 3s in the poll loop across all skill dirs, so avoiding
-        read_bytes() cuts CPU dramatically. A content-level hash is only needed
-        when we actually sync, not to detect whether syncing is needed.
+        called every 3s in the poll loop across all skill dirs. Tokens are reused
+        while the skill's directory mtimes and SKILL.md stat are unchanged
+        (agent_skill_watch.py), so an idle poll doesn't stat every file.
         """
-        if not skill_path.exists() or not self._is_valid_skill_dir(skill_path):
+        if not self._is_valid_skill_dir(skill_path):
             return None
-        hasher = hashlib.sha256()
-        for f in sorted(skill_path.rglob("*")):
-            rel = f.relative_to(skill_path)
-            if f.is_file() and not any(
-                p.startswith(".") or p == "__pycache__" for p in rel.parts
-            ):
-                hasher.update(str(rel).encode())
-                st = f.stat()
-                hasher.update(f"{st.st_mtime_ns}:{st.st_size}".encode())
-        return hasher.hexdigest()
+        return self.watch_tokens.token(skill_path)
 
     def _skill_dir_content_hash(self, skill_path):
-        """Compute a deterministic content hash for a skill directory."""
+        """Compute a deterministic content hash for a skill directory.
+
+        Combines each file's SHA-256 from the shared digest cache
+        (agent_file_digest.py), so unchanged files aren't re-read.
+        """
         if not skill_path.exists() or not skill_path.is_dir():
             return None
 
-        hasher = hashlib.sha256()
-
-        def hash_file(file_path):
-            with open(file_path, "rb") as f:
-                while True:
-                    chunk = f.read(1024 * 1024)
-                    if not chunk:
-                        break
-                    hasher.update(chunk)
+        records = []
+        pending = [("", os.fspath(skill_path))]
+        try:
+            while pending:
+                prefix, directory = pending.pop()
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.name.startswith(".") or entry.name == "__pycache__":
+                            continue
+                        rel = prefix + entry.name
+                        if entry.is_file():
+                            digest = digest_cache.digest(entry.path, "sha256", entry.stat())
+                            records.append((rel, f"FILE:{rel}\\n{digest}"))
+                        elif entry.is_dir():
+                            records.append((rel, f"DIR:{rel}\\n"))
+                            if not entry.is_symlink():
+                                pending.append((rel + "/", entry.path))
+                        elif entry.is_symlink():
+                            records.append((rel, f"SYMLINK:{rel}{os.readlink(entry.path)}"))
+                        else:
+                            return None
+        except OSError:
+            return None
 
-        for path in sorted(
-            skill_path.rglob("*"), key=lambda p: str(p.relative_to(skill_path))
-        ):
-            rel = path.relative_to(skill_path)
-            if any(p.startswith(".") or p == "__pycache__" for p in rel.parts):
-                continue
-            if path.is_file():
-                hasher.update(f"FILE:{rel.as_posix()}\\n".encode())
-                hash_file(path)
-            elif path.is_dir():
-                hasher.update(f"DIR:{rel.as_posix()}\\n".encode())
-            elif path.is_symlink():
-                hasher.update(f"SYMLINK:{rel.as_posix()}".encode())
-                try:
-                    hasher.update(os.readlink(path).encode())
-                except OSError:
-                    pass
-            else:
-                return None
+        hasher = hashlib.sha256()
+        for _, record in sorted(records):
+            hasher.update(record.encode())
         return hasher.hexdigest()
 
-    def _skill_backup_cache_key(self, framework_id, skill_name):
-        return f"{framework_id}:{skill_name}"
-
-    def _load_skill_backup_hashes(self, framework_id, skill_name):
-        key = self._skill_backup_cache_key(framework_id, skill_name)
-        if key in self._skill_backup_hashes:
-            return self._skill_backup_hashes[key]
-
-        hashes = set()
-        for backup_path in self.backup_dir.glob(f"{framework_id}_{skill_name}_*"):
-            if not backup_path.is_dir():
-                continue
-            backup_hash = self._skill_dir_content_hash(backup_path)
-            if backup_hash:
-                hashes.add(backup_hash)
-
-        self._skill_backup_hashes[key] = hashes
-        return hashes
-
     def _has_skill_backup_hash(self, framework_id, skill_name, skill_hash):
         if not skill_hash:
             return False
-        return skill_hash in self._load_skill_backup_hashes(framework_id, skill_name)
+        return skill_hash in self.backup_index.hashes(framework_id, skill_name)
+
+    def _open_backup_index(self):
+        """BackupIndex for backup_dir, rebuilt in the background if missing or outdated."""
+        index = BackupIndex(self.backup_dir, self.config_dir / INDEX_FILENAME)
+        index.rebuild_in_background(self._skill_dir_content_hash, {"master", *self.frameworks})
+        return index
+
+    def repair_backup_index(self):
+        """Index backups the index is missing or has stale entries for."""
+        known_ids = {"master", *self.frameworks}
+        return self.backup_index.repair(self._skill_dir_content_hash, known_ids)
 
     def _get_newest_skill_source(self, skill_name):
         """
@@ -301,18 +308,18 @@ class AgentSkillsSync:
         Prefer master, then check frameworks.
         """
         candidates = []
-        master_path = self.master_skills_dir / skill_name
-        if self._is_valid_skill_dir(master_path):
-            mtime = (master_path / self.SKILL_MD).stat().st_mtime
-            candidates.append((master_path, mtime))
+        master = self.catalog.entry(self.master_skills_dir / skill_name)
+        if master.valid:
+            candidates.append((master.path, master.mtime))
 
         for fw_id, fw in self.frameworks.items():
             if skill_name in self._excluded_skills_for_framework(fw_id):
                 continue
-            skill_path = fw["path"] / skill_name
-            if self._is_valid_skill_dir(skill_path):
-                mtime = (skill_path / self.SKILL_MD).stat().st_mtime
-                candidates.append((skill_path, mtime))
+            if not self._subscribed(fw_id, skill_name):
+                continue
+            entry = self.catalog.entry(fw["path"] / skill_name)
+            if entry.valid:
+                candidates.append((entry.path, entry.mtime))
 
         if not candidates:
             return None
@@ -332,8 +339,10 @@ class AgentSkillsSync:
             if backup_path.exists():
                 shutil.rmtree(backup_path)
             shutil.copytree(skill_path, backup_path, symlinks=True)
+            ledger_for(self.config_dir).add(self._tree_bytes(backup_path))
             if skill_hash:
-                self._load_skill_backup_hashes(framework_id, skill_name).add(skill_hash)
+                self.backup_index.record(backup_path, framework_id, skill_name, skill_hash)
+            BACKUPS_CREATED.inc(component="skills")
             return backup_path
         except Exception:
             return None
@@ -351,12 +360,31 @@ class AgentSkillsSync:
         except Exception:
             return False
 
-    def _copy_skill(self, src, dst, log_callback=None):
+    def _in_config_dir(self, path):
+        try:
+            return Path(path).is_relative_to(self.config_dir)
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def _tree_bytes(path):
+        """Total size of regular files under path (symlinks not followed)."""
+        total = 0
+        for root, _dirs, files in os.walk(path):
+            for name in files:
+                try:
+                    total += os.lstat(os.path.join(root, name)).st_size
+                except OSError:
+                    pass
+        return total
+
+    def _copy_skill(self, src, dst, log_callback=None, materialize="copy"):
         """
         Copy skill directory from src to dst.
         Stage the copy beside the destination, then replace the old directory.
         This avoids deleting a valid skill when the copy fails, for example
-        because the disk is full.
+        because the disk is full. materialize selects reflink/hardlink/copy
+        per file (agent_skill_materialize.py).
         """
         if src == dst:
             return True
@@ -366,7 +394,13 @@ class AgentSkillsSync:
             if tmp_dst.exists() or tmp_dst.is_symlink():
                 if not self._remove_existing_path(tmp_dst):
                     raise OSError(f"Could not remove temporary destination: {tmp_dst}")
-            shutil.copytree(src, tmp_dst, symlinks=True)
+            shutil.copytree(src, tmp_dst, symlinks=True, copy_function=copier(materialize))
+            written = self._tree_bytes(tmp_dst)
+            BYTES_WRITTEN.inc(written, component="skills")
+            if self._in_config_dir(dst):
+                # Master skills count toward the config-dir quota.
+                replaced = self._tree_bytes(dst) if dst.is_dir() and not dst.is_symlink() else 0
+                ledger_for(self.config_dir).add(written - replaced)
             if dst.exists() or dst.is_symlink():
                 if not self._remove_existing_path(dst):
                     raise OSError(f"Could not remove existing destination: {dst}")
@@ -382,52 +416,118 @@ class AgentSkillsSync:
             return False
 
     def _skill_dirs_match(self, src, dst):
-        """Return True when two skill dirs have same file tree and bytes."""
+        """Return True when two skill dirs have same file tree and bytes.
+
+        Compares persisted manifests; only files whose stat moved are re-read.
+        """
         if src == dst:
             return True
-        if not src.exists() or not dst.exists():
-            return False
-        if not src.is_dir() or not dst.is_dir():
-            return False
-
-        def files_by_rel(root):
-            files = {}
-            for path in root.rglob("*"):
-                rel = path.relative_to(root)
-                if any(p.startswith(".") or p == "__pycache__" for p in rel.parts):
-                    continue
-                if path.is_file():
-                    files[rel] = path
-                elif path.is_dir():
-                    continue
-                else:
-                    return None
-            return files
+        return manifests_for(self.config_dir).matches(src, dst)
 
-        src_files = files_by_rel(src)
-        dst_files = files_by_rel(dst)
-        if src_files is None or dst_files is None:
+    def _delta_copy_skill(self, src, dst, log_callback=None, materialize="copy"):
+        """
+        Update an existing dst by copying only added/changed files and removing
+        deleted ones. Returns False when a full copy is needed instead.
+        """
+        if not dst.is_dir() or dst.is_symlink():
             return False
-        if set(src_files) != set(dst_files):
+        manifests = manifests_for(self.config_dir)
+        src_manifest = manifests.manifest(src)
+        dst_manifest = manifests.manifest(dst)
+        if src_manifest is None or dst_manifest is None:
             return False
-        for rel, src_file in src_files.items():
-            dst_file = dst_files[rel]
-            try:
-                if src_file.stat().st_size != dst_file.stat().st_size:
-                    return False
-                if not filecmp.cmp(src_file, dst_file, shallow=False):
-                    return False
-            except OSError:
-                return False
+        try:
+            result = apply_delta(
+                src, dst, src_manifest, dst_manifest, copy_function=copier(materialize)
+            )
+        except OSError as e:
+            if log_callback:
+                log_callback(f"Delta copy of {src.name} failed, copying in full: {e}")
+            return False
+        BYTES_WRITTEN.inc(result.bytes_written, component="skills")
+        if self._in_config_dir(dst):
+            ledger_for(self.config_dir).add(result.bytes_written - result.bytes_replaced)
+        changed = set(result.changed)
+        manifests.seed(dst, src, unchanged=[rel for rel in src_manifest if rel not in changed])
+        if log_callback:
+            log_callback(
+                f"Updated {src.name} -> {dst} "
+                f"({len(result.changed)} changed, {len(result.removed)} removed)"
+            )
         return True
 
-    def _sync_skill_to(self, src, dst, framework_id, log, backup_before_write):
-        """Copy a skill only when destination content differs."""
-        if self._skill_dirs_match(src, dst):
+    def _write_skill(self, src, dst, framework_id, log):
+        """Make dst a copy of src (delta or full, per skill_options) and seed its manifest."""
+        materialize = self.sync_config.skill_materialize_mode(framework_id)
+        if self.sync_config.skill_option("copy_mode") == "delta" and self._delta_copy_skill(
+            src, dst, log, materialize
+        ):
             return True
-        if dst.exists() and backup_before_write:
-            self._backup_skill_dir(dst, framework_id)
-        return self._copy_skill(src, dst, log)
+        if not self._copy_skill(src, dst, log, materialize):
+            return False
+        manifests_for(self.config_dir).seed(dst, src)
+        return True
+
+    def _plan_copy(self, plan, phase, skill_name, src, dst, framework_id, compare_to=None):
+        """Add the backup/copy ops that make dst match src; compare_to is what src will hold."""
+        exists = dst.exists()
+        if exists and not journal_path(dst).exists():
+            match = manifests_for(self.config_dir).known_match(compare_to or src, dst)
+            if match:
+                return
+            reason = "differs" if match is False else "unverified"
+        else:
+            # A crashed delta copy is rolled back before dst can be compared.
+            reason = "unverified" if exists else "missing"
+        if exists and plan.backup_before_write:
+            plan.add(SkillOp(phase, "backup", skill_name, framework_id, dst))
+        plan.add(SkillOp(phase, "copy", skill_name, framework_id, dst, src, reason))
+
+    def plan(self, backup_before_write=True, direction="bidirectional"):
+        """
+        Decide what sync() would change, from catalog and manifest metadata only.
+
+        Returns a SkillPlan (agent_skill_plan.py); no skill file contents are read.
+        """
+        # Picks up edited repo_paths/excludes/sync_config (pushed to _on_registry_change).
+        self.registry.refresh()
+        plan = SkillPlan(direction, backup_before_write)
+        for fw_id, fw in self.frameworks.items():
+            excluded = self._excluded_skills_for_framework(fw_id)
+            for skill_path in self._present_excluded_paths(fw["path"], excluded):
+                if backup_before_write:
+                    plan.add(SkillOp("exclude", "backup", skill_path.name, fw_id, skill_path))
+                plan.add(SkillOp("exclude", "remove", skill_path.name, fw_id, skill_path))
+
+        plan.skills = sorted(self._get_all_skill_names())
+        for skill_name in plan.skills:
+            master_dst = self.master_skills_dir / skill_name
+            source = master_dst
+            if direction == "push":
+                # Master is source of truth — only push master → frameworks
+                if not self._is_valid_skill_dir(master_dst):
+                    continue
+            else:
+                # Aggregate newest from frameworks → master (pull stops there)
+                newest = self._get_newest_skill_source(skill_name)
+                if not newest:
+                    continue
+                source = newest[0]
+                if source != master_dst:
+                    self._plan_copy(plan, "master", skill_name, source, master_dst, "master")
+                if direction == "pull":
+                    continue
+            for fw_id, fw in self.frameworks.items():
+                if not self._subscribed(fw_id, skill_name):
+                    continue
+                if skill_name in self._excluded_skills_for_framework(fw_id):
+                    continue
+                dst = fw["path"] / skill_name
+                if dst != source:
+                    self._plan_copy(
+                        plan, "fan-out", skill_name, master_dst, dst, fw_id, compare_to=source
+                    )
+        return plan
 
     def sync(self, log_callback=None, backup_before_write=True, direction="bidirectional"):
         """
@@ -438,69 +538,100 @@ class AgentSkillsSync:
           "push"          — master → frameworks only (master is source of truth)
           "pull"          — frameworks → master only (aggregate, don't push back)
         """
+        self.apply(self.plan(backup_before_write, direction), log_callback)
+
+    def apply(self, plan, log_callback=None):
+        """
+        Execute a plan: exclusions, then master writes, then fan-out to targets.
+        Each phase runs on the skills worker pool, one task per resolved
+        destination: targets that alias one directory (a symlinked skills dir, a
+        path configured twice) are applied one after another, never concurrently,
+        since they share staging and journal files.
+        """
         log = log_callback or (lambda _: None)
         expect_backup = self.config_dir / "skill_backups"
         if self.backup_dir.resolve() != expect_backup.resolve():
             self.backup_dir = expect_backup
             self.backup_dir.mkdir(exist_ok=True)
-            self._skill_backup_hashes = {}
+            self.backup_index = self._open_backup_index()
+
+        workers = self.sync_config.skill_option("workers")
+        manifests = manifests_for(self.config_dir)
+        for phase in PHASES:
+            groups = plan.groups(phase)
+            if phase == "fan-out":
+                if not plan.skills or plan.direction == "pull":
+                    break
+                if "antigravity-cli" in self.frameworks:
+                    ensure_antigravity_cli_plugin()
+                # Build master manifests once, before targets compare against them concurrently.
+                for master_dir in {ops[-1].src for ops in groups}:
+                    manifests.manifest(master_dir)
+            by_destination = {}
+            for ops in groups:
+                by_destination.setdefault(ops[-1].dst.resolve(), []).append(ops)
+            self._run_skill_tasks(
+                [
+                    functools.partial(self._apply_skill_groups, same_dst)
+                    for same_dst in by_destination.values()
+                ],
+                workers,
+                log,
+            )
+        manifests.flush()
+        self.backup_index.flush(force=True)
 
-        all_skills = self._get_all_skill_names()
-        self._remove_excluded_skills(backup_before_write, log)
-        if not all_skills:
-            return
+    def _apply_skill_groups(self, groups, log):
+        """Apply op groups that write the same destination, in plan order."""
+        for ops in groups:
+            self._apply_skill_ops(ops, log)
 
-        for skill_name in sorted(all_skills):
-            if direction == "push":
-                # Master is source of truth — only push master → frameworks
-                src_path = self.master_skills_dir / skill_name
-                if not self._is_valid_skill_dir(src_path):
-                    continue
-            elif direction == "pull":
-                # Aggregate newest from frameworks → master only, don't push back
-                result = self._get_newest_skill_source(skill_name)
-                if not result:
-                    continue
-                src_path, _ = result
-                master_dst = self.master_skills_dir / skill_name
-                if src_path != master_dst:
-                    self._sync_skill_to(
-                        src_path, master_dst, "master", log, backup_before_write
-                    )
-                continue  # don't push to frameworks
-            else:  # bidirectional
-                result = self._get_newest_skill_source(skill_name)
-                if not result:
-                    continue
-                src_path, _ = result
-
-                # Write to master first
-                master_dst = self.master_skills_dir / skill_name
-                if src_path != master_dst:
-                    self._sync_skill_to(
-                        src_path, master_dst, "master", log, backup_before_write
-                    )
+    def _run_skill_tasks(self, tasks, workers, log):
+        """
+        Run task(log) callables on up to workers threads and return their results.
+        Each task's log lines are buffered and replayed in task order, so the log
+        reads the same as a sequential run; the first error is re-raised after all
+        tasks finish.
+        """
+        if workers <= 1 or len(tasks) <= 1:
+            return [task(log) for task in tasks]
 
-            # Propagate master → all frameworks
-            for fw_id, fw in self.frameworks.items():
-                if skill_name in self._excluded_skills_for_framework(fw_id):
-                    dst = fw["path"] / skill_name
-                    if dst.exists() or dst.is_symlink():
-                        if backup_before_write:
-                            self._backup_skill_dir(dst, fw_id)
-                        self._remove_existing_path(dst)
-                        log(f"Excluded {skill_name} from {fw_id} ({dst})")
-                    continue
-                if fw_id == "antigravity-cli":
-                    ensure_antigravity_cli_plugin()
-                dst = fw["path"] / skill_name
-                self._sync_skill_to(
-                    self.master_skills_dir / skill_name,
-                    dst,
-                    fw_id,
-                    log,
-                    backup_before_write,
-                )
+        def run(task):
+            lines = []
+            try:
+                return task(lines.append), lines, None
+            except Exception as e:
+                return None, lines, e
+
+        results = []
+        error = None
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="agent-sync-skills") as pool:
+            for result, lines, task_error in pool.map(run, tasks):
+                for line in lines:
+                    log(line)
+                results.append(result)
+                error = error or task_error
+        if error is not None:
+            raise error
+        return results
+
+    def _apply_skill_ops(self, ops, log):
+        """Run one (skill, target) group of planned ops in order."""
+        copy = ops[-1] if ops[-1].action == "copy" else None
+        if copy is not None:
+            # Roll back a delta copy a crashed process left half-committed.
+            recover_delta(copy.dst)
+            # Plans come from metadata; skip (and don't back up) identical contents.
+            if self._skill_dirs_match(copy.src, copy.dst):
+                return
+        for op in ops:
+            if op.action == "backup":
+                self._backup_skill_dir(op.dst, op.target)
+            elif op.action == "remove":
+                if self._remove_existing_path(op.dst):
+                    log(f"Excluded {op.skill} from {op.target} ({op.dst})")
+            else:
+                self._write_skill(op.src, op.dst, op.target, log)
 
     def delete_skill(self, skill_name, backup=True, log_callback=None):
         """
@@ -532,6 +663,7 @@ class AgentSkillsSync:
             else:
                 not_found.append(str(skill_path))
 
+        self.backup_index.flush(force=True)
         return {"deleted": deleted, "not_found": not_found}
 
     def _repo_for_framework(self, fw_id):
@@ -549,16 +681,30 @@ class AgentSkillsSync:
             self._repo_for_framework(fw_id),
         )
 
-    def _remove_excluded_skills(self, backup_before_write, log):
-        for fw_id, fw in self.frameworks.items():
-            for skill_name in self._excluded_skills_for_framework(fw_id):
-                skill_path = fw["path"] / skill_name
-                if not (skill_path.exists() or skill_path.is_symlink()):
-                    continue
-                if backup_before_write:
-                    self._backup_skill_dir(skill_path, fw_id)
-                if self._remove_existing_path(skill_path):
-                    log(f"Excluded {skill_name} from {fw_id} ({skill_path})")
+    def _present_excluded_paths(self, base, excluded):
+        """Entries of base excluded by a literal name, or valid skill dirs matching a glob/regex.
+
+        Patterns skip IGNORE_PREFIXES and hidden entries (staged copies, delta
+        journals) and anything that isn't a skill, so a broad pattern such as
+        re:.* can't delete them.
+        """
+        if not excluded:
+            return []
+        paths = []
+        for skill_name in sorted(excluded.names):
+            skill_path = base / skill_name
+            if skill_path.exists() or skill_path.is_symlink():
+                paths.append(skill_path)
+        if excluded.patterns:
+            literal = set(excluded.names)
+            paths.extend(
+                skill_dir
+                for skill_dir in self.catalog.skill_dirs(base)
+                if skill_dir.name not in literal
+                and skill_dir.name in excluded
+                and self.catalog.entry(skill_dir).valid
+            )
+        return paths
 
     def get_watch_paths_and_hashes(self):
         """
@@ -567,35 +713,20 @@ class AgentSkillsSync:
         """
         result = {}
 
-        def add_skill_hashes(base):
-            if not base.exists():
-                return
-            for item in base.iterdir():
-                if item.is_dir() and self._is_valid_skill_dir(item):
-                    h = self._skill_dir_hash(item)
-                    if h:
-                        result[item] = h
+        def add_skill_hashes(skills):
+            for item in skills.values():
+                h = self._skill_dir_hash(item.path)
+                if h:
+                    result[item.path] = h
 
-        add_skill_hashes(self.master_skills_dir)
+        add_skill_hashes(self.catalog.skills(self.master_skills_dir))
         for fw_id, fw in self.frameworks.items():
             excluded = self._excluded_skills_for_framework(fw_id)
-            if not excluded:
-                add_skill_hashes(fw["path"])
-                continue
-            if not fw["path"].exists():
-                continue
-            for skill_name in excluded:
-                excluded_path = fw["path"] / skill_name
-                if excluded_path.exists() or excluded_path.is_symlink():
-                    result[excluded_path] = "excluded-present"
-            for item in fw["path"].iterdir():
-                if item.name in excluded:
-                    continue
-                if item.is_dir() and self._is_valid_skill_dir(item):
-                    h = self._skill_dir_hash(item)
-                    if h:
-                        result[item] = h
+            for excluded_path in self._present_excluded_paths(fw["path"], excluded):
+                result[excluded_path] = "excluded-present"
+            add_skill_hashes(self._framework_skills(fw_id))
 
+        self.watch_tokens.retain(result)
         return result
 
     def skills_changed(self, old_hashes):
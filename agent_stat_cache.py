@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Stat-signature cache shared by the rules, settings and MCP watch paths.
+
+Each poll tick used to SHA-256 every rules file, read every hook script and
+fully parse every MCP source. This cache keys the expensive result on the file's
+stat signature (dev, inode, size, mtime_ns, ctime_ns): while the signature is
+unchanged the cached value is returned, so an idle poll costs one stat() per file.
+"""
+
+import os
+import threading
+
+
+def stat_signature(path) -> tuple | None:
+    """Return (dev, inode, size, mtime_ns, ctime_ns) for path, or None if missing."""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+
+class StatSignatureCache:
+    """Memoizes per-path computations until the path's stat signature moves.
+
+    namespace separates different computations on the same path (content hash vs
+    parsed MCP servers). token is an extra validity key for inputs that are not
+    part of the file itself, e.g. the exclusion set applied to a parsed result.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, path, compute, token=None):
+        """Return compute(path), reusing the cached value while nothing moved.
+
+        Missing paths return None without calling compute.
+        """
+        key = (namespace, os.fspath(path))
+        signature = stat_signature(path)
+        if signature is None:
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] == signature and cached[1] == token:
+            return cached[2]
+
+        value = compute(path)
+        with self._lock:
+            self._entries[key] = (signature, token, value)
+        return value
+
+    def invalidate(self, path=None):
+        """Drop cached values for one path (all namespaces), or everything."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+                return
+            raw = os.fspath(path)
+            for key in [k for k in self._entries if k[1] == raw]:
+                del self._entries[key]
+
+    def export(self, namespaces) -> list:
+        """Return [namespace, path, signature, value] rows for persisting.
+
+        Only token-free entries with string (or None) values are exported.
+        """
+        wanted = set(namespaces)
+        with self._lock:
+            items = list(self._entries.items())
+        return [
+            [namespace, path, list(signature), value]
+            for (namespace, path), (signature, token, value) in items
+            if namespace in wanted and token is None and (value is None or isinstance(value, str))
+        ]
+
+    def seed(self, rows):
+        """Load rows from export(); get() still re-validates each signature."""
+        with self._lock:
+            for row in rows:
+                try:
+                    namespace, path, signature, value = row
+                    key = (str(namespace), str(path))
+                    entry = (tuple(signature), None, value)
+                except (TypeError, ValueError):
+                    continue
+                self._entries.setdefault(key, entry)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+_shared_cache = StatSignatureCache()
+
+
+def shared_stat_cache() -> StatSignatureCache:
+    """Process-wide cache used by all sync components."""
+    return _shared_cache
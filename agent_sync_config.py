@@ -21,8 +21,16 @@ Schema:
         "enabled": true,
         "path": "~/custom/skills",
         "name": "Custom Target",
-        "description": "Optional custom skill sync target"
-      }
+        "description": "Optional custom skill sync target",
+        "materialize": "copy"
+      },
+      "repo:my-app": { "subscribe": ["frontend-*", "tag:python", "code-review"] },
+      "repo:*": { "subscribe": ["tag:shared"] }
+    },
+    "skill_options": {
+      "copy_mode": "delta" | "full",
+      "materialize": "reflink" | "auto" | "hardlink" | "copy",
+      "workers": 4
     }
   }
 
@@ -32,6 +40,24 @@ Directions:
   pull           — agents → master only (aggregate, don't push back)
 
 Settings and hooks only support "push" (they are generated from global config).
+
+Skill copy modes:
+  delta  — copy only added/changed files into an existing skill, remove deleted
+           ones, commit through a rollback journal (default)
+  full   — stage a complete copy of the skill and swap it into place
+
+Skill materialization (skill_options.materialize, overridable per target):
+  reflink  — copy-on-write clone where the filesystem supports it, else copy (default)
+  auto     — reflink, then hardlink on the same device, then copy
+  hardlink — hardlink on the same device, else copy
+  copy     — always copy
+
+A "subscribe" list turns a target into an allow-list: it only receives (and is
+only scanned for) skills matching a name, glob, "re:" regex or "tag:<tag>" from
+the SKILL.md frontmatter. "repo:*" sets the default for every repo target.
+
+skill_options.workers (1-32) bounds how many (skill, target) pairs are synced
+concurrently; 1 syncs sequentially.
 """
 
 import json
@@ -64,6 +90,18 @@ DEFAULT_SKILL_TARGETS = {
     "opencode": True,
 }
 
+DEFAULT_SKILL_OPTIONS = {
+    "copy_mode": "delta",
+    "materialize": "reflink",
+    "workers": 4,
+}
+
+VALID_SKILL_OPTIONS = {
+    "copy_mode": ["delta", "full"],
+    "materialize": ["reflink", "auto", "hardlink", "copy"],
+    "workers": range(1, 33),
+}
+
 DEFAULT_CONFIG = {
     "version": CONFIG_VERSION,
     "mode": "default",
@@ -75,6 +113,7 @@ DEFAULT_CONFIG = {
         "mcp":      {"direction": "bidirectional", "enabled": True},
     },
     "skill_targets": DEFAULT_SKILL_TARGETS,
+    "skill_options": DEFAULT_SKILL_OPTIONS,
 }
 
 
@@ -108,6 +147,25 @@ class SyncConfig:
     def skill_target_configs(self) -> dict:
         return self._data.get("skill_targets", {})
 
+    def skill_option(self, name: str):
+        return self._data.get("skill_options", {}).get(name, DEFAULT_SKILL_OPTIONS[name])
+
+    def skill_subscription(self, target: str) -> list | None:
+        """Allow-list entries for target (falling back to "repo:*" for repos), or None."""
+        targets = self._data.get("skill_targets", {})
+        for key in (target, "repo:*" if target.startswith("repo:") else None):
+            value = targets.get(key) if key else None
+            if isinstance(value, dict) and isinstance(value.get("subscribe"), list):
+                return value["subscribe"]
+        return None
+
+    def skill_materialize_mode(self, target: str) -> str:
+        """Per-target materialize override, else skill_options.materialize."""
+        value = self._data.get("skill_targets", {}).get(target)
+        if isinstance(value, dict) and value.get("materialize"):
+            return value["materialize"]
+        return self.skill_option("materialize")
+
     def to_dict(self) -> dict:
         return self._data
 
@@ -156,8 +214,20 @@ def load_config(config_dir: Path) -> SyncConfig:
                             value = target_data.get(key)
                             if isinstance(value, str) and value:
                                 target_config[key] = value
+                        subscribe = target_data.get("subscribe")
+                        if isinstance(subscribe, list):
+                            target_config["subscribe"] = [str(v) for v in subscribe]
+                        materialize = target_data.get("materialize")
+                        if materialize in VALID_SKILL_OPTIONS["materialize"]:
+                            target_config["materialize"] = materialize
 
                         merged["skill_targets"][target] = target_config
+            options_data = data.get("skill_options", {})
+            if isinstance(options_data, dict):
+                for option, valid in VALID_SKILL_OPTIONS.items():
+                    value = options_data.get(option)
+                    if type(value) is type(DEFAULT_SKILL_OPTIONS[option]) and value in valid:
+                        merged["skill_options"][option] = value
             return SyncConfig(merged)
         except Exception:
             pass
@@ -258,6 +328,9 @@ def run_wizard(config_dir: Path, existing: SyncConfig | None = None) -> SyncConf
 
         data = json.loads(json.dumps(DEFAULT_CONFIG))
         data["mode"] = mode
+        if existing:
+            # The wizard doesn't ask about skill options; keep what was configured.
+            data["skill_options"].update(existing.to_dict().get("skill_options", {}))
 
         if mode == "default":
             # Apply defaults silently — no further questions needed
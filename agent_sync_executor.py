@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Component-parallel sync executor for the watch daemon.
+
+Rules, skills, settings, MCP and history touch disjoint files, but the watch
+loop used to run them back to back on its own thread: a slow skills copy held
+up an unrelated MCP change, and no events were read while a sync ran. The
+executor runs components on a small worker pool instead:
+
+- Priority: rules and MCP are dispatched ahead of skills and settings; history
+  imports are lowest.
+- Coalescing: a component has at most one pending request. Submitting it again
+  while pending merges the payload (e.g. changed transcript paths); submitting
+  while it runs queues exactly one follow-up run.
+- A component never runs concurrently with itself.
+"""
+
+import itertools
+import threading
+
+
+DEFAULT_PRIORITIES = {
+    "rules": 0,
+    "mcp": 0,
+    "skills": 1,
+    "settings": 1,
+    "history": 2,
+}
+
+
+class ComponentSyncExecutor:
+    """Runs run(component, items) on worker threads with per-component coalescing.
+
+    on_complete(component, items, error) is called on the worker thread after
+    each run (error is the raised exception or None).
+    """
+
+    def __init__(self, run, on_complete=None, max_workers=3, priorities=None):
+        self._run = run
+        self._on_complete = on_complete
+        self._priorities = dict(DEFAULT_PRIORITIES if priorities is None else priorities)
+        self._cond = threading.Condition()
+        # component -> (sequence, {item: None}, done event) — dict keeps merged items ordered.
+        self._pending = {}
+        self._running = set()
+        self._sequence = itertools.count()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"agent-sync-worker-{i}", daemon=True)
+            for i in range(max(1, max_workers))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, component, items=()):
+        """Queue a run of component, merging with an already pending request.
+
+        Returns a threading.Event set once the run covering this request has
+        finished, or None if the executor is shut down.
+        """
+        with self._cond:
+            if self._closed:
+                return None
+            if component in self._pending:
+                _seq, merged, done = self._pending[component]
+                merged.update(dict.fromkeys(items))
+            else:
+                done = threading.Event()
+                self._pending[component] = (next(self._sequence), dict.fromkeys(items), done)
+            self._cond.notify()
+        return done
+
+    def busy(self) -> set:
+        """Components that are running or waiting to run."""
+        with self._cond:
+            return set(self._running) | set(self._pending)
+
+    def pending(self) -> set:
+        """Components waiting to run (including follow-ups of a running one)."""
+        with self._cond:
+            return set(self._pending)
+
+    def wait_idle(self, timeout=None) -> bool:
+        """Block until nothing is pending or running; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._running, timeout
+            )
+
+    def shutdown(self, wait=True, cancel_pending=False):
+        """Stop accepting work; by default pending requests still run first."""
+        with self._cond:
+            self._closed = True
+            if cancel_pending:
+                for _seq, _items, done in self._pending.values():
+                    done.set()
+                self._pending.clear()
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _next_ready(self):
+        ready = [
+            (self._priorities.get(component, len(self._priorities)), entry[0], component)
+            for component, entry in self._pending.items()
+            if component not in self._running
+        ]
+        if not ready:
+            return None
+        return min(ready)[2]
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                component = self._next_ready()
+                while component is None:
+                    if self._closed and not self._pending:
+                        return
+                    self._cond.wait()
+                    component = self._next_ready()
+                _seq, items, done = self._pending.pop(component)
+                self._running.add(component)
+            items = list(items)
+            error = None
+            try:
+                self._run(component, items)
+            except Exception as e:
+                error = e
+            try:
+                if self._on_complete is not None:
+                    self._on_complete(component, items, error)
+            except Exception:
+                # A failing callback must not take the worker down with it.
+                pass
+            finally:
+                with self._cond:
+                    self._running.discard(component)
+                    self._cond.notify_all()
+                done.set()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Cross-process sync locks with request coalescing.
+
+The daemon, a launchd guardian relaunch and a manual `agent-sync sync` can all
+sync the same component at once, duplicating work and risking torn writes to
+RULES.md, sync_state*.txt or skill directories. Each component gets an advisory
+flock in ~/.config/agent-rules-sync/locks/<component>.lock held for the whole
+sync, including its state-file updates.
+
+Coalescing uses two counters kept in <component>.meta (under its own short flock):
+
+- requested: bumped by every caller before it waits for the lock (its ticket);
+- covered:   the highest ticket a finished sync is known to have covered.
+
+A sync that starts after ticket t was taken reads everything t's caller wanted
+synced, so when a waiter finally gets the lock and finds covered >= its ticket
+it returns without running a redundant second pass.
+
+Where fcntl is unavailable (Windows) the locks fall back to process-local
+threading locks.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+_local_locks = {}
+_local_locks_guard = threading.Lock()
+
+
+def _local_lock(path: Path) -> threading.Lock:
+    with _local_locks_guard:
+        return _local_locks.setdefault(str(path), threading.Lock())
+
+
+@contextmanager
+def _flocked(path: Path):
+    """Hold an exclusive lock on path; yields the open fd."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), os.O_RDWR | os.O_CREAT, 0o600)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        else:
+            with _local_lock(path):
+                yield fd
+    finally:
+        # Closing the descriptor releases the flock.
+        os.close(fd)
+
+
+class SyncLockManager:
+    """Per-component advisory locks under config_dir/locks."""
+
+    def __init__(self, config_dir: Path):
+        self.config_dir = Path(config_dir)
+        self.lock_dir = self.config_dir / "locks"
+
+    @contextmanager
+    def hold(self, component: str):
+        """Exclusive lock for component, without coalescing."""
+        with _flocked(self.lock_dir / f"{component}.lock"):
+            yield
+
+    def _update_counters(self, component: str, update=None) -> dict:
+        with _flocked(self.lock_dir / f"{component}.meta") as fd:
+            raw = b""
+            while chunk := os.read(fd, 4096):
+                raw += chunk
+            try:
+                counters = json.loads(raw) if raw else {}
+            except ValueError:
+                counters = {}
+            counters = {
+                "requested": int(counters.get("requested", 0)),
+                "covered": int(counters.get("covered", 0)),
+            }
+            if update is not None:
+                update(counters)
+                data = json.dumps(counters).encode()
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, data)
+            return counters
+
+    def run_coalesced(self, component: str, func) -> bool:
+        """Run func under the component lock unless a sync that started after
+        this call already finished. Returns True if func ran."""
+
+        def take_ticket(counters):
+            counters["requested"] += 1
+
+        ticket = self._update_counters(component, take_ticket)["requested"]
+        with self.hold(component):
+            counters = self._update_counters(component)
+            if counters["covered"] >= ticket:
+                return False
+            # Every request made before this point is satisfied by this run.
+            start = counters["requested"]
+            func()
+
+            def mark_covered(counters):
+                counters["covered"] = max(counters["covered"], start)
+
+            self._update_counters(component, mark_covered)
+        return True
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Span-level timing for sync steps, written to a rotating JSONL trace.
+
+    with span("sync.rules.master_parse"):
+        ...
+
+Each finished span appends one line to ~/.config/agent-rules-sync/trace.jsonl:
+
+    {"name": "sync.rules.master_parse", "parent": "sync.rules", "ts": 1760000000.12,
+     "ms": 1.84, "thread": "MainThread"}
+
+The file rotates to trace.jsonl.1 .. trace.jsonl.N at TRACE_MAX_BYTES.
+`agent-sync profile` summarizes p50/p95 per span name (see summarize_trace).
+Spans are no-ops until configure_tracing() is called; ARSRULES_TRACE=off
+disables tracing entirely.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+TRACE_FILENAME = "trace.jsonl"
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUP_COUNT = 3
+
+
+class Tracer:
+    """Appends finished spans to a size-rotated JSONL file."""
+
+    def __init__(self, path: Path, max_bytes=TRACE_MAX_BYTES, backup_count=TRACE_BACKUP_COUNT):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append(name)
+        wall = time.time()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stack.pop()
+            record = {
+                "name": name,
+                "parent": parent,
+                "ts": round(wall, 3),
+                "ms": round(elapsed_ms, 3),
+                "thread": threading.current_thread().name,
+            }
+            if attrs:
+                record["attrs"] = attrs
+            self._write(record)
+
+    def _write(self, record: dict):
+        line = json.dumps(record, default=str) + "\n"
+        with self._lock:
+            try:
+                self._rotate_if_needed()
+                with open(self.path, "a") as f:
+                    f.write(line)
+            except OSError:
+                pass
+
+    def _rotate_if_needed(self):
+        try:
+            size = self.path.stat().st_size
+        except OSError:
+            return
+        if size < self.max_bytes:
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{index}")
+            if older.exists():
+                os.replace(older, self.path.with_name(f"{self.path.name}.{index + 1}"))
+        os.replace(self.path, self.path.with_name(f"{self.path.name}.1"))
+
+
+_tracer = None
+
+
+def configure_tracing(config_dir: Path) -> Tracer | None:
+    """Send spans to config_dir/trace.jsonl (unless ARSRULES_TRACE=off)."""
+    global _tracer
+    if os.environ.get("ARSRULES_TRACE", "").strip().lower() in ("off", "0", "false"):
+        _tracer = None
+        return None
+    path = Path(config_dir) / TRACE_FILENAME
+    if _tracer is None or _tracer.path != path:
+        _tracer = Tracer(path)
+    return _tracer
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the enclosed block as a span (no-op when tracing is not configured)."""
+    tracer = _tracer
+    if tracer is None:
+        yield
+        return
+    with tracer.span(name, **attrs):
+        yield
+
+
+def trace_files(config_dir: Path) -> list[Path]:
+    """Current trace file plus rotated ones, oldest first."""
+    base = Path(config_dir) / TRACE_FILENAME
+    rotated = sorted(
+        base.parent.glob(f"{TRACE_FILENAME}.*"),
+        key=lambda p: int(p.suffix[1:]) if p.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    return [p for p in rotated + [base] if p.exists()]
+
+
+def _percentile(sorted_values: list, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize_trace(paths) -> dict:
+    """Return {span name: {"count", "p50_ms", "p95_ms", "max_ms", "total_ms"}}."""
+    durations = {}
+    for path in paths:
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        durations.setdefault(record["name"], []).append(float(record["ms"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            continue
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        summary[name] = {
+            "count": len(values),
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "max_ms": values[-1],
+            "total_ms": sum(values),
+        }
+    return summary
+
+
+def format_summary(summary: dict) -> str:
+    if not summary:
+        return "No spans recorded yet."
+    width = max(len(name) for name in summary)
+    lines = [f"{'span':<{width}}  {'count':>6}  {'p50 ms':>9}  {'p95 ms':>9}  {'max ms':>9}"]
+    for name in sorted(summary):
+        row = summary[name]
+        lines.append(
+            f"{name:<{width}}  {row['count']:>6}  {row['p50_ms']:>9.2f}  "
+            f"{row['p95_ms']:>9.2f}  {row['max_ms']:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def traced(name: str):
+    """Decorator form of span()."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Plan recursive watch roots within the kernel's inotify budget.
+
+Every configured repo contributes its root plus .claude, .claude/hooks, .gemini,
+.gemini/hooks and .cursor. On Linux each watched directory costs one inotify
+watch (watchdog and agent_inotify alike), and recursive watches on large
+monorepos can exhaust fs.inotify.max_user_watches, at which point watches fail.
+
+The planner:
+- coalesces roots with a path trie (a root under another root is dropped);
+- drops roots that do not exist instead of creating them;
+- when a budget applies, counts the directories under each root (the watch
+  cost) and degrades the most expensive roots to stat polling until the plan
+  fits the budget, so small roots (config dir, master skills, framework dirs)
+  keep native watches ahead of a huge monorepo. Each count stops just past the
+  budget, so a large root is never walked in full.
+
+The count must match the backend: agent_inotify skips IGNORE_DIR_NAMES, while
+watchdog registers every directory, so callers pass ignored=() for watchdog.
+"""
+
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from agent_inotify import IGNORE_DIR_NAMES
+
+
+MAX_USER_WATCHES_PATH = Path("/proc/sys/fs/inotify/max_user_watches")
+# Editors, IDEs and other tools share the per-user limit; only plan into part of it.
+WATCH_BUDGET_FRACTION = 0.5
+
+
+class PathTrie:
+    """Trie over path components; a stored path covers everything beneath it."""
+
+    _END = object()
+
+    def __init__(self):
+        self._root = {}
+
+    def insert(self, path) -> bool:
+        """Add path; returns False if an ancestor (or the path itself) is already stored."""
+        node = self._root
+        for part in Path(path).parts:
+            if self._END in node:
+                return False
+            node = node.setdefault(part, {})
+        if self._END in node:
+            return False
+        node.clear()  # drop descendants, now covered by this path
+        node[self._END] = Path(path)
+        return True
+
+    def covers(self, path) -> bool:
+        node = self._root
+        for part in Path(path).parts:
+            if self._END in node:
+                return True
+            node = node.get(part)
+            if node is None:
+                return False
+        return self._END in node
+
+    def roots(self) -> list[Path]:
+        found = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if self._END in node:
+                found.append(node[self._END])
+                continue
+            stack.extend(node.values())
+        return sorted(found, key=lambda p: (len(p.parts), str(p)))
+
+
+def coalesce_roots(paths) -> tuple[list[Path], int]:
+    """Return (roots not nested in another root, number of roots dropped)."""
+    paths = sorted({Path(p) for p in paths}, key=lambda p: (len(p.parts), str(p)))
+    trie = PathTrie()
+    nested = sum(1 for path in paths if not trie.insert(path))
+    return trie.roots(), nested
+
+
+def inotify_watch_limit(path: Path = MAX_USER_WATCHES_PATH) -> int | None:
+    """Return fs.inotify.max_user_watches, or None where it does not apply."""
+    try:
+        return int(Path(path).read_text().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def watch_budget(limit: int | None = None) -> int | None:
+    """Watches the daemon may plan for; ARSRULES_MAX_WATCHES overrides."""
+    override = os.environ.get("ARSRULES_MAX_WATCHES")
+    if override:
+        try:
+            return max(1, int(override))
+        except ValueError:
+            pass
+    limit = inotify_watch_limit() if limit is None else limit
+    if limit is None:
+        return None
+    return max(1, int(limit * WATCH_BUDGET_FRACTION))
+
+
+def estimate_watch_cost(root: Path, cap: int | None = None, ignored=IGNORE_DIR_NAMES) -> int:
+    """Count directories a recursive watch on root would register (stops past cap).
+
+    ignored names the directories the watch backend skips.
+    """
+    count = 0
+    stack = [Path(root)]
+    while stack:
+        current = stack.pop()
+        count += 1
+        if cap is not None and count > cap:
+            break
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.name in ignored:
+                        continue
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return count
+
+
+@dataclass
+class WatchPlan:
+    """recursive roots get event watches; polled roots rely on the stat rescan."""
+
+    recursive: list[Path] = field(default_factory=list)
+    polled: list[Path] = field(default_factory=list)
+    missing: list[Path] = field(default_factory=list)
+    # Directory counts; for polled roots a lower bound (the walk stopped early).
+    costs: dict = field(default_factory=dict)
+    nested: int = 0
+    budget: int | None = None
+
+    @property
+    def total_cost(self) -> int:
+        return sum(self.costs.get(root, 0) for root in self.recursive)
+
+
+def plan_watch_roots(paths, budget: int | None = None, ignored=IGNORE_DIR_NAMES) -> WatchPlan:
+    """Coalesce paths into recursive roots that fit budget (None = unlimited).
+
+    ignored is passed to estimate_watch_cost; use () for watchdog.
+    """
+    plan = WatchPlan(budget=budget)
+    existing = []
+    for raw in paths:
+        path = Path(raw).expanduser()
+        try:
+            if not path.is_dir():
+                plan.missing.append(path)
+                continue
+            existing.append(path.resolve())
+        except OSError:
+            plan.missing.append(path)
+    roots, plan.nested = coalesce_roots(existing)
+    if budget is None:
+        plan.recursive = roots
+        return plan
+
+    for root in roots:
+        plan.costs[root] = estimate_watch_cost(root, cap=budget + 1, ignored=ignored)
+    total = sum(plan.costs.values())
+    for root in sorted(roots, key=lambda r: (-plan.costs[r], str(r))):
+        if total <= budget:
+            break
+        plan.polled.append(root)
+        total -= plan.costs[root]
+    polled = set(plan.polled)
+    plan.recursive = [root for root in roots if root not in polled]
+    return plan
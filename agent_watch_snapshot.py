@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Persisted watch state so daemon restarts do not pay a full cold pass.
+
+watch() used to re-hash every rules file, skill tree, settings file, MCP source
+and transcript on start, then run a full sync() and history sync before entering
+its loop. The daemon now writes its post-sync watch state to watch_state.json
+(periodically and on shutdown). On restart the fresh state is diffed against the
+snapshot and only the components that changed while the daemon was down are
+synced. The snapshot also carries stat-keyed content hashes so the restart-time
+hashing of unchanged files costs one stat() each.
+
+A snapshot is ignored (cold start) when its format version or the config
+fingerprint (sync_config.json, agent and framework paths) does not match.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from agent_stat_cache import stat_signature
+
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FILENAME = "watch_state.json"
+
+# Order matches AgentRulesSync._build_watch_state().
+WATCH_COMPONENTS = ("rules", "skills", "settings", "mcp", "history")
+# Components whose keys are paths (rules keys are agent ids such as "master").
+_PATH_KEYED = {"skills", "settings", "mcp", "history"}
+
+
+def config_fingerprint(config_dir: Path, agents: dict, frameworks: dict) -> str:
+    """Digest of everything that decides *what* the daemon watches."""
+    payload = {
+        "version": SNAPSHOT_VERSION,
+        "config_dir": str(config_dir),
+        "sync_config": stat_signature(Path(config_dir) / "sync_config.json"),
+        "agents": sorted((agent_id, str(cfg["path"])) for agent_id, cfg in agents.items()),
+        "frameworks": sorted((fw_id, str(fw["path"])) for fw_id, fw in frameworks.items()),
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+
+def changed_components(saved: dict, current: dict) -> tuple[list[str], list[Path]]:
+    """Return (sync components that differ, history paths that differ)."""
+    components = [
+        name for name in ("rules", "skills", "settings", "mcp")
+        if saved.get(name) != current.get(name)
+    ]
+    old_history = saved.get("history", {})
+    new_history = current.get("history", {})
+    history_paths = [
+        path for path, signature in new_history.items()
+        if old_history.get(path) != signature
+    ]
+    history_paths.extend(path for path in old_history if path not in new_history)
+    return components, history_paths
+
+
+class WatchSnapshot:
+    """Reads and atomically writes config_dir/watch_state.json."""
+
+    def __init__(self, config_dir: Path):
+        self.path = Path(config_dir) / SNAPSHOT_FILENAME
+
+    def load(self, fingerprint: str) -> dict | None:
+        """Return {"state": {component: {key: hash}}, "stat_hashes": [...]}, or None."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get("version") != SNAPSHOT_VERSION or data.get("fingerprint") != fingerprint:
+            return None
+        raw_state = data.get("state")
+        if not isinstance(raw_state, dict):
+            return None
+        state = {}
+        for name in WATCH_COMPONENTS:
+            entries = raw_state.get(name, {})
+            if not isinstance(entries, dict):
+                return None
+            if name in _PATH_KEYED:
+                state[name] = {Path(key): value for key, value in entries.items()}
+            else:
+                state[name] = dict(entries)
+        stat_hashes = data.get("stat_hashes", [])
+        return {"state": state, "stat_hashes": stat_hashes if isinstance(stat_hashes, list) else []}
+
+    def save(self, fingerprint: str, state: dict, stat_hashes=()) -> bool:
+        """Persist state ({component: {key: hash}}); returns False on I/O errors."""
+        payload = {
+            "version": SNAPSHOT_VERSION,
+            "fingerprint": fingerprint,
+            "state": {
+                name: {str(key): value for key, value in state.get(name, {}).items()}
+                for name in WATCH_COMPONENTS
+            },
+            "stat_hashes": [list(entry) for entry in stat_hashes],
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                prefix=f".{self.path.name}.", suffix=".tmp", dir=str(self.path.parent)
+            )
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(payload, f)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+                raise
+        except OSError:
+            return False
+        return True
+
+    def clear(self):
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
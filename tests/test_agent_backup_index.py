@@ -0,0 +1,131 @@
+"""Tests for the skill backup hash index."""
+
+import json
+
+from agent_backup_index import INDEX_VERSION, BackupIndex, split_backup_name
+
+
+def _backup(backup_dir, name, content):
+    path = backup_dir / name
+    path.mkdir(parents=True)
+    (path / "SKILL.md").write_text(content)
+    return path
+
+
+def _hash(path):
+    return "h:" + (path / "SKILL.md").read_text()
+
+
+def test_recorded_hashes_survive_reload_without_rehashing(tmp_path):
+    backups = tmp_path / "skill_backups"
+    index = BackupIndex(backups, tmp_path / "index.json")
+    path = _backup(backups, "claude_demo_20260101_120000", "v1")
+    index.record(path, "claude", "demo", "h:v1")
+
+    def fail(_path):
+        raise AssertionError("backup rehashed")
+
+    reloaded = BackupIndex(backups, tmp_path / "index.json")
+    assert reloaded.hashes("claude", "demo") == {"h:v1"}
+    assert reloaded.hashes("codex", "demo") == set()
+    assert reloaded.repair(fail)["added"] == 0
+
+    # A deleted backup no longer counts as an existing snapshot.
+    (path / "SKILL.md").unlink()
+    path.rmdir()
+    assert reloaded.hashes("claude", "demo") == set()
+
+
+def test_repair_indexes_legacy_backups_and_prunes_missing(tmp_path):
+    backups = tmp_path / "skill_backups"
+    index = BackupIndex(backups, tmp_path / "index.json")
+    index.record(backups / "gone_demo_20260101_000000", "gone", "demo", "h:old")
+    _backup(backups, "repo:my_app_my_skill_20260102_030405", "v2")
+    _backup(backups, "not-a-backup", "x")
+
+    counts = index.repair(_hash, known_ids={"repo:my_app", "claude"})
+
+    assert counts == {"added": 1, "rehashed": 0, "removed": 1, "unrecognized": 1}
+    assert BackupIndex(backups, tmp_path / "index.json").hashes("repo:my_app", "my_skill") == {"h:v2"}
+
+
+def test_split_backup_name_without_known_ids():
+    assert split_backup_name("cursor_my_skill_20260101_120000") == ("cursor", "my_skill")
+    assert split_backup_name("cursor_20260101_120000") is None
+
+
+def test_index_with_old_hash_format_is_discarded_and_rebuilt(tmp_path):
+    backups = tmp_path / "skill_backups"
+    path = _backup(backups, "claude_demo_20260101_120000", "v1")
+    index_path = tmp_path / "index.json"
+    index_path.write_text(json.dumps({
+        "version": INDEX_VERSION - 1,
+        "backups": {
+            path.name: {
+                "framework": "claude",
+                "skill": "demo",
+                "hash": "old-format-hash",
+                "mtime_ns": path.stat().st_mtime_ns,
+            },
+        },
+    }))
+
+    index = BackupIndex(backups, index_path)
+    assert index.hashes("claude", "demo") == set()
+    assert index.repair(_hash, {"claude"})["added"] == 1
+    assert BackupIndex(backups, index_path).hashes("claude", "demo") == {"h:v1"}
+
+
+def test_records_are_batched_until_flush(tmp_path):
+    backups = tmp_path / "skill_backups"
+    index_path = tmp_path / "index.json"
+    index = BackupIndex(backups, index_path)
+    first = _backup(backups, "claude_demo_20260101_120000", "v1")
+    second = _backup(backups, "claude_demo_20260101_130000", "v2")
+
+    index.record(first, "claude", "demo", "h:v1")
+    written = index_path.read_text()
+    index.record(second, "claude", "demo", "h:v2")
+    assert index_path.read_text() == written
+
+    index.flush(force=True)
+    assert BackupIndex(backups, index_path).hashes("claude", "demo") == {"h:v1", "h:v2"}
+
+
+def test_missing_or_outdated_index_is_rebuilt_in_background(tmp_path):
+    backups = tmp_path / "skill_backups"
+    index_path = tmp_path / "index.json"
+    _backup(backups, "claude_demo_20260101_120000", "v1")
+
+    index = BackupIndex(backups, index_path)
+    assert index.needs_rebuild
+    index.rebuild_in_background(_hash, {"claude"}).join()
+    assert index.hashes("claude", "demo") == {"h:v1"}
+
+    current = BackupIndex(backups, index_path)
+    assert not current.needs_rebuild
+    assert current.rebuild_in_background(_hash) is None
+
+    data = json.loads(index_path.read_text())
+    index_path.write_text(json.dumps({**data, "version": INDEX_VERSION - 1}))
+    outdated = BackupIndex(backups, index_path)
+    outdated.rebuild_in_background(_hash, {"claude"}).join()
+    assert outdated.hashes("claude", "demo") == {"h:v1"}
+
+
+def test_rebuild_keeps_backups_recorded_meanwhile(tmp_path):
+    backups = tmp_path / "skill_backups"
+    index = BackupIndex(backups, tmp_path / "index.json")
+    _backup(backups, "claude_demo_20260101_120000", "v1")
+    recorded = []
+
+    def hash_and_record(path):
+        if not recorded:
+            late = _backup(backups, "codex_demo_20260101_130000", "v2")
+            index.record(late, "codex", "demo", "h:v2")
+            recorded.append(late)
+        return _hash(path)
+
+    index.repair(hash_and_record, {"claude", "codex"})
+    assert index.hashes("codex", "demo") == {"h:v2"}
+    assert index.hashes("claude", "demo") == {"h:v1"}
@@ -0,0 +1,32 @@
+import socket
+
+import pytest
+
+from agent_control import ControlServer, control_socket_path, send_control_request
+
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def test_request_round_trip_and_errors(tmp_path):
+    server = ControlServer(tmp_path, {
+        "ping": lambda request: {"ok": True, "echo": request.get("value")},
+        "boom": lambda request: 1 / 0,
+    })
+    try:
+        assert control_socket_path(tmp_path).stat().st_mode & 0o077 == 0
+        assert send_control_request(tmp_path, {"cmd": "ping", "value": 3}) == {"ok": True, "echo": 3}
+        assert send_control_request(tmp_path, {"cmd": "nope"})["ok"] is False
+        assert "division" in send_control_request(tmp_path, {"cmd": "boom"})["error"]
+    finally:
+        server.close()
+    assert not control_socket_path(tmp_path).exists()
+
+
+def test_no_daemon_or_stale_socket_returns_none(tmp_path):
+    assert send_control_request(tmp_path, {"cmd": "status"}) is None
+
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(control_socket_path(tmp_path)))
+    stale.close()  # socket file left behind, nobody listening
+    assert send_control_request(tmp_path, {"cmd": "status"}) is None
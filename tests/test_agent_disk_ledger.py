@@ -0,0 +1,50 @@
+"""Tests for the incremental disk-usage ledger."""
+
+import os
+
+from agent_disk_ledger import DiskLedger, measure_tree
+
+
+def test_writes_accumulate_and_persist(tmp_path):
+    ledger = DiskLedger(tmp_path)
+    assert not ledger.reconciled
+    (tmp_path / "a.txt").write_text("abcd")
+    assert ledger.reconcile() == 4
+
+    ledger.add(10)
+    ledger.add(-3)
+    assert ledger.total() == 11
+    ledger.flush(force=True)
+
+    reloaded = DiskLedger(tmp_path)
+    assert reloaded.total() == 11
+    assert reloaded.reconciled
+
+
+def test_reconcile_keeps_writes_reported_during_the_walk(tmp_path):
+    ledger = DiskLedger(tmp_path)
+
+    def measure(_path):
+        ledger.add(5)
+        return 100
+
+    assert ledger.reconcile(measure) == 105
+
+
+def test_measure_tree_skips_symlinks(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "file").write_text("12345")
+    os.symlink(tmp_path / "sub" / "file", tmp_path / "link")
+    assert measure_tree(tmp_path) == 5
+
+
+def test_flush_does_not_touch_another_writers_temp_file(tmp_path):
+    other = tmp_path / "disk_usage.json.tmp"
+    other.write_text("another process, mid-write")
+    ledger = DiskLedger(tmp_path)
+    ledger.add(5)
+    ledger.flush(force=True)
+
+    assert other.read_text() == "another process, mid-write"
+    assert DiskLedger(tmp_path).total() == 5
+    assert not list(tmp_path.glob(".disk_usage.json.*"))
@@ -0,0 +1,47 @@
+"""Tests for compiled exclusion rules."""
+
+import json
+
+from agent_exclusions import ExclusionRules, SkillSubscription
+
+
+def test_literal_glob_and_regex_entries(tmp_path):
+    (tmp_path / "excludes.json").write_text(json.dumps({
+        "mcp": {"agents": {"cursor": ["exact", "debug-*", "re:tmp-[0-9]+"]}},
+    }))
+    excluded = ExclusionRules(tmp_path).for_target("mcp", "cursor")
+
+    assert "exact" in excluded
+    assert "debug-server" in excluded
+    assert "tmp-42" in excluded
+    assert "tmp-x" not in excluded
+    assert "exactly" not in excluded
+    assert excluded.filter(["exact", "debug-a", "keep"]) == {"keep"}
+    assert ".debug-x.tmp-sync" not in ExclusionRules(tmp_path).for_target("mcp", "cursor")
+    assert not ExclusionRules(tmp_path).for_target("mcp", "claude")
+
+
+def test_compiled_sets_are_reused_until_repo_file_changes(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    rules = ExclusionRules(tmp_path)
+    first = rules.for_target("skills", "repo:repo", repo)
+    assert rules.for_target("skills", "repo:repo", repo) is first
+    assert "local" not in first
+
+    (repo / ExclusionRules.REPO_FILENAME).write_text('{"skills": ["local"]}')
+    second = rules.for_target("skills", "repo:repo", repo)
+    assert "local" in second
+    assert rules.for_target("skills", "repo:repo", repo) is second
+
+
+def test_skill_subscription_matches_names_globs_and_tags():
+    subscription = SkillSubscription.compile(["exact", "web-*", "tag:Python"])
+
+    assert subscription.matches("exact")
+    assert subscription.matches("web-ui")
+    assert subscription.matches("helper", lambda: ["python"])
+    assert not subscription.matches("helper", lambda: ["go"])
+    assert not subscription.matches("helper")
+    # Tags are not looked up when the name already decides.
+    assert subscription.matches("exact", lambda: 1 / 0)
@@ -0,0 +1,57 @@
+"""Tests for cached, memory-mapped file digests."""
+
+import hashlib
+import os
+
+import agent_file_digest
+from agent_file_digest import DigestCache, hash_file
+
+
+def test_mmap_and_read_paths_agree(tmp_path, monkeypatch):
+    data = os.urandom(300_000)
+    path = tmp_path / "asset.bin"
+    path.write_bytes(data)
+    expected = hashlib.sha256(data).hexdigest()
+    assert hash_file(path) == expected
+
+    monkeypatch.setattr(agent_file_digest, "MMAP_THRESHOLD", 1024)
+    monkeypatch.setattr(agent_file_digest, "MMAP_SLICE", 4096)
+    assert hash_file(path) == expected
+    assert hash_file(path, "fast") == hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    empty = tmp_path / "empty"
+    empty.write_bytes(b"")
+    assert hash_file(empty) == hashlib.sha256(b"").hexdigest()
+
+
+def test_cache_reuses_digest_until_stat_changes(tmp_path):
+    path = tmp_path / "asset.bin"
+    path.write_bytes(b"one")
+    link = tmp_path / "link.bin"
+    os.link(path, link)
+    cache = DigestCache()
+
+    first = cache.digest(path)
+    assert cache.digest(link) == first
+    assert cache.digest(path, "fast") != first
+    assert cache.hashed == 2
+
+    path.write_bytes(b"two")
+    os.utime(path, ns=(1, 1))
+    assert cache.digest(path) == hashlib.sha256(b"two").hexdigest()
+    assert cache.hashed == 3
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = DigestCache(limit=2)
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / name
+        path.write_text(name)
+        paths.append(path)
+    cache.digest(paths[0])
+    cache.digest(paths[1])
+    cache.digest(paths[0])
+    cache.digest(paths[2])
+    assert cache.get(os.stat(paths[0]), "sha256") is not None
+    assert cache.get(os.stat(paths[1]), "sha256") is None
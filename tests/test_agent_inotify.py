@@ -0,0 +1,81 @@
+"""Tests for the ctypes inotify watch backend."""
+
+import struct
+import time
+from pathlib import Path
+
+import pytest
+
+from agent_inotify import (
+    IN_CLOSE_WRITE,
+    IN_Q_OVERFLOW,
+    InotifyWatcher,
+    inotify_available,
+)
+
+pytestmark = pytest.mark.skipif(not inotify_available(), reason="inotify is Linux-only")
+
+
+def _wait_for(events, predicate, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if any(predicate(e) for e in events):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_targeted_watch_filters_by_file_name(tmp_path):
+    """A non-recursive watch only reports the named files in its parent dir."""
+    events = []
+    watcher = InotifyWatcher(events.append)
+    assert watcher.watch_directory(tmp_path, names={".claude.json"})
+    watcher.start()
+    try:
+        (tmp_path / "noise.log").write_text("x")
+        (tmp_path / ".claude.json").write_text("{}")
+        assert _wait_for(events, lambda e: e.src_path.endswith(".claude.json"))
+        assert not any(e.src_path.endswith("noise.log") for e in events)
+    finally:
+        watcher.stop()
+        watcher.join()
+
+
+def test_recursive_watch_follows_new_subdirectories(tmp_path):
+    events = []
+    watcher = InotifyWatcher(events.append)
+    assert watcher.watch_directory(tmp_path, recursive=True)
+    watcher.start()
+    try:
+        nested = tmp_path / "skill"
+        nested.mkdir()
+        assert _wait_for(events, lambda e: e.src_path == str(nested))
+        (nested / "SKILL.md").write_text("---\n")
+        assert _wait_for(events, lambda e: e.src_path == str(nested / "SKILL.md"))
+    finally:
+        watcher.stop()
+        watcher.join()
+
+
+def test_overflow_triggers_rescan_and_overflow_event(tmp_path):
+    """IN_Q_OVERFLOW is reported and directories created meanwhile get watched."""
+    events = []
+    watcher = InotifyWatcher(events.append)
+    watcher.watch_directory(tmp_path, recursive=True)
+    (tmp_path / "missed").mkdir()
+    before = watcher.watch_count()
+
+    watcher._dispatch_buffer(struct.pack("iIII", -1, IN_Q_OVERFLOW, 0, 0))
+
+    assert [e.event_type for e in events] == ["overflow"]
+    assert watcher.watch_count() == before + 1
+    watcher.join()
+
+
+def test_dispatch_ignores_unknown_watch_descriptors(tmp_path):
+    events = []
+    watcher = InotifyWatcher(events.append)
+    name = b"file.json\0\0\0"
+    watcher._dispatch_buffer(struct.pack("iIII", 999, IN_CLOSE_WRITE, 0, len(name)) + name)
+    assert events == []
+    watcher.join()
@@ -0,0 +1,59 @@
+"""Tests for streaming top-level JSON subtree reads and surgical patches."""
+
+import json
+
+from agent_json_subtree import (
+    locate_top_level_value,
+    read_top_level_value,
+    replace_top_level_value,
+)
+
+
+def _write_claude_json(path, servers, trailing_key=True):
+    doc = {
+        "numStartups": 3,
+        "projects": {
+            "/repo": {"history": [{"display": '"mcpServers": {"fake": 1}\n  "x"'}]},
+        },
+        "mcpServers": servers,
+    }
+    if trailing_key:
+        doc["userID"] = "abc"
+    path.write_text(json.dumps(doc, indent=2) + "\n")
+    return doc
+
+
+def test_read_extracts_only_top_level_key(tmp_path):
+    path = tmp_path / ".claude.json"
+    _write_claude_json(path, {"a": {"command": "a"}})
+
+    assert read_top_level_value(path, "mcpServers") == {"a": {"command": "a"}}
+    assert read_top_level_value(path, "missing", {}) == {}
+    span = locate_top_level_value(path, "mcpServers")
+    assert path.read_bytes()[span.start:span.end].startswith(b"{")
+
+
+def test_replace_leaves_other_bytes_identical(tmp_path):
+    for trailing in (True, False):
+        path = tmp_path / f"claude-{trailing}.json"
+        doc = _write_claude_json(path, {"a": {"command": "a"}}, trailing_key=trailing)
+
+        new_servers = {"b": {"command": "b", "args": ["--x"]}}
+        assert replace_top_level_value(path, "mcpServers", new_servers) is True
+
+        doc["mcpServers"] = new_servers
+        assert path.read_text() == json.dumps(doc, indent=2) + "\n"
+        assert replace_top_level_value(path, "mcpServers", new_servers) is False
+
+
+def test_replace_inserts_missing_key_and_handles_compact_json(tmp_path):
+    pretty = tmp_path / "pretty.json"
+    pretty.write_text(json.dumps({"projects": {}}, indent=2) + "\n")
+    assert replace_top_level_value(pretty, "mcpServers", {"a": {}})
+    assert json.loads(pretty.read_text()) == {"projects": {}, "mcpServers": {"a": {}}}
+
+    compact = tmp_path / "compact.json"
+    compact.write_text('{"projects":{},"mcpServers":{"old":{}}}')
+    assert read_top_level_value(compact, "mcpServers") == {"old": {}}
+    assert replace_top_level_value(compact, "mcpServers", {"new": {}})
+    assert json.loads(compact.read_text()) == {"projects": {}, "mcpServers": {"new": {}}}
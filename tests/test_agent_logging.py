@@ -0,0 +1,42 @@
+"""Tests for the buffered daemon log."""
+
+import gzip
+
+from agent_logging import DEBUG, ERROR, INFO, DaemonLog
+
+
+def test_level_filters_and_error_prefix(tmp_path):
+    log = DaemonLog(tmp_path / "daemon.log", level=INFO)
+    log.log(DEBUG, "Copied skill -> target")
+    log.log(INFO, "Sync complete")
+    log.log(ERROR, "Skills sync error: boom")
+
+    lines = (tmp_path / "daemon.log").read_text().splitlines()
+    assert len(lines) == 2
+    assert lines[0].endswith("] Sync complete")
+    assert lines[1].endswith("] ERROR: Skills sync error: boom")
+
+
+def test_background_writer_flushes_queued_lines(tmp_path):
+    log = DaemonLog(tmp_path / "daemon.log", level=DEBUG)
+    log.start_background()
+    for i in range(50):
+        log.log(INFO, f"message {i}")
+
+    assert log.flush(timeout=5)
+    lines = (tmp_path / "daemon.log").read_text().splitlines()
+    assert [line.split("] ", 1)[1] for line in lines] == [f"message {i}" for i in range(50)]
+
+
+def test_rotation_renames_and_compresses_older_segments(tmp_path):
+    path = tmp_path / "daemon.log"
+    # Every line crosses max_bytes, so each write rotates.
+    log = DaemonLog(path, max_bytes=1, backup_count=3, level=DEBUG)
+    for name in ("first", "second", "third", "fourth"):
+        log.log(INFO, name * 3)
+
+    assert not path.exists()
+    assert "fourth" in (tmp_path / "daemon.log.1").read_text()
+    assert "third" in gzip.decompress((tmp_path / "daemon.log.2.gz").read_bytes()).decode()
+    assert "second" in gzip.decompress((tmp_path / "daemon.log.3.gz").read_bytes()).decode()
+    assert not (tmp_path / "daemon.log.4.gz").exists()
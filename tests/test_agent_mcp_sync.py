@@ -297,3 +297,57 @@ def test_mcp_sync_agent_addition_merges_when_agent_is_newest(mcp_syncer, temp_ho
     master_data = json.loads(mcp_syncer.master_file.read_text())
     assert "existing" in master_data["mcpServers"]
     assert "brand-new" in master_data["mcpServers"]
+
+
+def test_mcp_watch_hashes_skip_parsing_unchanged_files(mcp_syncer, temp_home, monkeypatch):
+    """Idle polls only stat MCP sources; parsing happens when the stat moves."""
+    cursor_path = temp_home / ".cursor" / "mcp.json"
+    cursor_path.write_text(json.dumps({"mcpServers": {"a": {"command": "a"}}}))
+
+    parsed = []
+    original = mcp_syncer._get_mcp_servers
+    monkeypatch.setattr(
+        mcp_syncer,
+        "_get_mcp_servers",
+        lambda path, info=None: parsed.append(path) or original(path, info),
+    )
+
+    first = mcp_syncer.get_watch_hashes()
+    count = len(parsed)
+    assert count >= 1
+    assert mcp_syncer.get_watch_hashes() == first
+    assert len(parsed) == count
+
+    cursor_path.write_text(json.dumps({"mcpServers": {"b": {"command": "b"}}}))
+    assert mcp_syncer.mcp_changed(first) is True
+    assert cursor_path in parsed[count:]
+
+
+def test_claude_json_is_patched_surgically_with_delta_backup(mcp_syncer, temp_home):
+    """Only mcpServers changes in ~/.claude.json; backups hold just the MCP delta."""
+    claude_path = temp_home / ".claude.json"
+    doc = {
+        "projects": {"/repo": {"history": ["x" * 1000]}},
+        "mcpServers": {"old-server": {"command": "old"}},
+        "userID": "abc",
+    }
+    claude_path.write_text(json.dumps(doc, indent=2) + "\n")
+
+    mcp_syncer._update_target(
+        claude_path,
+        {"new-server": {"command": "new"}},
+        "claude-code",
+        lambda _: None,
+        mcp_syncer.global_sources["claude-code"],
+    )
+
+    doc["mcpServers"] = {"new-server": {"command": "new"}}
+    assert claude_path.read_text() == json.dumps(doc, indent=2) + "\n"
+
+    backups = list(mcp_syncer.backup_dir.glob("claude-code_*.mcpServers.json"))
+    assert len(backups) == 1
+    delta = json.loads(backups[0].read_text())
+    assert delta["previous"] == {"old-server": {"command": "old"}}
+    assert delta["added"] == ["new-server"]
+    assert delta["removed"] == ["old-server"]
+    assert "projects" not in backups[0].read_text()
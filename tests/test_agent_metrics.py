@@ -0,0 +1,62 @@
+import socket
+
+import pytest
+
+from agent_metrics import MetricsRegistry, start_metrics_server
+
+
+def test_render_prometheus_text_format():
+    registry = MetricsRegistry()
+    writes = registry.counter("writes_total", "Bytes written.", ("component",))
+    depth = registry.gauge("queue_depth", "Queue depth.")
+    latency = registry.histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0))
+
+    writes.inc(10, component="mcp")
+    writes.inc(5, component="mcp")
+    writes.inc(component='we"ird')
+    depth.set(3)
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = registry.render()
+    assert "# TYPE writes_total counter" in text
+    assert 'writes_total{component="mcp"} 15' in text
+    assert 'writes_total{component="we\\"ird"} 1' in text
+    assert "queue_depth 3" in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+    assert latency.value() == (2, 0.55)
+
+
+def test_histogram_time_records_duration_per_label():
+    registry = MetricsRegistry()
+    duration = registry.histogram("sync_seconds", "Sync.", ("component",))
+    with duration.time(component="rules"):
+        pass
+    assert duration.value(component="rules")[0] == 1
+    assert duration.value(component="mcp") == (0, 0.0)
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+def test_metrics_served_over_unix_socket(tmp_path):
+    server = start_metrics_server(tmp_path, setting="socket")
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(str(tmp_path / "metrics.sock"))
+        client.sendall(b"GET /metrics HTTP/1.0\r\nHost: localhost\r\n\r\n")
+        response = b""
+        while chunk := client.recv(65536):
+            response += chunk
+        client.close()
+    finally:
+        server.close()
+
+    assert response.startswith(b"HTTP/1.0 200")
+    assert b"# TYPE agent_sync_component_duration_seconds histogram" in response
+    assert not (tmp_path / "metrics.sock").exists()
+
+
+def test_metrics_can_be_disabled(tmp_path):
+    assert start_metrics_server(tmp_path, setting="off") is None
@@ -0,0 +1,61 @@
+"""Tests for the shared config/repo/exclusion registry."""
+
+import json
+
+import agent_registry
+from agent_mcp_sync import AgentMcpSync
+from agent_registry import ConfigRegistry, registry_for
+from agent_skills_sync import AgentSkillsSync
+
+
+def test_files_reload_only_when_their_stat_moves(monkeypatch, tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (tmp_path / "repo_paths.json").write_text(json.dumps([str(repo)]))
+    reads = []
+    real_read = agent_registry._read_repo_paths
+    monkeypatch.setattr(agent_registry, "_read_repo_paths", lambda p: reads.append(p) or real_read(p))
+
+    registry = ConfigRegistry(tmp_path)
+    assert registry.repo_paths == [repo.resolve()]
+    assert registry.repo_paths == [repo.resolve()]
+    assert len(reads) == 1
+
+    (tmp_path / "excludes.json").write_text('{"skills": {"agents": {"*": ["canvas"]}}}')
+    assert registry.refresh() == {"exclusions"}
+    assert "canvas" in registry.exclusions.for_target("skills", "claude")
+    assert len(reads) == 1
+
+
+def test_subscribers_are_pushed_changed_parts(tmp_path):
+    registry = ConfigRegistry(tmp_path)
+    seen = []
+    registry.subscribe(seen.append)
+
+    assert registry.refresh() == set()
+    (tmp_path / "sync_config.json").write_text('{"skill_targets": {"agents": false}}')
+    registry.refresh()
+    assert seen == [{"config"}]
+    assert registry.config.skill_target_enabled("agents") is False
+
+    registry.unsubscribe(seen.append)
+    (tmp_path / "sync_config.json").write_text("{}")
+    registry.refresh()
+    assert seen == [{"config"}]
+
+
+def test_components_share_one_registry_and_follow_repo_edits(tmp_path):
+    cfg = tmp_path / "config"
+    cfg.mkdir()
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    skills = AgentSkillsSync(config_dir=cfg)
+    mcp = AgentMcpSync(config_dir=cfg)
+    assert skills.registry is mcp.registry is registry_for(cfg)
+    assert "repo:repo" not in skills.frameworks
+
+    (cfg / "repo_paths.json").write_text(json.dumps([str(repo)]))
+    mcp.registry.refresh()
+
+    assert mcp.repo_paths == [repo.resolve()]
+    assert skills.frameworks["repo:repo"]["path"] == repo.resolve() / ".claude" / "skills"
@@ -1,6 +1,17 @@
+import json
+import os
+import socket
+import subprocess
+import sys
 import tempfile
+import threading
 from pathlib import Path
 
+import pytest
+
+from agent_control import send_control_request
+from agent_disk_ledger import ledger_for
+from agent_metrics import DISK_USAGE
 from agent_rules_sync import AgentRulesSync
 
 def test_extract_shared_rules():
@@ -108,6 +119,14 @@ def test_disk_quota_check_is_throttled_unless_forced(monkeypatch, tmp_path):
     assert sync._check_disk_quota() is False
     assert calls == [True]
 
+    # Forced checks read the ledger kept current by writers instead of walking.
+    ledger_for(tmp_path).add(50)
+    assert sync._check_disk_quota(force=True) is False
+    assert calls == [True]
+    assert DISK_USAGE.value() == 51
+
+    # Crossing the limit is confirmed with a fresh walk before stopping.
+    ledger_for(tmp_path).add(60)
     assert sync._check_disk_quota(force=True) is False
     assert calls == [True, True]
 
@@ -155,6 +174,8 @@ def test_event_watch_roots_skip_home_level_mcp_file(monkeypatch, tmp_path):
     assert (home / ".config").resolve() not in roots
     assert (home / ".claude").resolve() not in roots
     assert sync.config_dir.resolve() in roots
+    # Missing roots are left to the periodic rescan rather than created.
+    assert not (home / ".claude").exists()
 
 
 def test_build_file_content():
@@ -409,3 +430,236 @@ def test_cursor_merge_multiple_rule_files_in_rules_dir(tmp_path, monkeypatch):
     assert "- extra cur" in merged
     # User-owned extra.md is not overwritten; still has original content
     assert "from extra md" in extra.read_text()
+
+
+def test_targeted_watch_files_group_home_level_files_by_parent(monkeypatch, tmp_path):
+    """Files skipped as recursive roots get exact-parent, name-filtered watches."""
+    home = tmp_path / "home"
+    (home / ".codex").mkdir(parents=True)
+    monkeypatch.setattr(Path, "home", lambda: home)
+
+    sync = AgentRulesSync()
+    sync.agents = {}
+    monkeypatch.setattr(sync, "_cursorrules_watch_pairs", lambda: [])
+
+    claude_mcp = home / ".claude.json"
+    codex_cfg = home / ".codex" / "config.toml"
+    targets = sync._targeted_watch_files({}, {claude_mcp: "a", codex_cfg: "b"})
+
+    assert targets == {home: {".claude.json"}, home / ".codex": {"config.toml"}}
+
+
+def test_sync_components_limit_which_steps_run(monkeypatch, tmp_path):
+    """A warm restart syncs only the components that changed while the daemon was down."""
+    sync = AgentRulesSync()
+    sync.config_dir = tmp_path
+    monkeypatch.setattr(sync, "_check_disk_quota", lambda force=False: False)
+    ran = []
+    for name in AgentRulesSync.SYNC_COMPONENTS:
+        monkeypatch.setattr(sync, f"_sync_{name}", lambda name=name: ran.append(name))
+
+    sync.sync(components=["mcp", "rules"])
+    assert ran == ["rules", "mcp"]
+
+    ran.clear()
+    sync.sync()
+    assert ran == list(AgentRulesSync.SYNC_COMPONENTS)
+
+
+def test_watch_snapshot_saves_after_sync_and_reloads(monkeypatch, tmp_path):
+    """Unforced snapshot saves only happen after a sync; a matching snapshot reloads."""
+    sync = AgentRulesSync()
+    sync.config_dir = tmp_path
+    state = ({"master": "m"}, {}, {}, {tmp_path / "mcp.json": "h"}, {})
+
+    sync._save_watch_snapshot(*state)
+    assert not (tmp_path / "watch_state.json").exists()
+
+    sync._snapshot_dirty = True
+    sync._save_watch_snapshot(*state)
+    assert (tmp_path / "watch_state.json").exists()
+
+    loaded = sync._load_watch_snapshot()
+    assert loaded["state"]["rules"] == {"master": "m"}
+    assert loaded["state"]["mcp"] == {tmp_path / "mcp.json": "h"}
+
+    sync.agents = {}
+    assert sync._load_watch_snapshot() is None
+
+
+def test_watch_snapshot_keeps_baseline_until_component_sync_completes(monkeypatch, tmp_path):
+    """A detected change still queued or failed is not persisted as synced."""
+    sync = AgentRulesSync()
+    sync.config_dir = tmp_path
+    mcp_path = tmp_path / "mcp.json"
+    state = ({"master": "m"}, {}, {}, {mcp_path: "old"}, {})
+    sync._commit_watch_state(("rules", "skills", "settings", "mcp", "history"), *state)
+
+    gate = threading.Event()
+    outcomes = iter([RuntimeError("boom"), None])
+
+    def fake_sync(components=None):
+        gate.wait(5)
+        error = next(outcomes)
+        if error is not None:
+            raise error
+
+    monkeypatch.setattr(sync, "sync", fake_sync)
+    monkeypatch.setattr(sync, "_check_disk_quota", lambda force=False: False)
+    monkeypatch.setattr(sync.mcp_sync, "get_watch_hashes", lambda: {mcp_path: "new"})
+    executor = sync._ensure_sync_executor(state)
+    try:
+        for _attempt in range(2):
+            state[3][mcp_path] = "new"  # what _detect_watch_changes records
+            executor.submit("mcp")
+            sync._save_watch_snapshot(*state, force=True)
+            assert sync._load_watch_snapshot()["state"]["mcp"] == {mcp_path: "old"}
+            gate.set()
+            assert executor.wait_idle(5)
+            gate.clear()
+        sync._save_watch_snapshot(*state, force=True)
+        assert sync._load_watch_snapshot()["state"]["mcp"] == {mcp_path: "new"}
+    finally:
+        gate.set()
+        executor.shutdown()
+        sync._sync_executor = None
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="SIGTERM can't be delivered to self on Windows")
+def test_sigterm_stops_watch_through_its_cleanup():
+    """SIGTERM sets the stop event and unwinds like Ctrl-C, so watch()'s finally runs."""
+    import signal
+
+    sync = AgentRulesSync()
+    previous = sync._install_sigterm_handler()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            os.kill(os.getpid(), signal.SIGTERM)
+        assert sync.stop_event.is_set()
+        # A second SIGTERM during cleanup doesn't interrupt it.
+        os.kill(os.getpid(), signal.SIGTERM)
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+def test_detect_watch_changes_reports_components_and_skips_busy(monkeypatch, tmp_path):
+    """Busy components are left alone so their own sync writes do not re-queue them."""
+    sync = AgentRulesSync()
+    sync.master_file = tmp_path / "RULES.md"
+    sync.master_file.write_text("# Shared Rules\n")
+    sync.agents = {}
+    monkeypatch.setattr(sync, "_cursorrules_watch_pairs", lambda: [])
+    monkeypatch.setattr(sync.skills_sync, "skills_changed", lambda hashes: False)
+    monkeypatch.setattr(sync.settings_sync, "settings_changed", lambda hashes: False)
+    monkeypatch.setattr(sync.mcp_sync, "mcp_changed", lambda hashes: True)
+    monkeypatch.setattr(sync.mcp_sync, "get_watch_hashes", lambda: {tmp_path / "mcp.json": "new"})
+
+    file_hashes = {"master": "stale"}
+    mcp_hashes = {}
+    changed, history = sync._detect_watch_changes(
+        file_hashes, {}, {}, mcp_hashes, {}, check_history=False, skip={"mcp"}
+    )
+    assert changed == ["rules"]
+    assert history == []
+    assert mcp_hashes == {}
+
+    changed, _ = sync._detect_watch_changes(file_hashes, {}, {}, mcp_hashes, {}, check_history=False)
+    assert changed == ["mcp"]
+    assert mcp_hashes == {tmp_path / "mcp.json": "new"}
+
+
+def test_control_socket_routes_sync_and_status_to_daemon(monkeypatch, tmp_path):
+    """CLI sync requests run on the daemon's executor; status comes from watch state."""
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("needs Unix sockets")
+    sync = AgentRulesSync()
+    sync.config_dir = tmp_path
+    sync.agents = {"claude": {"name": "Claude Code", "path": tmp_path / "CLAUDE.md"}}
+    monkeypatch.setattr(sync, "_cursorrules_watch_pairs", lambda: [])
+    monkeypatch.setattr(sync, "_refresh_component_watch_state", lambda *args: None)
+    ran = []
+    monkeypatch.setattr(sync, "sync", lambda components=None: ran.append(components))
+    watch_state = ({}, {}, {}, {}, {})
+
+    server = sync._start_control_server(watch_state)
+    try:
+        response = send_control_request(tmp_path, {"cmd": "sync", "scopes": ["mcp", "rules"]})
+        assert response == {"ok": True, "components": ["rules", "mcp"]}
+        assert sorted(ran) == [["mcp"], ["rules"]]
+
+        status = send_control_request(tmp_path, {"cmd": "status"})["status"]
+        assert status["agents"]["claude"]["state"] == "missing"
+        assert set(status["last_sync"]) == {"rules", "mcp"}
+    finally:
+        server.close()
+        sync._sync_executor.shutdown()
+
+
+STARTUP_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import agent_rules_sync
+syncer = agent_rules_sync.AgentRulesSync()
+daemon_only = ["agent_sync_executor", "agent_control", "agent_metrics", "agent_trace",
+               "agent_sync_lock"]
+constructed = [m for m in daemon_only if m in sys.modules]
+syncer.sync(components=["rules"])
+elapsed_ms = (time.perf_counter() - started) * 1000
+heavy = ["agent_skills_sync", "agent_settings_sync", "agent_mcp_sync", "agent_history_sync",
+         "agent_inotify", "agent_watch_planner", "agent_sync_executor", "agent_control",
+         "toml", "http.server", "argparse", "subprocess"]
+built = ["skills_sync", "mcp_sync", "settings_sync", "history_sync"]
+print(json.dumps({
+    "constructed": constructed,
+    "loaded": [m for m in heavy if m in sys.modules],
+    "built": [name for name in built if name in syncer.__dict__],
+    "elapsed_ms": elapsed_ms,
+}))
+"""
+
+# Import plus a rules sync; generous so a loaded CI machine stays well under it.
+STARTUP_BUDGET_MS = 250
+STARTUP_RUNS = 3
+
+
+def _run_startup_probe(tmp_path):
+    env = dict(os.environ, HOME=str(tmp_path))
+    repo_root = Path(__file__).resolve().parent.parent
+    out = subprocess.run(
+        [sys.executable, "-c", STARTUP_PROBE],
+        cwd=repo_root, env=env, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def test_rules_scoped_sync_skips_sub_syncers_and_daemon_imports(tmp_path):
+    """Scoped commands must not pay for sub-syncers or daemon-only imports."""
+    result = _run_startup_probe(tmp_path)
+    assert result["constructed"] == []
+    assert result["loaded"] == []
+    assert result["built"] == []
+
+
+def test_rules_scoped_sync_startup_budget(tmp_path):
+    """Best of a few fresh interpreters, so one slow run does not fail the suite."""
+    best = min(_run_startup_probe(tmp_path)["elapsed_ms"] for _ in range(STARTUP_RUNS))
+    assert best < STARTUP_BUDGET_MS
+
+
+def test_watch_components_match_snapshot_order():
+    import agent_rules_sync
+    import agent_watch_snapshot
+
+    assert agent_rules_sync.WATCH_COMPONENTS == agent_watch_snapshot.WATCH_COMPONENTS
+
+
+def test_sub_syncers_are_built_on_first_use(tmp_path):
+    sync = AgentRulesSync()
+    sync.config_dir = tmp_path
+    assert "skills_sync" not in sync.__dict__
+    assert sync.mcp_sync.config_dir == tmp_path
+
+    sync.config_dir = tmp_path / "moved"
+    sync.sync(components=[])
+    assert "mcp_sync" not in sync.__dict__
+    assert sync.mcp_sync.config_dir == tmp_path / "moved"
@@ -0,0 +1,47 @@
+"""Tests for the cached skill catalog."""
+
+import os
+
+from agent_skill_catalog import SkillCatalog, parse_frontmatter
+
+
+def _write_skill(base, name, extra=""):
+    skill = base / name
+    skill.mkdir(parents=True, exist_ok=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: d\n{extra}---\nbody\n")
+    return skill
+
+
+def test_parse_frontmatter_fields_and_block_lists():
+    valid, fields = parse_frontmatter(
+        "---\nname: demo\ndescription: >\n  folded\ntags:\n  - python\n  - 'web'\n---\n"
+    )
+    assert valid
+    assert fields["name"] == "demo"
+    assert fields["tags"] == ["python", "web"]
+    assert parse_frontmatter("---\nname: demo\n---\n")[0] is False
+    assert parse_frontmatter("no frontmatter")[0] is False
+
+
+def test_listing_and_skill_md_are_read_once_until_they_change(tmp_path):
+    _write_skill(tmp_path, "alpha")
+    _write_skill(tmp_path, "beta")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / "invalid").mkdir()
+    catalog = SkillCatalog()
+
+    assert set(catalog.skills(tmp_path)) == {"alpha", "beta"}
+    assert set(catalog.skills(tmp_path)) == {"alpha", "beta"}
+    assert (catalog.scans, catalog.reads) == (1, 2)
+
+    skill_md = tmp_path / "alpha" / "SKILL.md"
+    skill_md.write_text("---\nname: alpha\ndescription: ''\n---\n")
+    assert set(catalog.skills(tmp_path)) == {"beta"}
+    assert (catalog.scans, catalog.reads) == (1, 3)
+
+    _write_skill(tmp_path, "gamma")
+    st = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert set(catalog.skills(tmp_path)) == {"beta", "gamma"}
+    assert catalog.scans == 2
+    assert catalog.entry(tmp_path / "gamma").mtime == (tmp_path / "gamma" / "SKILL.md").stat().st_mtime
@@ -0,0 +1,91 @@
+"""Tests for file-level delta copies of skills."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+import agent_skill_delta
+from agent_skill_delta import apply_delta, journal_path, recover
+from agent_skill_manifest import SkillManifests
+
+
+def _skill(base):
+    skill = base / "demo"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: demo\ndescription: d\n---\nv1")
+    (skill / "scripts" / "run.sh").write_text("echo hi")
+    (skill / "scripts" / "old.sh").write_text("echo old")
+    return skill
+
+
+def _delta(tmp_path, src, dst):
+    manifests = SkillManifests(tmp_path)
+    return apply_delta(src, dst, manifests.manifest(src), manifests.manifest(dst))
+
+
+def test_only_changed_files_are_written(tmp_path):
+    src = _skill(tmp_path / "src")
+    dst = tmp_path / "dst" / "demo"
+    shutil.copytree(src, dst)
+    untouched = os.stat(dst / "scripts" / "run.sh").st_ino
+
+    (src / "SKILL.md").write_text("---\nname: demo\ndescription: d\n---\nv2")
+    (src / "scripts" / "old.sh").unlink()
+    (src / "assets").mkdir()
+    (src / "assets" / "new.txt").write_text("new")
+    result = _delta(tmp_path, src, dst)
+
+    assert result.changed == ["SKILL.md", "assets/new.txt"]
+    assert result.removed == ["scripts/old.sh"]
+    assert (dst / "SKILL.md").read_text().endswith("v2")
+    assert (dst / "assets" / "new.txt").read_text() == "new"
+    assert not (dst / "scripts" / "old.sh").exists()
+    assert os.stat(dst / "scripts" / "run.sh").st_ino == untouched
+    assert sorted(p.name for p in dst.rglob(".*")) == []
+    assert not journal_path(dst).exists()
+
+
+def test_failed_commit_rolls_back(tmp_path, monkeypatch):
+    src = _skill(tmp_path / "src")
+    dst = tmp_path / "dst" / "demo"
+    shutil.copytree(src, dst)
+    (src / "SKILL.md").write_text("---\nname: demo\ndescription: d\n---\nv2")
+    (src / "scripts" / "run.sh").write_text("echo changed")
+    (src / "scripts" / "old.sh").unlink()
+
+    real_replace = os.replace
+    calls = []
+
+    def flaky_replace(a, b):
+        calls.append(a)
+        if len(calls) == 4:
+            raise OSError("disk full")
+        return real_replace(a, b)
+
+    monkeypatch.setattr(agent_skill_delta.os, "replace", flaky_replace)
+    with pytest.raises(OSError):
+        _delta(tmp_path, src, dst)
+    monkeypatch.setattr(agent_skill_delta.os, "replace", real_replace)
+
+    assert (dst / "SKILL.md").read_text().endswith("v1")
+    assert (dst / "scripts" / "run.sh").read_text() == "echo hi"
+    assert (dst / "scripts" / "old.sh").read_text() == "echo old"
+    assert sorted(p.name for p in dst.rglob(".*")) == []
+    assert not journal_path(dst).exists()
+
+
+def test_recover_undoes_interrupted_commit(tmp_path):
+    dst = _skill(tmp_path / "dst")
+    # State after "SKILL.md" was moved aside and its replacement renamed in.
+    os.replace(dst / "SKILL.md", dst / ".SKILL.md.old-sync")
+    (dst / "SKILL.md").write_text("new")
+    (dst / "scripts" / ".added.sh.tmp-sync").write_text("staged")
+    journal_path(dst).write_text(json.dumps([["replace", "SKILL.md"], ["add", "scripts/added.sh"]]))
+
+    assert recover(dst)
+    assert (dst / "SKILL.md").read_text().endswith("v1")
+    assert not (dst / "scripts" / "added.sh").exists()
+    assert sorted(p.name for p in dst.rglob(".*")) == []
+    assert not recover(dst)
@@ -0,0 +1,96 @@
+"""Tests for persisted skill manifests."""
+
+import os
+import shutil
+
+from agent_skill_manifest import SkillManifests
+
+
+def _skill(base, name, body="body"):
+    skill = base / name
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text(f"---\nname: {name}\ndescription: d\n---\n{body}")
+    (skill / "scripts" / "run.sh").write_text("echo hi")
+    return skill
+
+
+def test_matches_compares_contents_and_layout(tmp_path):
+    src = _skill(tmp_path / "a", "demo")
+    dst = _skill(tmp_path / "b", "demo")
+    (dst / ".git").mkdir()
+    (dst / ".git" / "HEAD").write_text("ignored")
+    manifests = SkillManifests(tmp_path)
+    assert manifests.matches(src, dst)
+
+    (dst / "scripts" / "run.sh").write_text("echo ho")
+    assert not manifests.matches(src, dst)
+    (dst / "scripts" / "run.sh").write_text("echo hi")
+    (dst / "extra.txt").write_text("x")
+    assert not manifests.matches(src, dst)
+    assert not manifests.matches(src, tmp_path / "missing")
+
+
+def test_unchanged_files_are_not_reread_across_restarts(tmp_path):
+    src = _skill(tmp_path / "a", "demo")
+    dst = tmp_path / "b" / "demo"
+    shutil.copytree(src, dst)
+    manifests = SkillManifests(tmp_path)
+    manifests.seed(dst, src)
+    assert manifests.matches(src, dst)
+    assert manifests.files_read == 2
+    manifests.flush(force=True)
+
+    reloaded = SkillManifests(tmp_path)
+    assert reloaded.matches(src, dst)
+    assert reloaded.files_read == 0
+
+    skill_md = src / "SKILL.md"
+    skill_md.write_text(skill_md.read_text() + "\nmore")
+    assert not reloaded.matches(src, dst)
+    assert reloaded.files_read == 1
+
+
+def test_symlinks_compare_by_target(tmp_path):
+    src = _skill(tmp_path / "a", "demo")
+    dst = tmp_path / "b" / "demo"
+    os.symlink("scripts/run.sh", src / "link")
+    shutil.copytree(src, dst, symlinks=True)
+    manifests = SkillManifests(tmp_path)
+    assert manifests.matches(src, dst)
+    os.remove(dst / "link")
+    os.symlink("SKILL.md", dst / "link")
+    assert not manifests.matches(src, dst)
+
+
+def test_known_match_reads_no_contents(tmp_path):
+    src = _skill(tmp_path / "a", "demo")
+    dst = tmp_path / "b" / "demo"
+    shutil.copytree(src, dst)
+    manifests = SkillManifests(tmp_path)
+    assert manifests.matches(src, dst)
+    assert manifests.known_match(src, dst) is True
+    files_read = manifests.files_read
+
+    run = dst / "scripts" / "run.sh"
+    run.write_text("echo ho")
+    os.utime(run, ns=(1, 1))
+    assert manifests.known_match(src, dst) is None
+    run.write_text("echo hello")
+    assert manifests.known_match(src, dst) is False
+    assert manifests.known_match(src, tmp_path / "missing") is False
+    assert manifests.files_read == files_read
+
+
+def test_flush_does_not_touch_another_writers_temp_file(tmp_path):
+    config = tmp_path / "config"
+    config.mkdir()
+    src = _skill(tmp_path / "a", "demo")
+    other = config / "skill_manifests.json.tmp"
+    other.write_text("another process, mid-write")
+    manifests = SkillManifests(config)
+    manifests.manifest(src)
+    manifests.flush(force=True)
+
+    assert other.read_text() == "another process, mid-write"
+    assert sorted(p.name for p in config.iterdir()) == ["skill_manifests.json", other.name]
+    assert SkillManifests(config).cached_manifest(src) == manifests.manifest(src)
@@ -0,0 +1,41 @@
+"""Tests for reflink/hardlink/copy materialization of skill files."""
+
+import os
+
+from agent_skill_materialize import materialize_file
+from agent_skill_manifest import SkillManifests
+
+
+def test_modes_fall_back_to_copy(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("payload")
+
+    assert materialize_file(src, tmp_path / "copy.txt", "copy") == "copy"
+    assert os.stat(tmp_path / "copy.txt").st_ino != os.stat(src).st_ino
+
+    assert materialize_file(src, tmp_path / "linked.txt", "hardlink") == "hardlink"
+    assert os.stat(tmp_path / "linked.txt").st_ino == os.stat(src).st_ino
+
+    method = materialize_file(src, tmp_path / "cloned.txt", "reflink")
+    assert method in ("reflink", "copy")
+    assert (tmp_path / "cloned.txt").read_text() == "payload"
+    assert (tmp_path / "cloned.txt").stat().st_mtime_ns == src.stat().st_mtime_ns
+
+
+def test_hardlinked_skill_files_are_digested_once(tmp_path):
+    a = tmp_path / "a" / "demo"
+    b = tmp_path / "b" / "demo"
+    a.mkdir(parents=True)
+    b.mkdir(parents=True)
+    (a / "SKILL.md").write_text("shared")
+    os.link(a / "SKILL.md", b / "SKILL.md")
+
+    manifests = SkillManifests(tmp_path)
+    assert manifests.matches(a, b)
+    assert manifests.files_read == 1
+
+    # An in-place edit through one link shows up in both directories.
+    with open(b / "SKILL.md", "a") as f:
+        f.write(" edit")
+    assert manifests.manifest(a)["SKILL.md"][2] == manifests.manifest(b)["SKILL.md"][2]
+    assert manifests.files_read == 2
@@ -0,0 +1,52 @@
+"""Tests for cached skill watch tokens."""
+
+import os
+
+from agent_skill_watch import SkillWatchTokens
+
+
+def _skill(tmp_path):
+    skill = tmp_path / "demo"
+    (skill / "scripts").mkdir(parents=True)
+    (skill / "SKILL.md").write_text("---\nname: demo\ndescription: d\n---\n")
+    (skill / "scripts" / "run.sh").write_text("echo hi")
+    return skill
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_token_is_reused_until_a_directory_or_skill_md_moves(tmp_path):
+    skill = _skill(tmp_path)
+    tokens = SkillWatchTokens()
+    first = tokens.token(skill)
+    assert tokens.token(skill) == first
+    assert tokens.walks == 1
+
+    (skill / "scripts" / "new.sh").write_text("echo new")
+    _bump_mtime(skill / "scripts")
+    second = tokens.token(skill)
+    assert second != first
+    assert tokens.walks == 2
+
+    with open(skill / "SKILL.md", "a") as f:
+        f.write("more\n")
+    _bump_mtime(skill / "SKILL.md")
+    assert tokens.token(skill) != second
+    assert tokens.walks == 3
+
+
+def test_in_place_edits_are_caught_by_the_full_rescan(tmp_path):
+    skill = _skill(tmp_path)
+    tokens = SkillWatchTokens(full_rescan_seconds=0)
+    first = tokens.token(skill)
+    with open(skill / "scripts" / "run.sh", "a") as f:
+        f.write(" && echo more")
+    assert tokens.token(skill) != first
+
+
+def test_missing_skill_has_no_token(tmp_path):
+    tokens = SkillWatchTokens()
+    assert tokens.token(tmp_path / "missing") is None
@@ -197,6 +197,27 @@ def test_sync_removes_excluded_skill_from_target():
         assert any("Excluded canvas from codex" in line for line in logs)
 
 
+def test_pattern_excludes_only_remove_valid_skill_dirs(tmp_path):
+    """A broad pattern never deletes staged copies, journals or non-skill entries."""
+    config = tmp_path / "config"
+    config.mkdir()
+    (config / "excludes.json").write_text(json.dumps({"skills": {"agents": {"dst": ["re:.*"]}}}))
+    dst_skills = tmp_path / "dst" / "skills"
+    sync = AgentSkillsSync(config_dir=config)
+    sync.frameworks = {"dst": {"name": "Dst", "path": dst_skills, "description": ""}}
+    _create_skill(dst_skills, "drafted")
+    _create_skill(dst_skills, ".drafted.tmp-sync")
+    (dst_skills / ".drafted.sync-journal").write_text("[]")
+    (dst_skills / "notes").mkdir()
+    (dst_skills / "README.md").write_text("not a skill")
+
+    sync.sync(backup_before_write=False, direction="push")
+
+    assert sorted(p.name for p in dst_skills.iterdir()) == [
+        ".drafted.sync-journal", ".drafted.tmp-sync", "README.md", "notes",
+    ]
+
+
 def test_repo_local_excludes_remove_repo_skill():
     """Repo-local excludes apply to repo skill targets."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -306,6 +327,128 @@ def test_sync_skips_identical_skill_without_backup():
         assert not any(sync.backup_dir.iterdir())
 
 
+def test_sync_updates_existing_target_with_delta_copy(tmp_path):
+    """Only the edited file is rewritten in an existing target skill."""
+    dst_skills = tmp_path / "dst" / "skills"
+    sync = AgentSkillsSync(config_dir=tmp_path / "config")
+    sync.frameworks = {"dst": {"name": "Dst", "path": dst_skills, "description": ""}}
+    skill = _create_skill(sync.master_skills_dir, "big-skill", "v1")
+    (skill / "assets").mkdir()
+    (skill / "assets" / "blob.bin").write_bytes(b"x" * 4096)
+    sync.sync(backup_before_write=False, direction="push")
+    blob_inode = (dst_skills / "big-skill" / "assets" / "blob.bin").stat().st_ino
+
+    _create_skill(sync.master_skills_dir, "big-skill", "v2")
+    logs = []
+    sync.sync(log_callback=logs.append, backup_before_write=False, direction="push")
+
+    assert any("Updated big-skill" in line and "1 changed" in line for line in logs)
+    assert "v2" in (dst_skills / "big-skill" / "SKILL.md").read_text()
+    assert (dst_skills / "big-skill" / "assets" / "blob.bin").stat().st_ino == blob_inode
+
+
+def test_materialize_mode_with_per_target_opt_out(tmp_path):
+    """Hardlink targets share master inodes; an opted-out target gets a copy."""
+    config = tmp_path / "config"
+    config.mkdir()
+    (config / "sync_config.json").write_text(json.dumps({
+        "skill_options": {"materialize": "hardlink"},
+        "skill_targets": {"copied": {"materialize": "copy"}},
+    }))
+    sync = AgentSkillsSync(config_dir=config)
+    sync.frameworks = {
+        "linked": {"name": "Linked", "path": tmp_path / "linked", "description": ""},
+        "copied": {"name": "Copied", "path": tmp_path / "copied", "description": ""},
+    }
+    master = _create_skill(sync.master_skills_dir, "shared-skill")
+    sync.sync(backup_before_write=False, direction="push")
+
+    master_inode = (master / "SKILL.md").stat().st_ino
+    assert (tmp_path / "linked" / "shared-skill" / "SKILL.md").stat().st_ino == master_inode
+    assert (tmp_path / "copied" / "shared-skill" / "SKILL.md").stat().st_ino != master_inode
+
+
+def test_parallel_sync_logs_in_sequential_order(tmp_path):
+    """Worker threads don't change what is written or the order it is logged."""
+    config = tmp_path / "config"
+    config.mkdir()
+    (config / "sync_config.json").write_text(json.dumps({"skill_options": {"workers": 4}}))
+    sync = AgentSkillsSync(config_dir=config)
+    assert sync.sync_config.skill_option("workers") == 4
+    targets = ["t1", "t2", "t3"]
+    sync.frameworks = {
+        fw_id: {"name": fw_id, "path": tmp_path / fw_id, "description": ""} for fw_id in targets
+    }
+    skills = [f"skill-{i:02d}" for i in range(12)]
+    for name in skills:
+        _create_skill(sync.master_skills_dir, name)
+
+    logs = []
+    sync.sync(log_callback=logs.append, backup_before_write=False, direction="push")
+
+    assert logs == [
+        f"Copied {name} -> {tmp_path / fw_id / name}" for name in skills for fw_id in targets
+    ]
+
+
+def test_targets_aliasing_one_directory_are_applied_by_one_task(tmp_path, monkeypatch):
+    """A symlinked or duplicated target never has two workers copying into it."""
+    real = tmp_path / "real" / "skills"
+    real.mkdir(parents=True)
+    alias = tmp_path / "alias"
+    alias.symlink_to(real, target_is_directory=True)
+    sync = AgentSkillsSync(config_dir=tmp_path / "config")
+    sync.frameworks = {
+        "real": {"name": "Real", "path": real, "description": ""},
+        "alias": {"name": "Alias", "path": alias, "description": ""},
+        "twice": {"name": "Twice", "path": real, "description": ""},
+    }
+    skills = [f"skill-{i}" for i in range(4)]
+    for name in skills:
+        _create_skill(sync.master_skills_dir, name)
+
+    task_counts = []
+    run_skill_tasks = sync._run_skill_tasks
+
+    def counting(tasks, workers, log):
+        task_counts.append(len(tasks))
+        return run_skill_tasks(tasks, workers, log)
+
+    monkeypatch.setattr(sync, "_run_skill_tasks", counting)
+    logs = []
+    sync.sync(log_callback=logs.append, backup_before_write=False, direction="push")
+
+    assert task_counts[-1] == len(skills)
+    assert sorted(p.name for p in real.iterdir()) == skills
+    assert sum(line.startswith("Copied") for line in logs) == len(skills)
+
+
+def test_repo_subscription_limits_fan_out_and_scanning(tmp_path):
+    """A repo with a subscribe list only receives and is only scanned for matching skills."""
+    config = tmp_path / "config"
+    config.mkdir()
+    (config / "sync_config.json").write_text(json.dumps({
+        "skill_targets": {"repo:app": {"subscribe": ["keep-*", "tag:python"]}},
+    }))
+    repo_skills = tmp_path / "app" / ".claude" / "skills"
+    sync = AgentSkillsSync(config_dir=config)
+    sync.frameworks = {
+        "repo:app": {"name": "Repo: app", "path": repo_skills, "description": ""},
+    }
+    _create_skill(sync.master_skills_dir, "keep-a")
+    _create_skill(sync.master_skills_dir, "other")
+    tagged = _create_skill(sync.master_skills_dir, "py-helper")
+    (tagged / "SKILL.md").write_text("---\nname: py-helper\ndescription: d\ntags: [python, cli]\n---\n")
+    local = _create_skill(repo_skills, "local-only")
+
+    sync.sync(backup_before_write=False)
+
+    assert sorted(p.name for p in repo_skills.iterdir()) == ["keep-a", "local-only", "py-helper"]
+    assert not (sync.master_skills_dir / "local-only").exists()
+    assert local not in sync.get_watch_paths_and_hashes()
+    assert str(local / "SKILL.md") not in sync.catalog._parsed
+
+
 def test_backup_skips_duplicate_skill_snapshot():
     """Duplicate destination snapshot should not create another backup before overwrite."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -343,6 +486,20 @@ def test_backup_skips_duplicate_skill_snapshot():
         assert (dst_skills / "dup-skill" / "SKILL.md").read_text().find("source v2") != -1
 
 
+def test_missing_backup_index_is_rebuilt_on_startup(tmp_path):
+    cfg = tmp_path / "config"
+    sync = AgentSkillsSync(config_dir=cfg)
+    backup = sync.backup_dir / "claude_demo_20260101_120000"
+    _create_skill(sync.backup_dir, backup.name, "old")
+    (cfg / "skill_backup_index.json").unlink(missing_ok=True)
+
+    restarted = AgentSkillsSync(config_dir=cfg)
+    restarted.backup_index._rebuild.join()
+    skill_hash = restarted._skill_dir_content_hash(backup)
+    assert restarted.backup_index.hashes("claude", "demo") == {skill_hash}
+    assert (cfg / "skill_backup_index.json").exists()
+
+
 def test_skills_changed_detection():
     """Change detection works for skill modifications."""
     with tempfile.TemporaryDirectory() as tmpdir:
@@ -449,3 +606,38 @@ def test_sync_creates_antigravity_cli_plugin(monkeypatch, tmp_path):
     plugin_dir = home / ".gemini" / "antigravity-cli" / "plugins" / "agent-rules-sync"
     assert (plugin_dir / "plugin.json").exists()
     assert (plugin_dir / "skills" / "cli-skill" / "SKILL.md").exists()
+
+
+def test_plan_lists_operations_without_applying_them(tmp_path):
+    """plan() reports copies, backups and removals; apply() carries them out."""
+    config = tmp_path / "config"
+    config.mkdir()
+    (config / "excludes.json").write_text(json.dumps({"skills": {"agents": {"dst": ["old-skill"]}}}))
+    dst_skills = tmp_path / "dst" / "skills"
+    sync = AgentSkillsSync(config_dir=config)
+    sync.frameworks = {"dst": {"name": "Dst", "path": dst_skills, "description": ""}}
+    _create_skill(sync.master_skills_dir, "same")
+    _create_skill(sync.master_skills_dir, "edited", "v1")
+    sync.sync(backup_before_write=False, direction="push")
+    _create_skill(sync.master_skills_dir, "edited", "v2 longer")
+    _create_skill(sync.master_skills_dir, "new")
+    _create_skill(dst_skills, "old-skill")
+
+    plan = sync.plan(direction="push")
+    ops = [(op.phase, op.action, op.skill, op.reason) for op in plan.ops]
+    assert ops == [
+        ("exclude", "backup", "old-skill", ""),
+        ("exclude", "remove", "old-skill", ""),
+        ("fan-out", "backup", "edited", ""),
+        ("fan-out", "copy", "edited", "differs"),
+        ("fan-out", "copy", "new", "missing"),
+    ]
+    assert "v1" in (dst_skills / "edited" / "SKILL.md").read_text()
+    assert (dst_skills / "old-skill").exists()
+    assert plan.format()[-1] == "2 copy, 1 remove, 2 backup (direction: push)"
+
+    sync.apply(plan)
+    assert "v2" in (dst_skills / "edited" / "SKILL.md").read_text()
+    assert (dst_skills / "new" / "SKILL.md").exists()
+    assert not (dst_skills / "old-skill").exists()
+    assert not sync.plan(direction="push")
@@ -0,0 +1,79 @@
+"""Tests for the shared stat-signature cache."""
+
+import os
+
+from agent_stat_cache import StatSignatureCache, stat_signature
+
+
+def test_compute_runs_only_when_signature_moves(tmp_path):
+    path = tmp_path / "RULES.md"
+    path.write_text("one")
+    cache = StatSignatureCache()
+    calls = []
+
+    def compute(p):
+        calls.append(p)
+        return p.read_text()
+
+    assert cache.get("content", path, compute) == "one"
+    assert cache.get("content", path, compute) == "one"
+    assert len(calls) == 1
+
+    path.write_text("two!")
+    assert cache.get("content", path, compute) == "two!"
+    assert len(calls) == 2
+
+
+def test_token_and_namespace_are_part_of_the_key(tmp_path):
+    path = tmp_path / "mcp.json"
+    path.write_text("{}")
+    cache = StatSignatureCache()
+    calls = []
+    compute = lambda p: calls.append(p) or len(calls)
+
+    cache.get("a", path, compute, token=frozenset())
+    cache.get("a", path, compute, token=frozenset())
+    cache.get("a", path, compute, token=frozenset({"skip"}))
+    cache.get("b", path, compute)
+    assert len(calls) == 3
+
+
+def test_missing_path_returns_none_and_drops_entry(tmp_path):
+    path = tmp_path / "gone.json"
+    cache = StatSignatureCache()
+    assert cache.get("x", path, lambda p: "never") is None
+
+    path.write_text("x")
+    cache.get("x", path, lambda p: "value")
+    assert len(cache) == 1
+    os.remove(path)
+    assert cache.get("x", path, lambda p: "value") is None
+    assert len(cache) == 0
+
+
+def test_stat_signature_changes_on_replace(tmp_path):
+    path = tmp_path / "file"
+    path.write_text("same")
+    before = stat_signature(path)
+    replacement = tmp_path / "file.tmp"
+    replacement.write_text("same")
+    os.replace(replacement, path)
+    assert stat_signature(path) != before
+
+
+def test_export_and_seed_skip_recompute_for_unchanged_files(tmp_path):
+    path = tmp_path / "rules.md"
+    path.write_text("rules")
+    cache = StatSignatureCache()
+    cache.get("sha256", path, lambda p: "digest")
+    cache.get("parsed", path, lambda p: {"not": "exported"})
+    cache.get("sha256", tmp_path, lambda p: "tokened", token=frozenset({"x"}))
+    rows = cache.export(("sha256", "parsed"))
+    assert rows == [["sha256", str(path), list(stat_signature(path)), "digest"]]
+
+    restored = StatSignatureCache()
+    restored.seed(rows)
+    assert restored.get("sha256", path, lambda p: "recomputed") == "digest"
+
+    path.write_text("changed rules")
+    assert restored.get("sha256", path, lambda p: "recomputed") == "recomputed"
@@ -78,3 +78,46 @@ def test_load_config_merges_skill_target_overrides(tmp_path):
     assert cfg.skill_target_enabled("new-target") is True
     assert cfg.skill_target_enabled("custom") is False
     assert cfg.skill_target_configs()["custom"]["path"] == "~/custom/skills"
+
+
+def test_load_config_validates_skill_options(tmp_path):
+    assert load_config(tmp_path).skill_option("copy_mode") == "delta"
+
+    (tmp_path / "sync_config.json").write_text(json.dumps({"skill_options": {"copy_mode": "full"}}))
+    assert load_config(tmp_path).skill_option("copy_mode") == "full"
+
+    (tmp_path / "sync_config.json").write_text(json.dumps({"skill_options": {"copy_mode": "rsync"}}))
+    assert load_config(tmp_path).skill_option("copy_mode") == "delta"
+
+
+def test_skill_materialize_mode_per_target_override(tmp_path):
+    (tmp_path / "sync_config.json").write_text(json.dumps({
+        "skill_options": {"materialize": "auto"},
+        "skill_targets": {"claude": {"materialize": "copy"}, "codex": {"materialize": "bogus"}},
+    }))
+    cfg = load_config(tmp_path)
+
+    assert cfg.skill_materialize_mode("claude") == "copy"
+    assert cfg.skill_materialize_mode("codex") == "auto"
+    assert cfg.skill_materialize_mode("master") == "auto"
+
+
+def test_skill_workers_option_must_be_a_small_int(tmp_path):
+    for value, expected in ((8, 8), (0, 4), (True, 4), ("8", 4), (100, 4)):
+        (tmp_path / "sync_config.json").write_text(json.dumps({"skill_options": {"workers": value}}))
+        assert load_config(tmp_path).skill_option("workers") == expected
+
+
+def test_skill_subscription_falls_back_to_repo_wildcard(tmp_path):
+    (tmp_path / "sync_config.json").write_text(json.dumps({
+        "skill_targets": {
+            "repo:app": {"subscribe": ["review"]},
+            "repo:*": {"subscribe": ["tag:shared"]},
+            "claude": {"subscribe": "not-a-list"},
+        },
+    }))
+    cfg = load_config(tmp_path)
+
+    assert cfg.skill_subscription("repo:app") == ["review"]
+    assert cfg.skill_subscription("repo:other") == ["tag:shared"]
+    assert cfg.skill_subscription("claude") is None
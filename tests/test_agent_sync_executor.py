@@ -0,0 +1,75 @@
+import threading
+
+from agent_sync_executor import ComponentSyncExecutor
+
+
+def _blocking_runner():
+    gate = threading.Event()
+    started = threading.Event()
+    runs = []
+
+    def run(component, items):
+        runs.append((component, items))
+        if component == "block":
+            started.set()
+            gate.wait(5)
+
+    return run, gate, started, runs
+
+
+def test_pending_components_run_in_priority_order():
+    run, gate, started, runs = _blocking_runner()
+    executor = ComponentSyncExecutor(run, max_workers=1, priorities={
+        "block": 0, "rules": 0, "mcp": 0, "skills": 1, "history": 2,
+    })
+    executor.submit("block")
+    assert started.wait(5)
+
+    executor.submit("history", ["a.jsonl"])
+    executor.submit("skills")
+    executor.submit("mcp")
+    gate.set()
+    assert executor.wait_idle(5)
+    executor.shutdown()
+
+    assert [component for component, _ in runs] == ["block", "mcp", "skills", "history"]
+
+
+def test_repeated_submits_coalesce_and_merge_items():
+    run, gate, started, runs = _blocking_runner()
+    executor = ComponentSyncExecutor(run, max_workers=2)
+    executor.submit("block")
+    assert started.wait(5)
+
+    # "block" is running: two more requests collapse into one follow-up run.
+    executor.submit("block")
+    executor.submit("block")
+    executor.submit("history", ["a", "b"])
+    executor.submit("history", ["b", "c"])
+    assert "block" in executor.busy()
+    gate.set()
+    assert executor.wait_idle(5)
+    executor.shutdown()
+
+    assert [c for c, _ in runs].count("block") == 2
+    history_runs = [items for c, items in runs if c == "history"]
+    assert sum(history_runs, []) == ["a", "b", "c"]
+
+
+def test_failures_reach_on_complete_and_shutdown_drains_pending():
+    completed = []
+
+    def run(component, items):
+        if component == "mcp":
+            raise RuntimeError("boom")
+
+    executor = ComponentSyncExecutor(
+        run, on_complete=lambda c, items, error: completed.append((c, repr(error))), max_workers=1
+    )
+    mcp_done = executor.submit("mcp")
+    executor.submit("rules")
+    assert mcp_done.wait(5)
+    executor.shutdown()
+
+    assert sorted(completed) == [("mcp", "RuntimeError('boom')"), ("rules", "None")]
+    assert executor.submit("rules") is None
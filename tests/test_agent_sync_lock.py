@@ -0,0 +1,79 @@
+import json
+import os
+import threading
+import time
+
+import pytest
+
+import agent_sync_lock
+from agent_sync_lock import SyncLockManager
+
+
+def _requested(tmp_path):
+    raw = (tmp_path / "locks" / "rules.meta").read_text()
+    return json.loads(raw)["requested"] if raw else 0
+
+
+def test_waiters_covered_by_a_later_run_skip_their_pass(tmp_path):
+    locks = SyncLockManager(tmp_path)
+    first_running = threading.Event()
+    release_first = threading.Event()
+    runs = []
+
+    def first():
+        runs.append("first")
+        first_running.set()
+        release_first.wait(5)
+
+    results = {}
+    holder = threading.Thread(target=lambda: results.setdefault("a", locks.run_coalesced("rules", first)))
+    holder.start()
+    assert first_running.wait(5)
+
+    # Both waiters ask while "first" is in flight, so one later run covers both.
+    waiters = [
+        threading.Thread(target=lambda n=n: results.setdefault(n, locks.run_coalesced("rules", lambda: runs.append(n))))
+        for n in ("b", "c")
+    ]
+    for waiter in waiters:
+        waiter.start()
+    deadline = time.monotonic() + 5
+    while _requested(tmp_path) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release_first.set()
+    for thread in [holder, *waiters]:
+        thread.join(5)
+
+    assert len(runs) == 2
+    assert sorted(results.values()) == [False, True, True]
+
+
+def test_failed_run_does_not_cover_later_requests(tmp_path):
+    locks = SyncLockManager(tmp_path)
+
+    def boom():
+        raise RuntimeError("disk full")
+
+    with pytest.raises(RuntimeError):
+        locks.run_coalesced("mcp", boom)
+    ran = []
+    assert locks.run_coalesced("mcp", lambda: ran.append(True)) is True
+    assert ran == [True]
+
+
+@pytest.mark.skipif(agent_sync_lock.fcntl is None, reason="needs fcntl")
+def test_hold_is_an_flock_visible_to_other_descriptors(tmp_path):
+    fcntl = agent_sync_lock.fcntl
+    locks = SyncLockManager(tmp_path)
+    with locks.hold("skills"):
+        fd = os.open(str(tmp_path / "locks" / "skills.lock"), os.O_RDWR)
+        try:
+            with pytest.raises(BlockingIOError):
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        finally:
+            os.close(fd)
+    fd = os.open(str(tmp_path / "locks" / "skills.lock"), os.O_RDWR)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    finally:
+        os.close(fd)
@@ -0,0 +1,59 @@
+import json
+
+import agent_trace
+from agent_trace import Tracer, configure_tracing, span, summarize_trace, trace_files, traced
+
+
+def _records(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_spans_record_parent_and_duration(monkeypatch, tmp_path):
+    monkeypatch.setattr(agent_trace, "_tracer", Tracer(tmp_path / "trace.jsonl"))
+
+    @traced("sync.rules")
+    def run():
+        with span("sync.rules.writes", files=2):
+            pass
+
+    run()
+    inner, outer = _records(tmp_path / "trace.jsonl")
+    assert inner["name"] == "sync.rules.writes"
+    assert inner["parent"] == "sync.rules"
+    assert inner["attrs"] == {"files": 2}
+    assert outer["parent"] is None
+    assert outer["ms"] >= inner["ms"]
+
+
+def test_trace_file_rotates_and_summary_reads_all_segments(monkeypatch, tmp_path):
+    tracer = Tracer(tmp_path / "trace.jsonl", max_bytes=200, backup_count=2)
+    monkeypatch.setattr(agent_trace, "_tracer", tracer)
+    for _ in range(12):
+        with span("step"):
+            pass
+
+    files = trace_files(tmp_path)
+    assert [p.name for p in files] == ["trace.jsonl.2", "trace.jsonl.1", "trace.jsonl"]
+    summary = summarize_trace(files)
+    assert 0 < summary["step"]["count"] < 12  # oldest segment was rotated away
+
+
+def test_summary_percentiles(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    path.write_text(
+        "\n".join(json.dumps({"name": "detect", "ms": ms}) for ms in range(1, 101)) + "\nnot json\n"
+    )
+    row = summarize_trace([path])["detect"]
+    assert row["count"] == 100
+    assert row["p50_ms"] == 51
+    assert row["p95_ms"] == 95
+    assert row["max_ms"] == 100
+
+
+def test_tracing_disabled_by_env(monkeypatch, tmp_path):
+    monkeypatch.setattr(agent_trace, "_tracer", None)
+    monkeypatch.setenv("ARSRULES_TRACE", "off")
+    assert configure_tracing(tmp_path) is None
+    with span("ignored"):
+        pass
+    assert not (tmp_path / "trace.jsonl").exists()
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+import agent_watch_planner
+from agent_watch_planner import (
+    PathTrie,
+    coalesce_roots,
+    estimate_watch_cost,
+    inotify_watch_limit,
+    plan_watch_roots,
+    watch_budget,
+)
+
+
+def _tree(root: Path, dirs: int):
+    for i in range(dirs):
+        (root / f"d{i}").mkdir(parents=True)
+
+
+def test_trie_coalesces_nested_roots_regardless_of_order(tmp_path):
+    repo = tmp_path / "repo"
+    roots, nested = coalesce_roots([
+        repo / ".claude" / "hooks",
+        repo,
+        repo / ".gemini",
+        tmp_path / "other",
+        repo,
+    ])
+    assert roots == [tmp_path / "other", repo]
+    assert nested == 2
+
+    trie = PathTrie()
+    trie.insert(repo / ".claude" / "hooks")
+    trie.insert(repo)
+    assert trie.roots() == [repo]
+    assert trie.covers(repo / "x" / "y")
+    assert not trie.covers(tmp_path)
+
+
+def test_estimate_watch_cost_skips_ignored_dirs_and_stops_at_cap(tmp_path):
+    _tree(tmp_path, 3)
+    (tmp_path / ".git" / "objects").mkdir(parents=True)
+    (tmp_path / "node_modules" / "pkg").mkdir(parents=True)
+    assert estimate_watch_cost(tmp_path) == 4
+    assert estimate_watch_cost(tmp_path, cap=1) == 2
+
+
+def test_plan_degrades_most_expensive_roots_to_polling(tmp_path, monkeypatch):
+    big, medium, small = tmp_path / "big", tmp_path / "medium", tmp_path / "small"
+    _tree(big, 20)
+    _tree(medium, 5)
+    small.mkdir()
+    missing = tmp_path / "missing"
+
+    plan = plan_watch_roots([big, medium, small, medium / "d0", missing], budget=10)
+
+    assert plan.polled == [big.resolve()]
+    assert plan.recursive == [medium.resolve(), small.resolve()]
+    assert plan.total_cost == 7
+    assert plan.missing == [missing]
+    assert not missing.exists()
+
+    unlimited = plan_watch_roots([big, small], budget=None)
+    assert unlimited.polled == [] and unlimited.costs == {}
+
+    # Each walk stops just past the budget, however large the root.
+    caps = []
+    real_estimate = agent_watch_planner.estimate_watch_cost
+
+    def recording_estimate(root, cap=None, ignored=()):
+        caps.append(cap)
+        return real_estimate(root, cap=cap, ignored=ignored)
+
+    monkeypatch.setattr(agent_watch_planner, "estimate_watch_cost", recording_estimate)
+    plan = plan_watch_roots([big, medium, small], budget=10)
+    assert caps == [11, 11, 11]
+    assert plan.costs[big.resolve()] == 12
+
+
+def test_plan_keeps_cheap_roots_when_the_expensive_root_sorts_first(tmp_path):
+    huge, config, skills = tmp_path / "a-monorepo", tmp_path / "b-config", tmp_path / "c-skills"
+    _tree(huge, 8)
+    _tree(config, 1)
+    _tree(skills, 1)
+
+    plan = plan_watch_roots([huge, config, skills], budget=10)
+
+    assert plan.polled == [huge.resolve()]
+    assert plan.recursive == [config.resolve(), skills.resolve()]
+
+
+def test_watchdog_plan_counts_ignored_dirs(tmp_path):
+    """watchdog watches .git and node_modules too, so its estimate must count them."""
+    repo = tmp_path / "repo"
+    _tree(repo, 2)
+    (repo / "node_modules" / "a" / "b").mkdir(parents=True)
+    assert estimate_watch_cost(repo, ignored=()) == estimate_watch_cost(repo) + 3
+    assert plan_watch_roots([repo], budget=4).recursive == [repo.resolve()]
+    assert plan_watch_roots([repo], budget=4, ignored=()).polled == [repo.resolve()]
+
+
+def test_watch_budget_reads_kernel_limit_and_env_override(monkeypatch, tmp_path):
+    limit_file = tmp_path / "max_user_watches"
+    limit_file.write_text("8192\n")
+    assert inotify_watch_limit(limit_file) == 8192
+    assert inotify_watch_limit(tmp_path / "absent") is None
+
+    monkeypatch.delenv("ARSRULES_MAX_WATCHES", raising=False)
+    assert watch_budget(8192) == 4096
+    monkeypatch.setenv("ARSRULES_MAX_WATCHES", "100")
+    assert watch_budget(8192) == 100
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+from agent_watch_snapshot import WatchSnapshot, changed_components, config_fingerprint
+
+
+def _state(tmp_path):
+    return {
+        "rules": {"master": "m1", "claude": "c1"},
+        "skills": {tmp_path / "skills" / "one": "s1"},
+        "settings": {},
+        "mcp": {tmp_path / ".claude.json": "x1"},
+        "history": {tmp_path / "a.jsonl": "10:1"},
+    }
+
+
+def test_snapshot_round_trip_restores_path_keys(tmp_path):
+    snapshot = WatchSnapshot(tmp_path)
+    state = _state(tmp_path)
+    assert snapshot.save("fp", state, [["sha256", "/x", [1, 2, 3, 4, 5], "abc"]])
+
+    loaded = snapshot.load("fp")
+    assert loaded["state"] == state
+    assert loaded["stat_hashes"] == [["sha256", "/x", [1, 2, 3, 4, 5], "abc"]]
+
+
+def test_snapshot_ignored_when_fingerprint_or_file_is_bad(tmp_path):
+    snapshot = WatchSnapshot(tmp_path)
+    snapshot.save("fp", _state(tmp_path))
+    assert snapshot.load("other") is None
+
+    snapshot.path.write_text("{not json")
+    assert snapshot.load("fp") is None
+
+
+def test_config_fingerprint_tracks_sync_config_and_agents(tmp_path):
+    agents = {"claude": {"path": tmp_path / "CLAUDE.md"}}
+    before = config_fingerprint(tmp_path, agents, {})
+    assert before == config_fingerprint(tmp_path, agents, {})
+
+    (tmp_path / "sync_config.json").write_text("{}")
+    after_config = config_fingerprint(tmp_path, agents, {})
+    assert after_config != before
+
+    agents["gemini"] = {"path": tmp_path / "GEMINI.md"}
+    assert config_fingerprint(tmp_path, agents, {}) != after_config
+
+
+def test_changed_components_reports_only_what_moved(tmp_path):
+    saved = _state(tmp_path)
+    current = _state(tmp_path)
+    assert changed_components(saved, current) == ([], [])
+
+    current["mcp"] = {tmp_path / ".claude.json": "x2"}
+    new_transcript = tmp_path / "b.jsonl"
+    current["history"] = {new_transcript: "5:1"}
+
+    components, history_paths = changed_components(saved, current)
+    assert components == ["mcp"]
+    assert history_paths == [new_transcript, tmp_path / "a.jsonl"]
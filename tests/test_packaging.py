@@ -0,0 +1,37 @@
+"""Tests that every module the CLI imports is shipped by the package."""
+
+import ast
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+
+
+def _py_modules():
+    text = (ROOT / "pyproject.toml").read_text()
+    match = re.search(r"^py-modules\s*=\s*(\[.*?\])", text, re.MULTILINE | re.DOTALL)
+    assert match, "py-modules not found in pyproject.toml"
+    return set(ast.literal_eval(match.group(1)))
+
+
+def _imported_modules(path):
+    names = set()
+    for node in ast.walk(ast.parse(path.read_text())):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    return names
+
+
+def test_every_imported_agent_module_is_packaged():
+    """An agent_* import missing from py-modules only fails once installed."""
+    packaged = _py_modules()
+    missing = {}
+    for module in sorted(packaged):
+        path = ROOT / f"{module}.py"
+        assert path.exists(), f"py-modules lists {module}, but {path.name} does not exist"
+        for name in _imported_modules(path):
+            if name.startswith("agent_") and name not in packaged:
+                missing.setdefault(name, []).append(module)
+    assert not missing, f"imported but not in py-modules: {missing}"